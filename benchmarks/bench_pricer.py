@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import argparse
+import glob
+import sys
+from pathlib import Path
+
+PROJECT = Path(__file__).resolve().parents[1] / "derivatives_pricer"
+sys.path.insert(0, str(PROJECT))
+
+import pricer  # noqa: E402
+from common import measure, write_results  # noqa: E402
+from generators import synthetic_book, synthetic_chain  # noqa: E402
+from src.instrument.vanilla import VanillaOption  # noqa: E402
+from src.market.forward_curve import ForwardCurve  # noqa: E402
+from src.market.option_chain import OptionChain  # noqa: E402
+from src.models.black76 import price, price_array  # noqa: E402
+from src.models.greeks import delta  # noqa: E402
+from src.models.implied_vol import implied_vol_black76, implied_vol_black76_array  # noqa: E402
+from src.sabr.calibration import calibrate_sabr_smile  # noqa: E402
+from src.sabr.pipeline import load_sabr_params_csv  # noqa: E402
+from src.surfaces.sabr_surface import SABRVolSurface  # noqa: E402
+
+DATA = PROJECT / "data"
+
+
+def run(sizes, quick: bool):
+    repeat = 3 if quick else 7
+    results = []
+
+    forward_curve = ForwardCurve.from_csv(DATA / "wti_forward_prices.csv")
+    surface = SABRVolSurface(forward_curve.as_of, forward_curve, load_sabr_params_csv(DATA / "sabr_params.csv"))
+
+    results.append(measure("black76.price scalar", lambda: price(65.0, 60.0, 0.5, 0.35, cp=-1), repeat=repeat))
+    results.append(measure("greeks.delta scalar", lambda: delta(65.0, 60.0, 0.5, 0.35, cp=-1), repeat=repeat))
+    trade = VanillaOption(K=60.0, T=0.5, cp=-1)
+    results.append(measure("pricer.pv scalar", lambda: pricer.pv(trade, 65.0, surface), repeat=repeat))
+    results.append(measure("SABRVolSurface.vol scalar", lambda: surface.vol(0.37, 58.5), repeat=repeat))
+    results.append(
+        measure(
+            "implied_vol_black76 scalar",
+            lambda: implied_vol_black76(premium=2.1, F=65.0, K=60.0, T=0.5, cp=-1),
+            repeat=repeat,
+        )
+    )
+
+    for n in sizes:
+        book = synthetic_book(n)
+        K, T, cp = book["K"], book["T"], book["cp"]
+        F = forward_curve.forward_T_many(T)
+        vol = surface.vol_many(T, K)
+        prem = price_array(F, K, T, vol, cp=cp)
+
+        results.append(measure(f"price_array n={n}", lambda: price_array(F, K, T, vol, cp=cp), ops=n, repeat=repeat))
+        results.append(measure(f"SABRVolSurface.vol_many n={n}", lambda: surface.vol_many(T, K), ops=n, repeat=repeat))
+        results.append(
+            measure(f"pricer.price_book n={n}", lambda: pricer.price_book(book, forward_curve, surface), ops=n, repeat=repeat)
+        )
+        results.append(
+            measure(
+                f"implied_vol_black76_array n={n}",
+                lambda: implied_vol_black76_array(prem, F, K, T, cp),
+                ops=n,
+                repeat=repeat,
+            )
+        )
+
+    for width in (25, 150, 1000):
+        chain = synthetic_chain(width)
+        results.append(
+            measure(
+                f"calibrate_sabr_smile width={width}",
+                lambda: calibrate_sabr_smile(chain["F"], chain["T"], chain["K"], chain["vol"]),
+                repeat=repeat,
+            )
+        )
+
+    paths = sorted(glob.glob(str(DATA / "options" / "*.csv")))
+    results.append(
+        measure(
+            "OptionChain.from_csv bundled (22 files)",
+            lambda: [OptionChain.from_csv(p, forward_curve) for p in paths],
+            ops=len(paths),
+            repeat=repeat,
+        )
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pricer hot-path benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--json", default=None)
+    args = parser.parse_args()
+    sizes = [s for s in args.sizes if s <= 100_000] if args.quick else args.sizes
+    write_results(run(sizes, args.quick), args.json)
+
+
+if __name__ == "__main__":
+    main()
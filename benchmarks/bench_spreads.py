@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT = Path(__file__).resolve().parents[1] / "wti_m1_m2_spreads"
+sys.path.insert(0, str(PROJECT))
+
+from common import measure, write_results  # noqa: E402
+from generators import write_contract_panel  # noqa: E402
+from src import spreads  # noqa: E402
+
+
+def run(years, quick: bool):
+    repeat = 3 if quick else 5
+    results = []
+
+    results.append(
+        measure("calculate_volume_rolling_spread bundled", spreads.calculate_volume_rolling_spread, repeat=repeat)
+    )
+
+    bundled = spreads.data_dir
+    try:
+        for n_years in years:
+            with tempfile.TemporaryDirectory() as tmp:
+                n_files = write_contract_panel(tmp, n_years=n_years)
+                spreads.data_dir = tmp
+                results.append(
+                    measure(
+                        f"calculate_volume_rolling_spread synthetic {n_years}y",
+                        spreads.calculate_volume_rolling_spread,
+                        ops=n_files,
+                        repeat=repeat,
+                    )
+                )
+    finally:
+        spreads.data_dir = bundled
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="WTI M1/M2 spread benchmarks")
+    parser.add_argument("--years", type=int, nargs="+", default=[2, 5])
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--json", default=None)
+    args = parser.parse_args()
+    write_results(run(args.years, args.quick), args.json)
+
+
+if __name__ == "__main__":
+    main()
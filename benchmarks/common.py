@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import gc
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+def measure(
+    name: str,
+    fn: Callable[[], object],
+    ops: int = 1,
+    repeat: int = 7,
+    min_time: float = 0.05,
+    track_memory: bool = True,
+) -> Dict[str, float]:
+    fn()
+
+    # calibrate the inner loop so each sample takes at least min_time
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    samples: List[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    peak = float("nan")
+    if track_memory:
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    latency = np.array(samples)
+    return {
+        "name": name,
+        "ops": ops,
+        "ops_per_sec": ops / float(np.median(latency)),
+        "latency_p50": float(np.percentile(latency, 50)),
+        "latency_p95": float(np.percentile(latency, 95)),
+        "latency_p99": float(np.percentile(latency, 99)),
+        "peak_mem_bytes": peak,
+        "calls_per_sample": number,
+    }
+
+
+def write_results(results: List[Dict[str, float]], path: Optional[str]) -> None:
+    text = json.dumps(results, indent=2)
+    if path:
+        Path(path).write_text(text)
+    else:
+        print(text)
+
+
+def compare(results: List[Dict[str, float]], baseline: List[Dict[str, float]], threshold: float) -> List[Dict[str, object]]:
+    base = {r["name"]: r for r in baseline}
+    rows = []
+    for r in results:
+        b = base.get(r["name"])
+        if b is None:
+            rows.append({"name": r["name"], "ratio": float("nan"), "status": "new"})
+            continue
+        ratio = r["ops_per_sec"] / b["ops_per_sec"]
+        status = "regressed" if ratio < 1.0 - threshold else ("improved" if ratio > 1.0 + threshold else "ok")
+        rows.append({"name": r["name"], "ratio": ratio, "status": status})
+    return rows
+
+
+def format_table(results: List[Dict[str, float]], comparison: Optional[List[Dict[str, object]]] = None) -> str:
+    cmp = {c["name"]: c for c in comparison or []}
+    lines = [f"{'benchmark':<44} {'ops/sec':>14} {'p50':>10} {'p95':>10} {'peak MB':>9} {'vs base':>9}"]
+    for r in results:
+        c = cmp.get(r["name"])
+        vs = "" if c is None else (c["status"] if c["status"] == "new" else f"{c['ratio']:.2f}x")
+        lines.append(
+            f"{r['name']:<44} {r['ops_per_sec']:>14,.0f} {r['latency_p50'] * 1e3:>8.3f}ms "
+            f"{r['latency_p95'] * 1e3:>8.3f}ms {r['peak_mem_bytes'] / 2**20:>9.2f} {vs:>9}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import math
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+MONTH_CODES = "FGHJKMNQUVXZ"
+
+
+def synthetic_book(n: int, F: float = 65.0, max_T: float = 2.0, seed: int = 0) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    T = np.round(rng.uniform(0.02, max_T, n) * 365.0) / 365.0
+    K = np.round(F * np.exp(rng.normal(0.0, 0.25, n)) * 2.0) / 2.0
+    return {
+        "K": np.maximum(K, 0.5),
+        "T": T,
+        "cp": rng.choice([1, -1], n),
+        "qty": rng.integers(-10, 11, n).astype(float),
+    }
+
+
+def synthetic_chain(n_strikes: int, F: float = 65.0, T: float = 0.25, seed: int = 0) -> Dict[str, np.ndarray]:
+    from src.models.black76 import price_array
+
+    rng = np.random.default_rng(seed)
+    K = np.linspace(0.5 * F, 1.6 * F, n_strikes)
+    x = np.log(K / F)
+    vol = 0.32 - 0.15 * x + 0.6 * x * x
+    cp = np.where(K >= F, 1, -1)
+    premium = price_array(F, K, T, vol, cp=cp) * (1.0 + rng.normal(0.0, 0.002, n_strikes))
+    return {"K": K, "cp": cp, "premium": np.maximum(premium, 1e-4), "vol": vol, "F": F, "T": T}
+
+
+def write_contract_panel(directory: str | Path, start_year: int = 2020, n_years: int = 5, seed: int = 0) -> int:
+    # CL<month><year>.csv files (date, close, volume; no header) in the layout of wti_m1_m2_spreads/data
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    first = date(start_year, 7, 1)
+    last = date(start_year + n_years, 6, 1)
+    days = np.arange(np.datetime64(first - timedelta(days=150)), np.datetime64(last), dtype="datetime64[D]")
+    level = 60.0 + np.cumsum(rng.normal(0.0, 1.0, days.size))
+
+    n_files = 0
+    year, month = first.year, first.month
+    while date(year, month, 1) <= last:
+        expiry = np.datetime64(date(year, month, 1))
+        live = (days >= expiry - 120) & (days < expiry - 10) & (np.is_busday(days))
+        age = (days[live] - (expiry - 120)).astype(float)
+        close = level[live] + 0.2 * (month % 3) + rng.normal(0.0, 0.05, age.size)
+        volume = np.maximum(2e5 * np.exp(-0.5 * ((age - 80.0) / 20.0) ** 2) + rng.normal(0.0, 2e3, age.size), 0.0)
+
+        path = directory / f"CL{MONTH_CODES[month - 1]}{year}.csv"
+        with open(path, "w") as fh:
+            for d, c, v in zip(days[live], close, volume):
+                fh.write(f"{d},{c:.2f},{math.floor(v)}.0\n")
+        n_files += 1
+
+        month += 1
+        if month > 12:
+            month, year = 1, year + 1
+    return n_files
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from common import compare, format_table
+
+HERE = Path(__file__).resolve().parent
+
+# each project ships its own top-level `src` package, so suites run in separate interpreters
+SUITES = {
+    "pricer": HERE / "bench_pricer.py",
+    "spreads": HERE / "bench_spreads.py",
+}
+
+
+def run_suite(script: Path, quick: bool) -> list:
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "results.json"
+        cmd = [sys.executable, str(script), "--json", str(out)]
+        if quick:
+            cmd.append("--quick")
+        subprocess.run(cmd, check=True, cwd=HERE)
+        return json.loads(out.read_text())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the benchmark suites")
+    parser.add_argument("--suite", choices=[*SUITES, "all"], default="all")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and smaller sizes")
+    parser.add_argument("--save", default=None, help="write results JSON (e.g. to use as a baseline)")
+    parser.add_argument("--baseline", default=None, help="compare against a saved results JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative ops/sec change flagged as regression")
+    args = parser.parse_args()
+
+    names = list(SUITES) if args.suite == "all" else [args.suite]
+    results = []
+    for name in names:
+        for r in run_suite(SUITES[name], args.quick):
+            r["suite"] = name
+            results.append(r)
+
+    comparison = None
+    if args.baseline:
+        comparison = compare(results, json.loads(Path(args.baseline).read_text()), args.threshold)
+
+    print(format_table(results, comparison))
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+
+    if comparison and any(c["status"] == "regressed" for c in comparison):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from src.market.forward_curve import ForwardCurve
+from src.sabr.pipeline import calibrate_surface, load_sabr_params_csv, write_sabr_params_csv
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+
+def main(
+    out_path: Path,
+    previous_path: Path | None = None,
+    max_workers: int | None = None,
+    data_dir: Path = DATA_DIR,
+) -> None:
+    forward_curve = ForwardCurve.from_csv(data_dir / "wti_forward_prices.csv")
+    previous = load_sabr_params_csv(previous_path) if previous_path is not None else None
+
+    start = time.perf_counter()
+    calibrations = calibrate_surface(
+        data_dir / "options",
+        forward_curve,
+        previous=previous,
+        max_workers=max_workers,
+    )
+    wall = time.perf_counter() - start
+
+    df = write_sabr_params_csv(calibrations, out_path, forward_curve.as_of)
+    print(df[["expiry", "rmse", "converged", "nfev", "seconds", "warm_start"]].to_string(index=False))
+    print(f"expiries={len(df)} wall={wall:.3f}s fit_cpu={df['seconds'].sum():.3f}s nfev={int(df['nfev'].sum())}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="end-of-day SABR calibration of every bundled expiry")
+    parser.add_argument("--out", type=Path, required=True, help="output params CSV (the bundled data/sabr_params.csv is not overwritten unless named)")
+    parser.add_argument("--previous", type=Path, default=None, help="yesterday's params CSV to warm-start each expiry from")
+    parser.add_argument("--workers", type=int, default=None, help="calibration processes; defaults to the CPU count")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    args = parser.parse_args()
+    main(args.out, previous_path=args.previous, max_workers=args.workers, data_dir=args.data_dir)
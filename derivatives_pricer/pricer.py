@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from src import instrumentation
+from src.models.american import check_exercise, american_greeks, american_price
 from src.models.black76 import price as black_price
-from src.models.greeks import delta, gamma, vega
-from src.instrument.vanilla import VanillaOption
+from src.models.greeks import GREEK_NAMES, black76_greeks
+from src.instrument.vanilla import VanillaOption, book_american, book_arrays
+from src.market.forward_curve import forwards_for
+from src.surfaces.vol_interface import surface_vols
 
 
 def _get_vol(vol_or_surface, T: float, K: float) -> float:
@@ -12,13 +21,78 @@ def _get_vol(vol_or_surface, T: float, K: float) -> float:
 
 
 def pv(trade: VanillaOption, F: float, vol_or_surface, df: float = 1.0) -> float:
+    instrumentation.count("pricer.pv")
+    check_exercise(trade.exercise)
     vol = _get_vol(vol_or_surface, trade.T, trade.K)
+    if trade.exercise == "american":
+        return trade.qty * float(american_price(F, trade.K, trade.T, vol, df=df, cp=trade.cp))
     return trade.qty * black_price(F, trade.K, trade.T, vol, df=df, cp=trade.cp)
 
 
 def greeks(trade: VanillaOption, F: float, vol_or_surface, df: float = 1.0) -> dict[str, float]:
+    instrumentation.count("pricer.greeks")
+    check_exercise(trade.exercise)
     vol = _get_vol(vol_or_surface, trade.T, trade.K)
-    d = trade.qty * delta(F, trade.K, trade.T, vol, df=df, cp=trade.cp)
-    g = trade.qty * gamma(F, trade.K, trade.T, vol, df=df)
-    v = trade.qty * vega(F, trade.K, trade.T, vol, df=df)
-    return {"delta": d, "gamma": g, "vega": v}
+    if trade.exercise == "american":
+        g = american_greeks(F, trade.K, trade.T, vol, df=df, cp=trade.cp)
+    else:
+        g = black76_greeks(F, trade.K, trade.T, vol, df=df, cp=trade.cp)
+    return {name: trade.qty * g[name] for name in GREEK_NAMES[1:]}
+
+
+@dataclass(frozen=True)
+class BookResult:
+    F: np.ndarray
+    vol: np.ndarray
+    pv: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray
+    theta: np.ndarray
+    vanna: np.ndarray
+    volga: np.ndarray
+    charm: np.ndarray
+    elapsed: float
+
+    @property
+    def totals(self) -> dict[str, float]:
+        out = {"pv": float(self.pv.sum())}
+        out.update({name: float(getattr(self, name).sum()) for name in GREEK_NAMES[1:]})
+        return out
+
+    @property
+    def trades_per_second(self) -> float:
+        return float(self.pv.size / self.elapsed) if self.elapsed > 0 else float("inf")
+
+
+def _is_book(trades) -> bool:
+    # columns (dict / DataFrame), an OptionBook or a materialised trade list; anything else is an iterable
+    if isinstance(trades, list) or hasattr(trades, "arrays"):
+        return True
+    return hasattr(trades, "keys") and "K" in trades.keys()
+
+
+def price_book(trades, F_or_curve, vol_or_surface, df: float = 1.0) -> BookResult:
+    start = time.perf_counter()
+    if not _is_book(trades):
+        trades = list(trades)
+    K, T, cp, qty = book_arrays(trades)
+
+    F = forwards_for(F_or_curve, T)
+    vol = surface_vols(vol_or_surface, T, K)
+
+    g = black76_greeks(F, K, T, vol, df=df, cp=cp)
+    american = book_american(trades)
+    if np.any(american):
+        df_arr = np.broadcast_to(np.asarray(df, dtype=float), K.shape)
+        a = american_greeks(F[american], K[american], T[american], vol[american], df=df_arr[american], cp=cp[american])
+        for name in GREEK_NAMES:
+            g[name][american] = a[name]
+    scaled = {name: qty * g[name] for name in GREEK_NAMES[1:]}
+
+    elapsed = time.perf_counter() - start
+    if instrumentation.enabled():
+        instrumentation.count("pricer.price_book")
+        instrumentation.count("pricer.price_book.trades", K.size)
+        instrumentation.record_time("pricer.price_book", elapsed)
+    return BookResult(F=F, vol=vol, pv=qty * g["price"], elapsed=elapsed, **scaled)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class AveragePriceOption:
+    K: float
+    start: date
+    end: date
+    cp: int
+    qty: float = 1.0
+    holidays: Sequence[date] = ()
+
+    def fixing_dates(self) -> np.ndarray:
+        # one fixing per business day in [start, end], averaging the front-month settle
+        days = np.arange(
+            np.datetime64(self.start, "D"),
+            np.datetime64(self.end, "D") + np.timedelta64(1, "D"),
+            dtype="datetime64[D]",
+        )
+        holidays = np.asarray(list(self.holidays), dtype="datetime64[D]")
+        dates = days[np.is_busday(days, holidays=holidays)]
+        if len(dates) == 0:
+            raise ValueError("averaging period contains no business days")
+        return dates
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.instrument.vanilla import VanillaOption
+
+_COLUMNS = ("K", "T", "cp", "qty", "expiry", "american")
+_DTYPES = {
+    "K": np.float64,
+    "T": np.float64,
+    "cp": np.int8,
+    "qty": np.float64,
+    "expiry": "datetime64[D]",
+    "american": np.bool_,
+}
+
+
+@dataclass(frozen=True)
+class OptionBook:
+    K: np.ndarray
+    T: np.ndarray
+    cp: np.ndarray
+    qty: np.ndarray
+    # NaT where the trade has no listed expiry; grouping then falls back to T
+    expiry: np.ndarray
+    american: np.ndarray
+
+    def __post_init__(self) -> None:
+        n = len(self.K)
+        for name in _COLUMNS:
+            col = np.asarray(getattr(self, name))
+            if col.dtype != np.dtype(_DTYPES[name]):
+                col = col.astype(_DTYPES[name])
+            if not col.flags.c_contiguous:
+                col = np.ascontiguousarray(col)
+            if col.shape != (n,):
+                raise ValueError(f"column {name} has shape {col.shape}, expected ({n},)")
+            object.__setattr__(self, name, col)
+
+    @staticmethod
+    def from_arrays(K, T, cp, qty=None, expiry=None, american=None) -> "OptionBook":
+        K = np.asarray(K, dtype=float).ravel()
+        n = len(K)
+        return OptionBook(
+            K=K,
+            T=np.broadcast_to(np.asarray(T, dtype=float), (n,)),
+            cp=np.broadcast_to(np.asarray(cp), (n,)),
+            qty=np.ones(n) if qty is None else np.broadcast_to(np.asarray(qty, dtype=float), (n,)),
+            expiry=np.full(n, np.datetime64("NaT"), dtype="datetime64[D]")
+            if expiry is None
+            else np.broadcast_to(np.asarray(expiry, dtype="datetime64[D]"), (n,)),
+            american=np.zeros(n, dtype=bool) if american is None else np.broadcast_to(np.asarray(american, dtype=bool), (n,)),
+        )
+
+    @staticmethod
+    def from_options(options: Iterable[VanillaOption], as_of: Optional[date] = None) -> "OptionBook":
+        options = options if isinstance(options, list) else list(options)
+        n = len(options)
+        T = np.fromiter((o.T for o in options), dtype=float, count=n)
+        expiry = None
+        if as_of is not None:
+            # T is ACT/365 from as_of, so the listed expiry is recovered to the day
+            expiry = np.datetime64(as_of, "D") + np.rint(T * 365.0).astype(np.int64)
+        return OptionBook.from_arrays(
+            K=np.fromiter((o.K for o in options), dtype=float, count=n),
+            T=T,
+            cp=np.fromiter((o.cp for o in options), dtype=np.int8, count=n),
+            qty=np.fromiter((o.qty for o in options), dtype=float, count=n),
+            expiry=expiry,
+            american=np.fromiter((o.exercise == "american" for o in options), dtype=bool, count=n),
+        )
+
+    @staticmethod
+    def concat(books: Sequence["OptionBook"]) -> "OptionBook":
+        return OptionBook(**{name: np.concatenate([getattr(b, name) for b in books]) for name in _COLUMNS})
+
+    def __len__(self) -> int:
+        return len(self.K)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return self.option(int(item))
+        # slices are views; masks and index arrays copy
+        return OptionBook(**{name: getattr(self, name)[item] for name in _COLUMNS})
+
+    def __iter__(self) -> Iterator[VanillaOption]:
+        return iter(self.to_options())
+
+    def option(self, i: int) -> VanillaOption:
+        return VanillaOption(
+            K=float(self.K[i]),
+            T=float(self.T[i]),
+            cp=int(self.cp[i]),
+            qty=float(self.qty[i]),
+            exercise="american" if self.american[i] else "european",
+        )
+
+    def to_options(self) -> list:
+        exercise = np.where(self.american, "american", "european").tolist()
+        return [
+            VanillaOption(K=k, T=t, cp=c, qty=q, exercise=e)
+            for k, t, c, q, e in zip(self.K.tolist(), self.T.tolist(), self.cp.tolist(), self.qty.tolist(), exercise)
+        ]
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        return self.K, self.T, self.cp, self.qty
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(getattr(self, name).nbytes for name in _COLUMNS))
+
+    def _group_keys(self) -> np.ndarray:
+        if len(self) and not np.any(np.isnat(self.expiry)):
+            return self.expiry
+        return self.T
+
+    def sort_by_expiry(self) -> "OptionBook":
+        keys = self._group_keys()
+        if np.all(keys[:-1] <= keys[1:]):
+            return self
+        return self[np.argsort(keys, kind="stable")]
+
+    def groupby_expiry(self) -> Iterator[Tuple[object, "OptionBook"]]:
+        book = self.sort_by_expiry()
+        keys = book._group_keys()
+        if not len(keys):
+            return
+        starts = np.concatenate([[0], np.nonzero(keys[1:] != keys[:-1])[0] + 1, [len(keys)]])
+        for a, b in zip(starts[:-1], starts[1:]):
+            key = keys[a]
+            yield (key.astype(date) if keys.dtype.kind == "M" else float(key)), book[int(a) : int(b)]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({name: getattr(self, name) for name in _COLUMNS})
+
+    def save(self, path: str | Path) -> None:
+        # one .npy per column so load can memory-map each independently
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in _COLUMNS:
+            np.save(path / f"{name}.npy", getattr(self, name))
+        (path / "book.json").write_text(json.dumps({"columns": list(_COLUMNS), "n": len(self)}))
+
+    @staticmethod
+    def load(path: str | Path, mmap: bool = True) -> "OptionBook":
+        path = Path(path)
+        meta = json.loads((path / "book.json").read_text())
+        mode = "r" if mmap else None
+        cols = {name: np.load(path / f"{name}.npy", mmap_mode=mode) for name in _COLUMNS}
+        if any(len(c) != meta["n"] for c in cols.values()):
+            raise ValueError(f"book at {path} is inconsistent with its metadata")
+        return OptionBook(**cols)
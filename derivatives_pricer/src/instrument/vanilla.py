@@ -1,5 +1,8 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
 
 
 @dataclass(frozen=True)
@@ -8,3 +11,36 @@ class VanillaOption:
     T: float
     cp: int
     qty: float = 1.0
+    exercise: str = "european"
+
+
+def book_arrays(trades) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    if hasattr(trades, "arrays"):
+        # OptionBook: columns are already typed arrays
+        return trades.arrays()
+    if hasattr(trades, "keys") and "K" in trades.keys():
+        K = np.asarray(trades["K"], dtype=float)
+        T = np.asarray(trades["T"], dtype=float)
+        cp = np.asarray(trades["cp"], dtype=int)
+        qty = np.asarray(trades["qty"], dtype=float) if "qty" in trades.keys() else np.ones_like(K)
+        return K, T, cp, qty
+
+    trades = list(trades) if not isinstance(trades, list) else trades
+    K = np.fromiter((t.K for t in trades), dtype=float, count=len(trades))
+    T = np.fromiter((t.T for t in trades), dtype=float, count=len(trades))
+    cp = np.fromiter((t.cp for t in trades), dtype=int, count=len(trades))
+    qty = np.fromiter((t.qty for t in trades), dtype=float, count=len(trades))
+    return K, T, cp, qty
+
+
+def book_american(trades) -> np.ndarray:
+    # boolean mask of American-exercise trades, aligned with book_arrays
+    if hasattr(trades, "american"):
+        return trades.american
+    if hasattr(trades, "keys") and "K" in trades.keys():
+        if "exercise" not in trades.keys():
+            return np.zeros(np.shape(trades["K"]), dtype=bool)
+        return np.asarray(trades["exercise"]).astype(str) == "american"
+
+    trades = list(trades) if not isinstance(trades, list) else trades
+    return np.fromiter((t.exercise == "american" for t in trades), dtype=bool, count=len(trades))
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, List
+
+_enabled = False
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_timers: Dict[str, List[float]] = {}
+_events: List[Dict[str, Any]] = []
+_MAX_EVENTS = 10_000
+_NULL = nullcontext()
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _timers.clear()
+        _events.clear()
+
+
+def count(name: str, n: float = 1) -> None:
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def record_time(name: str, seconds: float) -> None:
+    if not _enabled:
+        return
+    with _lock:
+        # count, total, max
+        t = _timers.setdefault(name, [0, 0.0, 0.0])
+        t[0] += 1
+        t[1] += seconds
+        t[2] = max(t[2], seconds)
+
+
+def event(name: str, **fields: Any) -> None:
+    if not _enabled:
+        return
+    with _lock:
+        if len(_events) < _MAX_EVENTS:
+            _events.append({"event": name, **fields})
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        record_time(self.name, time.perf_counter() - self.start)
+
+
+def timer(name: str):
+    if not _enabled:
+        return _NULL
+    return _Timer(name)
+
+
+def report() -> Dict[str, Any]:
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "timers": {
+                name: {"count": int(c), "total": total, "mean": total / c if c else 0.0, "max": mx}
+                for name, (c, total, mx) in _timers.items()
+            },
+            "events": [dict(e) for e in _events],
+        }
+
+
+def write_report(path: str | Path) -> None:
+    Path(path).write_text(json.dumps(report(), indent=2, default=str))
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from src.live.pipeline import LivePipeline
+from src.live.sources import ReplaySource
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+
+async def main(args: argparse.Namespace) -> None:
+    pipeline = LivePipeline.from_data_dir(args.data_dir, debounce=args.debounce, max_delay=args.max_delay)
+    source = ReplaySource.from_data_dir(args.data_dir, n_steps=args.steps, interval=args.interval, seed=args.seed)
+    updates = pipeline.subscribe(maxsize=16)
+
+    async def report() -> None:
+        while True:
+            v = await updates.get()
+            refits = [r.expiry.isoformat() for r in v.refreshed if r.refit]
+            print(f"v{v.version} front={v.forward_curve.forwards[0]:.2f} refit={refits}", flush=True)
+
+    printer = asyncio.create_task(report())
+    try:
+        stats = await pipeline.run(source)
+        await asyncio.sleep(0)
+    finally:
+        printer.cancel()
+        pipeline.close()
+    print(stats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="replay the bundled quotes through the live recalibration pipeline")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--steps", type=int, default=50, help="simulated market moves after the initial replay")
+    parser.add_argument("--interval", type=float, default=0.001, help="seconds between ticks")
+    parser.add_argument("--debounce", type=float, default=0.25)
+    parser.add_argument("--max-delay", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src import instrumentation
+from src.live.sources import FuturesTick, OptionTick
+from src.market.forward_curve import ForwardCurve
+from src.market.live_chain import LiveOptionChain
+from src.sabr.incremental import IncrementalSABRCalibrator, RefreshResult
+
+_END = object()
+
+
+def _valid_tick(tick) -> bool:
+    try:
+        if isinstance(tick, FuturesTick):
+            return bool(np.isfinite(tick.price) and tick.price > 0.0)
+        if isinstance(tick, OptionTick):
+            return bool(
+                tick.cp in (1, -1)
+                and np.isfinite(tick.strike)
+                and tick.strike > 0.0
+                and np.isfinite(tick.premium)
+                and tick.premium >= 0.0
+            )
+    except TypeError:
+        return False
+    # anything else is counted as unknown by the caller
+    return True
+
+
+@dataclass(frozen=True)
+class SurfaceVersion:
+    version: int
+    surface: object
+    forward_curve: ForwardCurve
+    refreshed: Tuple[RefreshResult, ...]
+    published_at: float
+
+
+@dataclass
+class PipelineStats:
+    ticks_in: int = 0
+    ticks_applied: int = 0
+    ticks_coalesced: int = 0
+    ticks_unknown: int = 0
+    ticks_rejected: int = 0
+    apply_batches: int = 0
+    max_queue_depth: int = 0
+    recalibrations: int = 0
+    refits: int = 0
+    published: int = 0
+    dropped_versions: int = 0
+
+
+class LivePipeline:
+    def __init__(
+        self,
+        forward_curve: ForwardCurve,
+        chains: Iterable[LiveOptionChain],
+        calibrator: IncrementalSABRCalibrator,
+        debounce: float = 0.25,
+        max_delay: float = 2.0,
+        max_queue: int = 10_000,
+        max_apply: int = 5_000,
+        apply_window: float = 0.005,
+        forward_mapping_rule: str = "next",
+    ):
+        self.forward_curve = forward_curve
+        self.chains: Dict[date, LiveOptionChain] = {c.expiry: c for c in chains}
+        self.calibrator = calibrator
+        self.debounce = float(debounce)
+        self.max_delay = float(max_delay)
+        self.max_queue = int(max_queue)
+        self.max_apply = int(max_apply)
+        self.apply_window = float(apply_window)
+        self.forward_mapping_rule = forward_mapping_rule
+        self.stats = PipelineStats()
+        self.version = 0
+        self.latest: Optional[SurfaceVersion] = None
+
+        self._subscribers: List[asyncio.Queue] = []
+        # expiry -> (first dirty time, last dirty time)
+        self._dirty: Dict[date, Tuple[float, float]] = {}
+        self._curve_changed = False
+        self._closing = False
+        self._wake: Optional[asyncio.Event] = None
+        # chain updates and refits share one thread, so they never interleave on a chain
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="live")
+
+    @staticmethod
+    def from_data_dir(data_dir: str | Path, df: float = 1.0, exercise: str = "european", **kwargs) -> "LivePipeline":
+        from src.sabr.pipeline import load_sabr_params_csv
+        from src.surfaces.sabr_surface import SABRVolSurface
+
+        data_dir = Path(data_dir)
+        forward_curve = ForwardCurve.from_csv(data_dir / "wti_forward_prices.csv")
+        chains = [
+            LiveOptionChain.from_csv(p, forward_curve, df=df, exercise=exercise)
+            for p in sorted((data_dir / "options").glob("*.csv"))
+        ]
+        params = load_sabr_params_csv(data_dir / "sabr_params.csv")
+        surface = SABRVolSurface(as_of=forward_curve.as_of, forward_curve=forward_curve, params_by_expiry=params)
+        return LivePipeline(forward_curve, chains, IncrementalSABRCalibrator(surface), **kwargs)
+
+    def subscribe(self, maxsize: int = 1) -> asyncio.Queue:
+        # a full subscriber queue drops its oldest version: only the newest surface matters
+        q: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: asyncio.Queue) -> None:
+        self._subscribers.remove(q)
+
+    async def run(self, source) -> PipelineStats:
+        self._closing = False
+        self._wake = asyncio.Event()
+        # bounded: when the appliers fall behind, the ingest task blocks and stops pulling from the source
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue)
+        ingest = asyncio.create_task(self._ingest(source, queue))
+        apply = asyncio.create_task(self._apply_loop(queue))
+        recal = asyncio.create_task(self._recalibrate_loop())
+        tasks = (ingest, apply, recal)
+        try:
+            # a failure in either stage surfaces here at once; the other stages are cancelled below
+            await asyncio.gather(ingest, apply)
+            self._closing = True
+            self._wake.set()
+            await recal
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return self.stats
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    async def _ingest(self, source, queue: asyncio.Queue) -> None:
+        async for tick in source:
+            await queue.put(tick)
+            self.stats.ticks_in += 1
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, queue.qsize())
+        # only on a clean end of stream: if run() is unwinding nobody drains the queue any more
+        await queue.put(_END)
+
+    async def _apply_loop(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        done = False
+        while not done:
+            # collect for up to apply_window so a burst of ticks costs one chain update per expiry
+            batch = [await queue.get()]
+            deadline = loop.time() + self.apply_window
+            while len(batch) < self.max_apply and batch[-1] is not _END:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            if batch[-1] is _END:
+                batch.pop()
+                done = True
+
+            # coalesce: only the latest quote per contract / (expiry, strike, cp) is applied
+            futures: Dict[date, float] = {}
+            options: Dict[date, Dict[Tuple[float, int], float]] = {}
+            unknown = rejected = 0
+            for tick in batch:
+                if not _valid_tick(tick):
+                    # a malformed quote is dropped on its own instead of failing the whole batch
+                    rejected += 1
+                elif isinstance(tick, FuturesTick):
+                    futures[tick.expiry] = tick.price
+                elif isinstance(tick, OptionTick) and tick.expiry in self.chains:
+                    options.setdefault(tick.expiry, {})[(tick.strike, tick.cp)] = tick.premium
+                else:
+                    unknown += 1
+            applied = len(futures) + sum(len(q) for q in options.values())
+            self.stats.ticks_applied += applied
+            self.stats.ticks_coalesced += len(batch) - applied - unknown - rejected
+            self.stats.ticks_unknown += unknown
+            self.stats.ticks_rejected += rejected
+            self.stats.apply_batches += 1
+            if not applied:
+                continue
+
+            touched = await loop.run_in_executor(self._executor, self._apply, futures, options)
+            now = loop.time()
+            for expiry in touched:
+                first, _ = self._dirty.get(expiry, (now, now))
+                self._dirty[expiry] = (first, now)
+            if touched or futures:
+                self._wake.set()
+
+    def _apply(self, futures: Dict[date, float], options: Dict[date, Dict[Tuple[float, int], float]]) -> Set[date]:
+        touched: Set[date] = set()
+        with instrumentation.timer("live.apply"):
+            if futures:
+                old = self.forward_curve
+                curve = old.with_forwards(futures)
+                if len(curve.forwards) != len(old.forwards) or not np.array_equal(curve.forwards, old.forwards):
+                    self.forward_curve = curve
+                    self._curve_changed = True
+                    for expiry, chain in self.chains.items():
+                        before = chain.version
+                        chain.set_forward(curve.forward_on(expiry, rule=self.forward_mapping_rule))
+                        if chain.version != before:
+                            touched.add(expiry)
+            for expiry, quotes in options.items():
+                if self.chains[expiry].update_quotes((k, c, p) for (k, c), p in quotes.items()):
+                    touched.add(expiry)
+        return touched
+
+    def _due(self, now: float) -> Tuple[List[date], Optional[float]]:
+        # trailing debounce per expiry, capped at max_delay so a constantly ticking expiry still refits
+        due, next_at = [], None
+        for expiry, (first, last) in self._dirty.items():
+            at = min(last + self.debounce, first + self.max_delay)
+            if self._closing or at <= now:
+                due.append(expiry)
+            else:
+                next_at = at if next_at is None else min(next_at, at)
+        return due, next_at
+
+    async def _recalibrate_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            due, next_at = self._due(loop.time())
+            if not due:
+                if self._closing:
+                    if self._curve_changed:
+                        self._publish(())
+                    return
+                self._wake.clear()
+                timeout = None if next_at is None else max(next_at - loop.time(), 0.0)
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            for expiry in due:
+                del self._dirty[expiry]
+            results = await loop.run_in_executor(self._executor, self._refresh, due)
+            self.stats.recalibrations += len(results)
+            self.stats.refits += sum(r.refit for r in results)
+            if any(r.refit for r in results) or self._curve_changed:
+                self._publish(tuple(results))
+
+    def _refresh(self, expiries: List[date]) -> List[RefreshResult]:
+        with instrumentation.timer("live.recalibrate"):
+            return [self.calibrator.refresh(self.chains[e]) for e in expiries]
+
+    def _publish(self, refreshed: Tuple[RefreshResult, ...]) -> None:
+        self._curve_changed = False
+        self.version += 1
+        surface = dataclasses.replace(self.calibrator.surface, forward_curve=self.forward_curve)
+        update = SurfaceVersion(self.version, surface, self.forward_curve, refreshed, time.time())
+        self.latest = update
+        self.stats.published += 1
+        instrumentation.event("live.publish", version=self.version, refits=sum(r.refit for r in refreshed))
+        for q in self._subscribers:
+            if q.full():
+                q.get_nowait()
+                self.stats.dropped_versions += 1
+            q.put_nowait(update)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Protocol, Union, runtime_checkable
+
+import numpy as np
+
+from src.market.forward_curve import ForwardCurve
+from src.models.black76 import price_array
+
+
+@dataclass(frozen=True)
+class FuturesTick:
+    expiry: date
+    price: float
+    ts: float
+
+
+@dataclass(frozen=True)
+class OptionTick:
+    expiry: date
+    strike: float
+    cp: int
+    premium: float
+    ts: float
+
+
+Tick = Union[FuturesTick, OptionTick]
+
+
+@runtime_checkable
+class QuoteSource(Protocol):
+    def __aiter__(self) -> AsyncIterator[Tick]:
+        ...
+
+
+class ReplaySource:
+    # replays the bundled quotes, then simulates further moves: a common lognormal shock on the
+    # curve and jittered-vol reprices of random strikes on random expiries
+    def __init__(
+        self,
+        forward_curve: ForwardCurve,
+        chains,
+        n_steps: int = 0,
+        options_per_step: int = 20,
+        curve_vol: float = 0.002,
+        quote_vol: float = 0.01,
+        interval: float = 0.0,
+        replay_initial: bool = True,
+        seed: Optional[int] = None,
+    ):
+        self.forward_curve = forward_curve
+        self.chains = list(chains)
+        self.n_steps = int(n_steps)
+        self.options_per_step = int(options_per_step)
+        self.curve_vol = float(curve_vol)
+        self.quote_vol = float(quote_vol)
+        self.interval = float(interval)
+        self.replay_initial = replay_initial
+        self.seed = seed
+
+    @staticmethod
+    def from_data_dir(data_dir: str | Path, **kwargs) -> "ReplaySource":
+        from src.market.option_chain import OptionChain
+
+        data_dir = Path(data_dir)
+        forward_curve = ForwardCurve.from_csv(data_dir / "wti_forward_prices.csv")
+        chains = [OptionChain.from_csv(p, forward_curve) for p in sorted((data_dir / "options").glob("*.csv"))]
+        return ReplaySource(forward_curve, chains, **kwargs)
+
+    async def _emit(self, ticks: List[Tick]) -> AsyncIterator[Tick]:
+        for tick in ticks:
+            yield tick
+            # always yield to the loop so a fast replay cannot starve the consumers
+            await asyncio.sleep(self.interval)
+
+    async def __aiter__(self) -> AsyncIterator[Tick]:
+        rng = np.random.default_rng(self.seed)
+        curve = self.forward_curve
+        expiries = curve.expiries.astype(date).tolist()
+
+        if self.replay_initial:
+            now = time.time()
+            ticks: List[Tick] = [FuturesTick(d, float(f), now) for d, f in zip(expiries, curve.forwards.tolist())]
+            for chain in self.chains:
+                data = chain.data
+                ticks.extend(
+                    OptionTick(chain.expiry, k, c, p, now)
+                    for k, c, p in zip(data["strike"].tolist(), data["cp"].tolist(), data["premium"].tolist())
+                )
+            async for tick in self._emit(ticks):
+                yield tick
+
+        forwards = curve.forwards.copy()
+        for _ in range(self.n_steps):
+            now = time.time()
+            forwards = forwards * np.exp(self.curve_vol * rng.standard_normal() - 0.5 * self.curve_vol**2)
+            moved = ForwardCurve(as_of=curve.as_of, expiries=curve.expiries, forwards=forwards)
+            ticks = [FuturesTick(d, float(f), now) for d, f in zip(expiries, forwards.tolist())]
+            if self.chains:
+                chain = self.chains[int(rng.integers(len(self.chains)))]
+                data = chain.data
+                rows = rng.choice(len(data), size=min(self.options_per_step, len(data)), replace=False)
+                K = data["strike"].to_numpy()[rows]
+                cp = data["cp"].to_numpy()[rows]
+                T = data["T"].to_numpy()[rows]
+                vol = data["iv"].to_numpy()[rows] * np.exp(self.quote_vol * rng.standard_normal(rows.size))
+                premium = price_array(moved.forward_on(chain.expiry), K, T, vol, df=chain.df, cp=cp)
+                # quotes tick in cents like the bundled chains
+                premium = np.maximum(np.round(premium, 2), 0.01)
+                ticks.extend(OptionTick(chain.expiry, k, c, p, now) for k, c, p in zip(K.tolist(), cp.tolist(), premium.tolist()))
+            async for tick in self._emit(ticks):
+                yield tick
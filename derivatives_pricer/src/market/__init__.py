@@ -1,3 +1,3 @@
-from .forward_curve import ForwardCurve, year_fraction_act365
+from .forward_curve import ForwardCurve, forwards_for, year_fraction_act365
 
-__all__ = ["ForwardCurve", "year_fraction_act365"]
+__all__ = ["ForwardCurve", "forwards_for", "year_fraction_act365"]
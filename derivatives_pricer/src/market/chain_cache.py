@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.market.forward_curve import ForwardCurve
+from src.market.option_chain import OptionChain
+
+CACHE_VERSION = 2
+
+_COLUMNS = ("strike", "premium", "cp", "T", "F", "df", "iv", "iterations", "ok")
+
+
+class OptionChainCache:
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+
+    def key(
+        self, path: str | Path, F: float, as_of: date, df: float, forward_mapping_rule: str, exercise: str = "european"
+    ) -> str:
+        h = hashlib.sha256()
+        h.update(Path(path).read_bytes())
+        h.update(repr((CACHE_VERSION, float(F), as_of.isoformat(), float(df), forward_mapping_rule, exercise)).encode())
+        return h.hexdigest()
+
+    def _entry(self, path: Path, key: str) -> Path:
+        return self.directory / f"{path.stem}-{key[:24]}.npz"
+
+    def load(
+        self,
+        path: str | Path,
+        forward_curve: ForwardCurve,
+        as_of: Optional[date] = None,
+        df: float = 1.0,
+        forward_mapping_rule: str = "next",
+        drop_bad: bool = True,
+        exercise: str = "european",
+    ) -> OptionChain:
+        path = Path(path)
+        expiry = pd.to_datetime(path.stem).date()
+        if as_of is None:
+            as_of = forward_curve.as_of
+        F = forward_curve.forward_on(expiry, rule=forward_mapping_rule)
+
+        entry = self._entry(path, self.key(path, F, as_of, df, forward_mapping_rule, exercise))
+        if entry.exists():
+            self.hits += 1
+            with np.load(entry) as z:
+                data = pd.DataFrame({c: z[c] for c in _COLUMNS})
+            data.insert(1, "type", np.where(data["cp"] == 1, "C", "P"))
+        else:
+            self.misses += 1
+            chain = OptionChain.from_csv(
+                path,
+                forward_curve,
+                as_of=as_of,
+                df=df,
+                forward_mapping_rule=forward_mapping_rule,
+                drop_bad=False,
+                exercise=exercise,
+            )
+            data = chain.data
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_name(entry.name + f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as fh:
+                np.savez(fh, **{c: data[c].to_numpy() for c in _COLUMNS})
+            os.replace(tmp, entry)
+
+        if drop_bad:
+            data = data[data["ok"]].copy()
+        data = data.sort_values("strike").reset_index(drop=True)
+        return OptionChain(expiry=expiry, as_of=as_of, F=F, df=float(df), data=data, exercise=exercise)
+
+    def clear(self) -> None:
+        for p in self.directory.glob("*.npz"):
+            p.unlink()
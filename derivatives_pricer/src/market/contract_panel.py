@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+MONTH_CODES = "FGHJKMNQUVXZ"
+# contract histories shipped with the sibling m1-m2 spreads project
+DEFAULT_PANEL_DIR = Path(__file__).resolve().parents[3] / "wti_m1_m2_spreads" / "data"
+
+
+def parse_contract_ticker(ticker: str) -> Optional[date]:
+    # CLZ2025 -> first day of the delivery month
+    if not ticker.startswith("CL") or len(ticker) < 7 or ticker[2] not in MONTH_CODES:
+        return None
+    try:
+        year = int(ticker[3:])
+    except ValueError:
+        return None
+    return date(year, MONTH_CODES.index(ticker[2]) + 1, 1)
+
+
+@dataclass(frozen=True)
+class ContractPanel:
+    # closes: one column per contract (ticker), ordered by delivery month, indexed by trade date
+    closes: pd.DataFrame
+
+    @staticmethod
+    def from_dir(path: str | Path, start: Optional[date] = None) -> "ContractPanel":
+        series = {}
+        months = {}
+        for f in sorted(Path(path).glob("CL*.csv")):
+            month = parse_contract_ticker(f.stem)
+            if month is None:
+                continue
+            raw = pd.read_csv(f, header=None, names=["date", "close", "volume"])
+            raw["date"] = pd.to_datetime(raw["date"])
+            if start is not None:
+                raw = raw[raw["date"] >= pd.Timestamp(start)]
+            if len(raw):
+                series[f.stem] = raw.drop_duplicates("date").set_index("date")["close"].astype(float)
+                months[f.stem] = month
+
+        tickers = sorted(series, key=months.get)
+        closes = pd.DataFrame({t: series[t] for t in tickers}).sort_index()
+        return ContractPanel(closes=closes)
+
+    @property
+    def tickers(self) -> list:
+        return list(self.closes.columns)
+
+    def log_returns(self) -> pd.DataFrame:
+        values = self.closes.to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = np.diff(np.log(np.where(values > 0, values, np.nan)), axis=0)
+        return pd.DataFrame(r, index=self.closes.index[1:], columns=self.closes.columns)
+
+    def consecutive_correlation(self, lag: int = 1, window: Optional[int] = None, min_obs: int = 20) -> float:
+        # pooled correlation of daily log-returns of contract i and contract i + lag,
+        # over the days both traded; each pair is demeaned on its own sample
+        r = self.log_returns().to_numpy()
+        if window is not None:
+            r = r[-int(window):]
+        if r.shape[1] <= lag:
+            raise ValueError("panel needs more contracts than the lag")
+
+        a, b = r[:, :-lag], r[:, lag:]
+        both = np.isfinite(a) & np.isfinite(b)
+        n = both.sum(axis=0)
+        use = n >= 2
+        if n[use].sum() < min_obs:
+            raise ValueError(f"only {int(n[use].sum())} overlapping returns, need {min_obs}")
+
+        a = np.where(both, a, 0.0)[:, use]
+        b = np.where(both, b, 0.0)[:, use]
+        mask, n = both[:, use], n[use]
+        a = np.where(mask, a - a.sum(axis=0) / n, 0.0)
+        b = np.where(mask, b - b.sum(axis=0) / n, 0.0)
+        return float((a * b).sum() / np.sqrt((a * a).sum() * (b * b).sum()))
+
+
+@lru_cache(maxsize=1)
+def default_panel() -> ContractPanel:
+    if not DEFAULT_PANEL_DIR.is_dir():
+        raise FileNotFoundError(f"no contract histories at {DEFAULT_PANEL_DIR}; pass a ContractPanel or rho explicitly")
+    return ContractPanel.from_dir(DEFAULT_PANEL_DIR)
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 import numpy as np
-import pandas as pd
 
 
 def _to_date(x) -> date:
     if isinstance(x, date):
         return x
+    if isinstance(x, np.datetime64):
+        return x.astype("datetime64[D]").astype(date)
+    # pandas only for the odd input types; snapshot loads must not pay for the import
+    import pandas as pd
+
     return pd.to_datetime(x).date()
 
 
@@ -25,56 +29,111 @@ class ForwardCurve:
     expiries: np.ndarray
     forwards: np.ndarray
 
+    _times: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        as_of = _to_date(self.as_of)
+        expiries = np.asarray(self.expiries, dtype="datetime64[D]")
+        forwards = np.asarray(self.forwards, dtype=float)
+
+        order = np.argsort(expiries, kind="stable")
+        if np.any(order != np.arange(len(order))):
+            expiries = expiries[order]
+            forwards = forwards[order]
+
+        days = (expiries - np.datetime64(as_of, "D")).astype(np.int64)
+        times = np.maximum(days / 365.0, 0.0)
+
+        object.__setattr__(self, "as_of", as_of)
+        object.__setattr__(self, "expiries", expiries)
+        object.__setattr__(self, "forwards", forwards)
+        object.__setattr__(self, "_times", times)
+
     @staticmethod
     def from_csv(path: str | Path, as_of: Optional[date] = None) -> "ForwardCurve":
+        import pandas as pd
+
         path = Path(path)
         df = pd.read_csv(path)
 
         if "expiry_date" not in df.columns or "future_price" not in df.columns:
             raise ValueError("CSV must contain columns: expiry_date, future_price")
 
-        df["expiry_date"] = pd.to_datetime(df["expiry_date"]).dt.date
+        df["expiry_date"] = pd.to_datetime(df["expiry_date"])
         df = df.sort_values("expiry_date")
 
         if as_of is None:
-            as_of = df["expiry_date"].iloc[0]
+            as_of = df["expiry_date"].iloc[0].date()
 
-        expiries = df["expiry_date"].to_numpy(dtype=object)
+        expiries = df["expiry_date"].to_numpy(dtype="datetime64[D]")
         forwards = df["future_price"].astype(float).to_numpy()
 
         return ForwardCurve(as_of=as_of, expiries=expiries, forwards=forwards)
 
-    def forward_on(self, expiry: date, rule: str = "next") -> float:
-        expiry = _to_date(expiry)
-        idx = None
+    @property
+    def times(self) -> np.ndarray:
+        return self._times
+
+    def with_forwards(self, updates: Dict[date, float]) -> "ForwardCurve":
+        # new curve with the given contracts repriced; unknown expiries are added as new contracts
+        if not updates:
+            return self
+        targets = np.array([np.datetime64(_to_date(d), "D") for d in updates], dtype="datetime64[D]")
+        prices = np.array(list(updates.values()), dtype=float)
+        expiries = self.expiries.copy()
+        forwards = self.forwards.copy()
+
+        idx = np.searchsorted(expiries, targets)
+        known = (idx < len(expiries)) & (expiries[np.minimum(idx, len(expiries) - 1)] == targets)
+        forwards[idx[known]] = prices[known]
+        if np.any(~known):
+            expiries = np.concatenate([expiries, targets[~known]])
+            forwards = np.concatenate([forwards, prices[~known]])
+        return ForwardCurve(as_of=self.as_of, expiries=expiries, forwards=forwards)
+
+    def forward_on_many(self, expiries, rule: str = "next") -> np.ndarray:
+        targets = np.asarray(expiries, dtype="datetime64[D]")
+        n = len(self.expiries)
+        idx = np.searchsorted(self.expiries, targets, side="left")
 
         if rule == "next":
-            candidates = np.where(self.expiries >= expiry)[0]
-            if len(candidates) == 0:
-                idx = len(self.expiries) - 1
-            else:
-                idx = int(candidates[0])
+            idx = np.minimum(idx, n - 1)
         elif rule == "closest":
-            deltas = np.array([abs((d - expiry).days) for d in self.expiries], dtype=float)
-            idx = int(np.argmin(deltas))
+            lo = np.clip(idx - 1, 0, n - 1)
+            hi = np.clip(idx, 0, n - 1)
+            d_lo = np.abs((self.expiries[lo] - targets).astype(np.int64))
+            d_hi = np.abs((self.expiries[hi] - targets).astype(np.int64))
+            idx = np.where(d_hi < d_lo, hi, lo)
         else:
             raise ValueError("rule must be 'next' or 'closest'")
 
-        return float(self.forwards[idx])
+        return self.forwards[idx]
 
-    def forward_T(self, T: float) -> float:
-        T = float(T)
-        if T <= 0:
-            return float(self.forwards[0])
+    def forward_on(self, expiry: date, rule: str = "next") -> float:
+        return float(self.forward_on_many(_to_date(expiry), rule=rule))
 
-        times = np.array([year_fraction_act365(self.as_of, d) for d in self.expiries], dtype=float)
+    def forward_T_many(self, T) -> np.ndarray:
+        T = np.asarray(T, dtype=float)
+        times = self._times
 
         if np.all(times == 0):
-            return float(self.forwards[0])
+            return np.full(T.shape, float(self.forwards[0]))
 
-        if T <= times.min():
-            return float(self.forwards[np.argmin(times)])
-        if T >= times.max():
-            return float(self.forwards[np.argmax(times)])
+        out = np.interp(T, times, self.forwards)
+        out = np.where(T <= times[0], self.forwards[0], out)
+        out = np.where(T >= times[-1], self.forwards[int(np.argmax(times))], out)
+        return np.where(T <= 0, self.forwards[0], out)
 
-        return float(np.interp(T, times, self.forwards))
+    def forward_T(self, T: float) -> float:
+        return float(self.forward_T_many(float(T)))
+
+
+def forwards_for(F_or_curve, T) -> np.ndarray:
+    T = np.asarray(T, dtype=float)
+    if hasattr(F_or_curve, "forward_T_many"):
+        return F_or_curve.forward_T_many(T)
+    if hasattr(F_or_curve, "forward_T"):
+        expiries, inverse = np.unique(T, return_inverse=True)
+        forwards = np.array([F_or_curve.forward_T(t) for t in expiries], dtype=float)
+        return forwards[inverse.ravel()].reshape(T.shape)
+    return np.broadcast_to(np.asarray(F_or_curve, dtype=float), T.shape).astype(float)
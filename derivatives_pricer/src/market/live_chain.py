@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.market.forward_curve import ForwardCurve
+from src.market.option_chain import OptionChain
+from src.models.american import implied_vol_american_array
+from src.models.implied_vol import implied_vol_black76_array
+
+
+class LiveOptionChain:
+    def __init__(self, chain: OptionChain):
+        data = chain.data
+        self.expiry = chain.expiry
+        self.as_of = chain.as_of
+        self.T = float(data["T"].iloc[0]) if len(data) else 0.0
+        self.F = float(chain.F)
+        self.df = float(chain.df)
+        self.exercise = chain.exercise
+
+        self._strike = data["strike"].to_numpy(dtype=float).copy()
+        self._cp = data["cp"].to_numpy(dtype=int).copy()
+        self._premium = data["premium"].to_numpy(dtype=float).copy()
+        self._iv = data["iv"].to_numpy(dtype=float).copy()
+        self._iterations = data["iterations"].to_numpy(dtype=int).copy()
+        self._ok = data["ok"].to_numpy(dtype=bool).copy()
+        self._index = {(float(k), int(c)): i for i, (k, c) in enumerate(zip(self._strike, self._cp))}
+        self._lock = threading.Lock()
+        self.version = 0
+
+    @staticmethod
+    def from_csv(
+        path: str | Path,
+        forward_curve: ForwardCurve,
+        as_of: Optional[date] = None,
+        df: float = 1.0,
+        forward_mapping_rule: str = "next",
+        exercise: str = "european",
+    ) -> "LiveOptionChain":
+        chain = OptionChain.from_csv(
+            path,
+            forward_curve,
+            as_of=as_of,
+            df=df,
+            forward_mapping_rule=forward_mapping_rule,
+            drop_bad=False,
+            exercise=exercise,
+        )
+        return LiveOptionChain(chain)
+
+    def _solve(self, rows: np.ndarray) -> None:
+        solve = implied_vol_american_array if self.exercise == "american" else implied_vol_black76_array
+        res = solve(
+            premium=self._premium[rows],
+            F=self.F,
+            K=self._strike[rows],
+            T=self.T,
+            cp=self._cp[rows],
+            df=self.df,
+        )
+        self._iv[rows] = res.vol
+        self._iterations[rows] = res.iterations
+        self._ok[rows] = res.converged & np.isfinite(res.vol)
+
+    def update_quotes(self, quotes: Iterable[Tuple[float, int, float]]) -> int:
+        with self._lock:
+            changed = []
+            # a new contract quoted twice in one batch is added once, with its last premium
+            added: Dict[Tuple[float, int], float] = {}
+            for strike, cp, premium in quotes:
+                key = (float(strike), int(cp))
+                i = self._index.get(key)
+                if i is None:
+                    added[key] = float(premium)
+                elif self._premium[i] != float(premium):
+                    self._premium[i] = float(premium)
+                    changed.append(i)
+
+            if added:
+                start = len(self._strike)
+                self._strike = np.concatenate([self._strike, [k for k, _ in added]])
+                self._cp = np.concatenate([self._cp, np.array([c for _, c in added], dtype=int)])
+                self._premium = np.concatenate([self._premium, list(added.values())])
+                self._iv = np.concatenate([self._iv, np.full(len(added), np.nan)])
+                self._iterations = np.concatenate([self._iterations, np.zeros(len(added), dtype=int)])
+                self._ok = np.concatenate([self._ok, np.zeros(len(added), dtype=bool)])
+                for j, key in enumerate(added):
+                    self._index[key] = start + j
+                changed.extend(range(start, start + len(added)))
+
+            if changed:
+                self._solve(np.unique(np.array(changed, dtype=int)))
+                self.version += 1
+            return len(changed)
+
+    def set_forward(self, F: float) -> None:
+        with self._lock:
+            if float(F) == self.F:
+                return
+            self.F = float(F)
+            self._solve(np.arange(len(self._strike)))
+            self.version += 1
+
+    def smile(self) -> Tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            order = np.argsort(self._strike, kind="stable")
+            order = order[self._ok[order]]
+            return self._strike[order].copy(), self._iv[order].copy()
+
+    def to_chain(self, drop_bad: bool = True) -> OptionChain:
+        with self._lock:
+            data = pd.DataFrame(
+                {
+                    "strike": self._strike,
+                    "type": np.where(self._cp == 1, "C", "P"),
+                    "premium": self._premium,
+                    "cp": self._cp,
+                    "T": self.T,
+                    "F": self.F,
+                    "df": self.df,
+                    "iv": self._iv,
+                    "iterations": self._iterations,
+                    "ok": self._ok,
+                }
+            )
+        if drop_bad:
+            data = data[data["ok"]].copy()
+        data = data.sort_values("strike").reset_index(drop=True)
+        return OptionChain(expiry=self.expiry, as_of=self.as_of, F=self.F, df=self.df, data=data, exercise=self.exercise)
@@ -8,8 +8,10 @@ from typing import Optional, Tuple
 import numpy as np
 import pandas as pd
 
+from src import instrumentation
 from src.market.forward_curve import year_fraction_act365, ForwardCurve
-from src.models.implied_vol import implied_vol_black76
+from src.models.american import check_exercise, implied_vol_american_array
+from src.models.implied_vol import implied_vol_black76_array
 
 
 @dataclass(frozen=True)
@@ -19,6 +21,7 @@ class OptionChain:
     F: float
     df: float
     data: pd.DataFrame
+    exercise: str = "european"
 
     @staticmethod
     def from_csv(
@@ -28,7 +31,22 @@ class OptionChain:
         df: float = 1.0,
         forward_mapping_rule: str = "next",
         drop_bad: bool = True,
+        exercise: str = "european",
     ) -> "OptionChain":
+        with instrumentation.timer("option_chain.from_csv"):
+            return OptionChain._from_csv(path, forward_curve, as_of, df, forward_mapping_rule, drop_bad, exercise)
+
+    @staticmethod
+    def _from_csv(
+        path: str | Path,
+        forward_curve: ForwardCurve,
+        as_of: Optional[date],
+        df: float,
+        forward_mapping_rule: str,
+        drop_bad: bool,
+        exercise: str,
+    ) -> "OptionChain":
+        check_exercise(exercise)
         path = Path(path)
         expiry = pd.to_datetime(path.stem).date()
         if as_of is None:
@@ -41,39 +59,35 @@ class OptionChain:
         if not {"strike", "type", "premium"}.issubset(set(raw.columns)):
             raise ValueError("Options CSV must contain columns: strike, type, premium")
 
-        df_out = raw.copy()
-        df_out["strike"] = df_out["strike"].astype(float)
-        df_out["type"] = df_out["type"].astype(str).str.upper().str.strip()
-        df_out["premium"] = df_out["premium"].astype(float)
-
-        df_out["cp"] = np.where(df_out["type"] == "C", 1, -1)
-        df_out["T"] = T
-        df_out["F"] = F
-        df_out["df"] = float(df)
-
-        vols = []
-        oks = []
-        for _, r in df_out.iterrows():
-            res = implied_vol_black76(
-                premium=float(r["premium"]),
-                F=F,
-                K=float(r["strike"]),
-                T=T,
-                cp=int(r["cp"]),
-                df=float(df),
-            )
-            vols.append(res.vol)
-            oks.append(bool(res.converged) and np.isfinite(res.vol))
-
-        df_out["iv"] = vols
-        df_out["ok"] = oks
-
-        if drop_bad:
-            df_out = df_out[df_out["ok"]].copy()
-
-        df_out = df_out.sort_values("strike").reset_index(drop=True)
-
-        return OptionChain(expiry=expiry, as_of=as_of, F=F, df=float(df), data=df_out)
+        K = raw["strike"].to_numpy(dtype=float)
+        kind = raw["type"].astype(str).str.upper().str.strip().to_numpy()
+        premium = raw["premium"].to_numpy(dtype=float)
+        cp = np.where(kind == "C", 1, -1)
+
+        solve = implied_vol_american_array if exercise == "american" else implied_vol_black76_array
+        res = solve(premium=premium, F=F, K=K, T=T, cp=cp, df=float(df))
+        ok = res.converged & np.isfinite(res.vol)
+
+        # filter and sort on the arrays and build the frame once: column-by-column assignment dominated load time
+        rows = np.flatnonzero(ok) if drop_bad else np.arange(K.size)
+        rows = rows[np.argsort(K[rows])]
+        n = rows.size
+        columns = {name: raw[name].to_numpy()[rows] for name in raw.columns}
+        columns.update(
+            strike=K[rows],
+            type=kind[rows],
+            premium=premium[rows],
+            cp=cp[rows],
+            T=np.full(n, T),
+            F=np.full(n, F),
+            df=np.full(n, float(df)),
+            iv=res.vol[rows],
+            iterations=res.iterations[rows],
+            ok=ok[rows],
+        )
+        df_out = pd.DataFrame(columns)
+
+        return OptionChain(expiry=expiry, as_of=as_of, F=F, df=float(df), data=df_out, exercise=exercise)
 
     def smile(self) -> Tuple[np.ndarray, np.ndarray]:
         K = self.data["strike"].to_numpy(dtype=float)
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.market.forward_curve import ForwardCurve
+from src.sabr.params import SABRParams
+from src.surfaces.sabr_surface import SABRVolSurface
+
+# layout: MAGIC | version u32 | meta length u32 | JSON meta | pad | arrays, each 64-byte aligned
+MAGIC = b"WTISNAP\x00"
+SNAPSHOT_VERSION = 1
+ALIGN = 64
+
+_PREFIX = struct.Struct("<8sII")
+_CHAIN_COLUMNS = ("strike", "premium", "cp", "T", "F", "df", "iv", "iterations", "ok")
+
+
+def _aligned(n: int) -> int:
+    return -(-n // ALIGN) * ALIGN
+
+
+def write_snapshot(
+    path: str | Path,
+    forward_curve: ForwardCurve,
+    surface: Optional[SABRVolSurface] = None,
+    chains: Iterable = (),
+) -> None:
+    arrays: Dict[str, np.ndarray] = {
+        "curve.expiries": forward_curve.expiries.astype("datetime64[D]").view(np.int64),
+        "curve.forwards": forward_curve.forwards.astype(np.float64),
+    }
+    meta: dict = {"as_of": forward_curve.as_of.isoformat(), "chains": []}
+
+    if surface is not None:
+        expiries = sorted(surface.params_by_expiry)
+        params = [surface.params_by_expiry[d] for d in expiries]
+        arrays["sabr.expiries"] = np.array(expiries, dtype="datetime64[D]").view(np.int64)
+        # columns: alpha, beta, rho, nu, shift
+        arrays["sabr.params"] = np.array([[p.alpha, p.beta, p.rho, p.nu, p.shift] for p in params], dtype=np.float64).reshape(-1, 5)
+        meta["sabr_as_of"] = surface.as_of.isoformat()
+
+    for chain in chains:
+        key = chain.expiry.isoformat()
+        for col in _CHAIN_COLUMNS:
+            values = chain.data[col].to_numpy()
+            if col == "ok":
+                values = values.astype(np.bool_)
+            elif col in ("cp", "iterations"):
+                values = values.astype(np.int64)
+            else:
+                values = values.astype(np.float64)
+            arrays[f"chain.{key}.{col}"] = values
+        meta["chains"].append(
+            {"expiry": key, "as_of": chain.as_of.isoformat(), "F": float(chain.F), "df": float(chain.df), "exercise": chain.exercise}
+        )
+
+    # offsets are relative to the start of the data section, which begins after the aligned header
+    offset = 0
+    layout = {}
+    for name, a in arrays.items():
+        a = np.ascontiguousarray(a)
+        arrays[name] = a
+        layout[name] = {"offset": offset, "dtype": a.dtype.str, "shape": list(a.shape)}
+        offset = _aligned(offset + a.nbytes)
+    meta["arrays"] = layout
+
+    header = json.dumps(meta, separators=(",", ":")).encode()
+    data_start = _aligned(_PREFIX.size + len(header))
+
+    path = Path(path)
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(_PREFIX.pack(MAGIC, SNAPSHOT_VERSION, len(header)))
+        fh.write(header)
+        fh.write(b"\x00" * (data_start - _PREFIX.size - len(header)))
+        pos = 0
+        for name, a in arrays.items():
+            fh.write(b"\x00" * (layout[name]["offset"] - pos))
+            fh.write(a.tobytes())
+            pos = layout[name]["offset"] + a.nbytes
+        fh.write(b"\x00" * (_aligned(pos) - pos))
+    os.replace(tmp, path)
+
+
+@dataclass(frozen=True)
+class ChainArrays:
+    expiry: date
+    as_of: date
+    F: float
+    df: float
+    exercise: str
+    columns: Dict[str, np.ndarray]
+
+
+class MarketSnapshot:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        # read-only map: every process opening the file shares the same page-cache pages
+        self._mm = np.memmap(self.path, dtype=np.uint8, mode="r")
+        magic, version, header_len = _PREFIX.unpack(bytes(self._mm[: _PREFIX.size]))
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a market snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"snapshot version {version} is not supported (expected {SNAPSHOT_VERSION})")
+
+        self.meta = json.loads(bytes(self._mm[_PREFIX.size : _PREFIX.size + header_len]))
+        self._data_start = _aligned(_PREFIX.size + header_len)
+        self.as_of = date.fromisoformat(self.meta["as_of"])
+        self._curve: Optional[ForwardCurve] = None
+
+    def array(self, name: str) -> np.ndarray:
+        spec = self.meta["arrays"][name]
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        start = self._data_start + spec["offset"]
+        buf = self._mm[start : start + count * dtype.itemsize]
+        return buf.view(dtype).reshape(spec["shape"])
+
+    def _dates(self, name: str) -> np.ndarray:
+        return self.array(name).view("datetime64[D]")
+
+    @property
+    def forward_curve(self) -> ForwardCurve:
+        if self._curve is None:
+            self._curve = ForwardCurve(
+                as_of=self.as_of, expiries=self._dates("curve.expiries"), forwards=self.array("curve.forwards")
+            )
+        return self._curve
+
+    @property
+    def has_surface(self) -> bool:
+        return "sabr.params" in self.meta["arrays"]
+
+    def surface(self) -> SABRVolSurface:
+        if not self.has_surface:
+            raise ValueError("snapshot has no SABR surface")
+        expiries = self._dates("sabr.expiries").astype(date).tolist()
+        params = self.array("sabr.params")
+        by_expiry = {
+            d: SABRParams(alpha=float(a), beta=float(b), rho=float(r), nu=float(n), shift=float(s))
+            for d, (a, b, r, n, s) in zip(expiries, params.tolist())
+        }
+        as_of = date.fromisoformat(self.meta["sabr_as_of"])
+        return SABRVolSurface(as_of=as_of, forward_curve=self.forward_curve, params_by_expiry=by_expiry)
+
+    @property
+    def chain_expiries(self) -> List[date]:
+        return [date.fromisoformat(c["expiry"]) for c in self.meta["chains"]]
+
+    def chain_arrays(self, expiry: date) -> ChainArrays:
+        key = expiry.isoformat()
+        for c in self.meta["chains"]:
+            if c["expiry"] == key:
+                return ChainArrays(
+                    expiry=expiry,
+                    as_of=date.fromisoformat(c["as_of"]),
+                    F=c["F"],
+                    df=c["df"],
+                    exercise=c["exercise"],
+                    columns={col: self.array(f"chain.{key}.{col}") for col in _CHAIN_COLUMNS},
+                )
+        raise KeyError(f"no chain for {key} in snapshot")
+
+    def chain(self, expiry: date, drop_bad: bool = True):
+        # OptionChain carries a DataFrame, so pandas is only imported on this path
+        import pandas as pd
+
+        from src.market.option_chain import OptionChain
+
+        ca = self.chain_arrays(expiry)
+        data = pd.DataFrame({col: np.array(v) for col, v in ca.columns.items()})
+        data.insert(1, "type", np.where(data["cp"] == 1, "C", "P"))
+        if drop_bad:
+            data = data[data["ok"]].copy()
+        data = data.sort_values("strike").reset_index(drop=True)
+        return OptionChain(expiry=ca.expiry, as_of=ca.as_of, F=ca.F, df=ca.df, data=data, exercise=ca.exercise)
+
+    def close(self) -> None:
+        mm = getattr(self._mm, "_mmap", None)
+        self._curve = None
+        self._mm = None
+        if mm is not None:
+            try:
+                mm.close()
+            except BufferError:
+                # arrays handed out still reference the map; it closes when they are released
+                pass
+
+    def __enter__(self) -> "MarketSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
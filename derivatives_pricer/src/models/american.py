@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import numpy as np
+
+from src.models.black76 import _d1_d2_unchecked, _price_unchecked, norm_cdf_array, norm_pdf_array, validate_inputs
+from src.models.greeks import GREEK_NAMES
+from src.models.implied_vol import ImpliedVolArrayResult, implied_vol_black76_array
+
+
+EXERCISE_STYLES = ("european", "american")
+AMERICAN_METHODS = ("baw", "lattice")
+
+
+def check_exercise(exercise: str) -> None:
+    if exercise not in EXERCISE_STYLES:
+        raise ValueError(f"exercise must be one of {EXERCISE_STYLES}")
+
+
+def _rate(T: np.ndarray, df: np.ndarray) -> np.ndarray:
+    # continuously compounded rate implied by the discount factor to expiry
+    safe_T = np.where(T > 0.0, T, 1.0)
+    safe_df = np.where(df > 0.0, df, 1.0)
+    return np.where(T > 0.0, -np.log(safe_df) / safe_T, 0.0)
+
+
+def _prepare(F, K, T, vol, df, cp):
+    F, K, T, vol, df = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (F, K, T, vol, df)))
+    cp = np.broadcast_to(np.asarray(cp, dtype=int), F.shape)
+    validate_inputs(F, K, T, vol, df=df, cp=cp)
+    return F, K, T, vol, df, cp
+
+
+def _critical_price(K, T, vol, df, cp, q, tol: float = 1e-8, max_iter: int = 100) -> np.ndarray:
+    # Barone-Adesi-Whaley early exercise boundary for a futures option (cost of carry b = 0)
+    vsqrtT = vol * np.sqrt(T)
+    M = 2.0 * _rate(T, df) / (vol * vol)
+    q_inf = 0.5 * (1.0 + cp * np.sqrt(1.0 + 4.0 * M))
+    S_inf = K / (1.0 - 1.0 / q_inf)
+    h = -2.0 * vsqrtT * K / (cp * (S_inf - K))
+    S = np.where(cp == 1, K + (S_inf - K) * (1.0 - np.exp(h)), S_inf + (K - S_inf) * np.exp(h))
+
+    live = np.arange(S.size)
+    for _ in range(max_iter):
+        s, k, t, v, d, c, qq, vt = (x[live] for x in (S, K, T, vol, df, cp, q, vsqrtT))
+        d1, _, _ = _d1_d2_unchecked(s, k, t, v)
+        euro = _price_unchecked(s, k, t, v, d, c)
+        Nd1 = norm_cdf_array(c * d1)
+        rhs = euro + c * (1.0 - d * Nd1) * s / qq
+        lhs = c * (s - k)
+        done = np.abs(lhs - rhs) / k < tol
+        live = live[~done]
+        if not live.size:
+            break
+        s, k, d, c, qq, vt, rhs, Nd1, d1 = (x[~done] for x in (s, k, d, c, qq, vt, rhs, Nd1, d1))
+        # Newton on c * (S - K) = rhs(S); slope is d rhs / dS
+        slope = c * (d * Nd1 * (1.0 - 1.0 / qq) + (1.0 - c * d * norm_pdf_array(d1) / vt) / qq)
+        S[live] = np.maximum((c * k + rhs - slope * s) / (c - slope), 1e-12)
+    return S
+
+
+def american_price_baw(F, K, T, vol, df=1.0, cp=1) -> np.ndarray:
+    F, K, T, vol, df, cp = _prepare(F, K, T, vol, df, cp)
+    euro = _price_unchecked(F, K, T, vol, df, cp)
+    intrinsic = np.maximum(cp * (F - K), 0.0)
+
+    r = _rate(T, df)
+    early = (r > 0.0) & (T > 0.0) & (vol > 0.0)
+    out = np.array(np.maximum(euro, intrinsic))
+    if not np.any(early):
+        return out
+
+    f, k, t, v, d, c = (x[early] for x in (F, K, T, vol, df, cp))
+    M = 2.0 * r[early] / (v * v)
+    big_k = 1.0 - d
+    q = 0.5 * (1.0 + c * np.sqrt(1.0 + 4.0 * M / big_k))
+    S_star = _critical_price(k, t, v, d, c, q)
+
+    d1, _, _ = _d1_d2_unchecked(S_star, k, t, v)
+    A = c * (S_star / q) * (1.0 - d * norm_cdf_array(c * d1))
+    with np.errstate(over="ignore"):
+        value = euro[early] + A * (f / S_star) ** q
+    exercise_now = c * (f - S_star) >= 0.0
+    out[early] = np.maximum(np.where(exercise_now, c * (f - k), value), intrinsic[early])
+    return out
+
+
+def american_price_lattice(F, K, T, vol, df=1.0, cp=1, steps: int = 500) -> np.ndarray:
+    F, K, T, vol, df, cp = _prepare(F, K, T, vol, df, cp)
+    shape = F.shape
+    F, K, T, vol, df, cp = (x.ravel()[:, None] for x in (F, K, T, vol, df, cp))
+
+    # CRR tree on the futures price, one row per option; degenerate rows fall back below
+    degenerate = (T == 0.0) | (vol == 0.0)
+    dt = np.where(degenerate, 1.0, T) / steps
+    sig = np.where(degenerate, 1.0, vol)
+    u = np.exp(sig * np.sqrt(dt))
+    p = (1.0 - 1.0 / u) / (u - 1.0 / u)
+    disc = np.exp(-_rate(T, df) * dt)
+
+    j = np.arange(steps + 1)
+    V = np.maximum(cp * (F * u ** (2 * j - steps) - K), 0.0)
+    for i in range(steps - 1, -1, -1):
+        j = j[:-1]
+        cont = disc * (p * V[:, 1:] + (1.0 - p) * V[:, :-1])
+        V = np.maximum(cont, cp * (F * u ** (2 * j - i) - K))
+
+    value = V[:, 0]
+    F, K, T, vol, df, cp, degenerate = (x[:, 0] for x in (F, K, T, vol, df, cp, degenerate))
+    fallback = np.maximum(_price_unchecked(F, K, T, vol, df, cp), np.maximum(cp * (F - K), 0.0))
+    return np.where(degenerate, fallback, value).reshape(shape)
+
+
+def american_price(F, K, T, vol, df=1.0, cp=1, method: str = "baw", steps: int = 500) -> np.ndarray:
+    if method == "baw":
+        return american_price_baw(F, K, T, vol, df=df, cp=cp)
+    if method == "lattice":
+        return american_price_lattice(F, K, T, vol, df=df, cp=cp, steps=steps)
+    raise ValueError(f"method must be one of {AMERICAN_METHODS}")
+
+
+def price_by_exercise(F, K, T, vol, df, cp, american) -> np.ndarray:
+    # Black76 everywhere, BAW on the American trades; american is a per-trade mask along the last axis
+    F, K, T, vol, df, cp = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (F, K, T, vol, df)), np.asarray(cp, dtype=int)
+    )
+    out = np.array(_price_unchecked(F, K, T, vol, df, cp))
+    american = np.asarray(american, dtype=bool)
+    if np.any(american):
+        out[..., american] = american_price_baw(*(x[..., american] for x in (F, K, T, vol, df, cp)))
+    return out
+
+
+def american_greeks(F, K, T, vol, df=1.0, cp=1, method: str = "baw", F_bump: float = 1e-3, vol_bump: float = 1e-3, dt: float = 1.0 / 365.0) -> dict:
+    F, K, T, vol, df, cp = _prepare(F, K, T, vol, df, cp)
+    h = F * F_bump
+    # keep the vol bump inside the domain and the time step inside the option life
+    dv = np.minimum(vol_bump, np.maximum(vol, 1e-12))
+    tau = np.minimum(dt, T)
+
+    F_rows = np.stack([F, F + h, F - h, F, F, F + h, F + h, F - h, F - h, F, F + h, F - h])
+    v_rows = np.stack([vol, vol, vol, vol + dv, vol - dv, vol + dv, vol - dv, vol + dv, vol - dv, vol, vol, vol])
+    T_rows = np.stack([T] * 9 + [T - tau, T - tau, T - tau])
+    V = american_price(F_rows, K, T_rows, v_rows, df=df, cp=cp, method=method)
+    base, up, down, v_up, v_down, uu, ud, du, dd, t0, t_up, t_down = V
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = (up - down) / (2.0 * h)
+        theta = np.where(tau > 0, (t0 - base) / tau, 0.0)
+        charm = np.where(tau > 0, ((t_up - t_down) / (2.0 * h) - delta) / tau, 0.0)
+    out = {
+        "price": base,
+        "delta": delta,
+        "gamma": (up - 2.0 * base + down) / (h * h),
+        "vega": (v_up - v_down) / (2.0 * dv),
+        "theta": theta,
+        "vanna": (uu - ud - du + dd) / (4.0 * h * dv),
+        "volga": (v_up - 2.0 * base + v_down) / (dv * dv),
+        "charm": charm,
+    }
+    if F.ndim == 0:
+        return {name: float(out[name]) for name in GREEK_NAMES}
+    return out
+
+
+def implied_vol_american_array(
+    premium,
+    F,
+    K,
+    T,
+    cp,
+    df=1.0,
+    method: str = "baw",
+    vol_low: float = 1e-8,
+    vol_high: float = 5.0,
+    tol: float = 1e-8,
+    max_iter: int = 100,
+) -> ImpliedVolArrayResult:
+    premium, F, K, T, df = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (premium, F, K, T, df)))
+    cp = np.broadcast_to(np.asarray(cp, dtype=int), F.shape)
+    validate_inputs(F, K, T, np.zeros_like(F), df=df, cp=cp)
+
+    shape = F.shape
+    premium, F, K, T, df, cp = (x.ravel() for x in (premium, F, K, T, df, cp))
+
+    vol = np.full(F.size, np.nan)
+    iterations = np.zeros(F.size, dtype=int)
+    converged = np.zeros(F.size, dtype=bool)
+
+    # the American price dominates the European one at the same vol, so the
+    # European implied vol of the premium caps the American one
+    euro = implied_vol_black76_array(premium, F, K, T, cp, df=df, vol_low=vol_low, vol_high=vol_high)
+    intrinsic = np.maximum(cp * (F - K), 0.0)
+    floor = american_price(F, K, T, np.full(F.size, vol_low), df=df, cp=cp, method=method)
+
+    expired = T <= 0
+    at_floor = ~expired & (np.abs(premium - floor) <= 1e-10)
+    vol[expired | at_floor] = 0.0
+    converged[expired | at_floor] = True
+
+    active = ~expired & ~at_floor & (premium > floor) & (premium >= intrinsic)
+    idx = np.nonzero(active)[0]
+    p, f, k, t, d, c = premium[idx], F[idx], K[idx], T[idx], df[idx], cp[idx]
+
+    lo = np.full(idx.size, vol_low)
+    hi = np.where(euro.converged[idx] & np.isfinite(euro.vol[idx]), euro.vol[idx] + 1e-6, vol_high)
+    f_hi = american_price(f, k, t, hi, df=d, cp=c, method=method) - p
+    for _ in range(30):
+        need = f_hi < 0
+        if not np.any(need):
+            break
+        hi[need] *= 1.5
+        f_hi[need] = american_price(f[need], k[need], t[need], hi[need], df=d[need], cp=c[need], method=method) - p[need]
+
+    # vectorized bisection: the American price is monotone in vol
+    live = np.nonzero(f_hi >= 0)[0]
+    it = 0
+    while live.size and it < max_iter:
+        mid = 0.5 * (lo[live] + hi[live])
+        diff = american_price(f[live], k[live], t[live], mid, df=d[live], cp=c[live], method=method) - p[live]
+
+        done = (np.abs(diff) < tol) | (hi[live] - lo[live] < 1e-10)
+        vol[idx[live[done]]] = mid[done]
+        converged[idx[live[done]]] = True
+        iterations[idx[live[done]]] = it + 1
+
+        hi[live] = np.where(diff > 0, mid, hi[live])
+        lo[live] = np.where(diff <= 0, mid, lo[live])
+        live = live[~done]
+        it += 1
+
+    vol[idx[live]] = 0.5 * (lo[live] + hi[live])
+    iterations[idx[live]] = it
+
+    return ImpliedVolArrayResult(
+        vol=vol.reshape(shape),
+        iterations=iterations.reshape(shape),
+        converged=converged.reshape(shape),
+    )
@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from src import instrumentation
+from src.instrument.apo import AveragePriceOption
+from src.market.forward_curve import ForwardCurve
+from src.models.black76 import price as black_price
+from src.sabr.params import SABRParams
+from src.sabr.sabr import hagan_lognormal_iv_array
+from src.surfaces.vol_interface import surface_vols
+
+try:
+    from scipy.special import ndtri as _ndtri
+    from scipy.stats import qmc as _qmc
+    _HAS_SCIPY = True
+except Exception:
+    _HAS_SCIPY = False
+
+
+DYNAMICS = ("lognormal", "sabr")
+SAMPLERS = ("pseudo", "sobol")
+
+
+@dataclass(frozen=True)
+class APOResult:
+    pv: float
+    stderr: float
+    n_paths: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class _Schedule:
+    # future fixings only; realized ones are folded into fixed_sum
+    times: np.ndarray
+    contract: np.ndarray
+    F0: np.ndarray
+    n_fixings: int
+    fixed_sum: float
+    K: float
+    cp: int
+    df: float
+    T_pay: float
+
+
+def _schedule(
+    option: AveragePriceOption,
+    forward_curve: ForwardCurve,
+    df: float,
+    realized: Optional[Mapping[date, float]],
+) -> Tuple[_Schedule, np.ndarray]:
+    if option.cp not in (1, -1):
+        raise ValueError("cp must be +1 (call) or -1 (put).")
+    dates = option.fixing_dates()
+    as_of = np.datetime64(forward_curve.as_of, "D")
+    past = dates < as_of
+
+    fixed_sum = 0.0
+    if np.any(past):
+        realized = {np.datetime64(d, "D"): float(v) for d, v in (realized or {}).items()}
+        missing = [str(d) for d in dates[past] if d not in realized]
+        if missing:
+            raise ValueError(f"missing realized fixings for {missing}")
+        fixed_sum = float(sum(realized[d] for d in dates[past]))
+
+    future = dates[~past]
+    times = (future - as_of).astype(np.int64) / 365.0
+    # each fixing averages the front month: first contract expiring on or after the fixing date
+    n = len(forward_curve.expiries)
+    idx = np.minimum(np.searchsorted(forward_curve.expiries, future, side="left"), n - 1)
+    contracts, inverse = np.unique(idx, return_inverse=True)
+
+    sched = _Schedule(
+        times=times,
+        contract=inverse.ravel(),
+        F0=forward_curve.forwards[contracts],
+        n_fixings=len(dates),
+        fixed_sum=fixed_sum,
+        K=float(option.K),
+        cp=int(option.cp),
+        df=float(df),
+        T_pay=float(times[-1]) if len(times) else 0.0,
+    )
+    return sched, forward_curve.times[contracts]
+
+
+def _contract_sabr(model, T_c: np.ndarray) -> np.ndarray:
+    if isinstance(model, SABRParams):
+        params = [model] * len(T_c)
+    elif hasattr(model, "params_at"):
+        params = [model.params_at(float(t)) for t in T_c]
+    else:
+        raise ValueError("sabr dynamics need SABRParams or a SABR surface")
+    if any(p.beta != 1.0 or p.shift != 0.0 for p in params):
+        raise ValueError("sabr dynamics support beta=1, unshifted params only")
+    # columns: alpha, rho, nu
+    return np.array([[p.alpha, p.rho, p.nu] for p in params], dtype=float).reshape(-1, 3)
+
+
+def _contract_vols(model, T_c: np.ndarray, F_c: np.ndarray) -> np.ndarray:
+    # ATM vol of each contract at its own expiry
+    if isinstance(model, SABRParams):
+        p = model
+        return hagan_lognormal_iv_array(F_c, F_c, T_c, p.alpha, p.beta, p.rho, p.nu, p.shift)
+    return surface_vols(model, T_c, F_c)
+
+
+def apo_moment_matching(
+    option: AveragePriceOption,
+    forward_curve: ForwardCurve,
+    vol_or_surface,
+    df: float = 1.0,
+    realized: Optional[Mapping[date, float]] = None,
+) -> float:
+    sched, T_c = _schedule(option, forward_curve, df, realized)
+    sig = _contract_vols(vol_or_surface, T_c, sched.F0)[sched.contract]
+    F = sched.F0[sched.contract]
+    t = sched.times
+    w = 1.0 / sched.n_fixings
+
+    K_eff = sched.K - sched.fixed_sum * w
+    if len(t) == 0:
+        return option.qty * sched.df * max(sched.cp * -K_eff, 0.0)
+
+    # one-factor lognormal: cov(ln F_j, ln F_k) = sig_j sig_k min(t_j, t_k)
+    M1 = w * float(F.sum())
+    cov = np.outer(sig, sig) * np.minimum.outer(t, t)
+    M2 = w * w * float(F @ np.exp(cov) @ F)
+
+    if K_eff <= 0.0:
+        # the average is certain to finish above strike
+        return option.qty * sched.df * max(sched.cp * (M1 - K_eff), 0.0)
+    if sched.T_pay <= 0.0:
+        return option.qty * sched.df * max(sched.cp * (M1 - K_eff), 0.0)
+
+    sigma_A = math.sqrt(max(math.log(M2 / (M1 * M1)), 0.0) / sched.T_pay)
+    return option.qty * black_price(M1, K_eff, sched.T_pay, sigma_A, df=sched.df, cp=sched.cp)
+
+
+def _time_grid(times: np.ndarray, max_dt: float) -> Tuple[np.ndarray, np.ndarray]:
+    knots = np.concatenate([[0.0], np.unique(times)])
+    grid = [0.0]
+    for a, b in zip(knots[:-1], knots[1:]):
+        n = max(1, int(math.ceil((b - a) / max_dt)))
+        grid.extend(a + (b - a) * np.arange(1, n + 1) / n)
+    grid = np.asarray(grid)
+    # index of each fixing on the grid (fixings at t=0 read the start point)
+    return grid, np.searchsorted(grid, times - 1e-12, side="left").clip(0, len(grid) - 1)
+
+
+def _split(n: int, parts: int, unit: int) -> List[int]:
+    # n paths in near-equal shares that are whole antithetic pairs (unit=2) or single paths
+    units = -(-int(n) // unit)
+    base, extra = divmod(units, parts)
+    return [unit * (base + (i < extra)) for i in range(parts)]
+
+
+def _normals(rng: np.random.Generator, sobol, m: int, dim: int, antithetic: bool) -> np.ndarray:
+    half = m // 2 if antithetic else m
+    if sobol is not None:
+        # Sobol balance needs power-of-two draws; a short last chunk keeps the leading points
+        u = sobol.random(1 << max(half - 1, 0).bit_length())[:half]
+        z = _ndtri(np.clip(u, 1e-12, 1.0 - 1e-12))
+    else:
+        z = rng.standard_normal((half, dim))
+    return np.concatenate([z, -z]) if antithetic else z
+
+
+def _lognormal_fixings(sched: _Schedule, sig: np.ndarray, z: np.ndarray) -> np.ndarray:
+    t = sched.times
+    dt = np.diff(np.concatenate([[0.0], t]))
+    W = np.cumsum(z * np.sqrt(dt), axis=1)
+    sig_j = sig[sched.contract]
+    return sched.F0[sched.contract] * np.exp(sig_j * W - 0.5 * sig_j * sig_j * t)
+
+
+def _sabr_fixings(sched: _Schedule, sabr: np.ndarray, z: np.ndarray, grid: np.ndarray, at: np.ndarray) -> np.ndarray:
+    alpha0, rho, nu = sabr[:, 0], sabr[:, 1], sabr[:, 2]
+    m, n_steps = z.shape[0], len(grid) - 1
+    zv, zb = z[:, :n_steps], z[:, n_steps:]
+    dt = np.diff(grid)
+    rho_bar = np.sqrt(1.0 - rho * rho)
+
+    # shared vol driver Z and orthogonal driver B across all contracts (one factor each)
+    x = np.zeros((m, len(alpha0)))
+    Z = np.zeros((m, 1))
+    needed = set(at.tolist())
+    snaps = {0: x.copy()} if 0 in needed else {}
+    for i in range(n_steps):
+        a = alpha0 * np.exp(nu * Z - 0.5 * nu * nu * grid[i])
+        sq = math.sqrt(dt[i])
+        dW = (rho * zv[:, i : i + 1] + rho_bar * zb[:, i : i + 1]) * sq
+        x += a * dW - 0.5 * a * a * dt[i]
+        Z = Z + zv[:, i : i + 1] * sq
+        if i + 1 in needed:
+            snaps[i + 1] = x.copy()
+
+    logs = np.stack([snaps[k][:, c] for k, c in zip(at.tolist(), sched.contract.tolist())], axis=1)
+    return sched.F0[sched.contract] * np.exp(logs)
+
+
+def _simulate(
+    sched: _Schedule,
+    sig: Optional[np.ndarray],
+    sabr: Optional[np.ndarray],
+    n_paths: int,
+    chunk_size: int,
+    antithetic: bool,
+    sampler: str,
+    max_dt: float,
+    qmc_replicates: int,
+    seed,
+) -> Tuple[float, float, int, int, List[float]]:
+    rng = np.random.default_rng(seed)
+    if sabr is not None:
+        grid, at = _time_grid(sched.times, max_dt)
+        dim = 2 * (len(grid) - 1)
+    else:
+        grid, at = None, None
+        dim = len(sched.times)
+
+    unit = 2 if antithetic else 1
+    step = max(unit, int(chunk_size))
+    replicates = 1
+    if sampler == "sobol":
+        draws = 1 << int(math.log2(step // unit))
+        step = unit * draws
+        replicates = max(1, int(qmc_replicates))
+
+    w = 1.0 / sched.n_fixings
+    total = total_sq = 0.0
+    samples = produced = 0
+    # independently scrambled Sobol replicates: their spread is the randomized-QMC error estimate
+    replicate_means: List[float] = []
+    for target in _split(n_paths, replicates, unit):
+        if target == 0:
+            continue
+        sobol = _qmc.Sobol(d=dim, scramble=True, seed=rng) if sampler == "sobol" else None
+        rep_total, rep_samples, done = 0.0, 0, 0
+        while done < target:
+            m = min(step, target - done)
+            z = _normals(rng, sobol, m, dim, antithetic)
+            if sabr is not None:
+                fixings = _sabr_fixings(sched, sabr, z, grid, at)
+            else:
+                fixings = _lognormal_fixings(sched, sig, z)
+
+            avg = (sched.fixed_sum + fixings.sum(axis=1)) * w
+            payoff = sched.df * np.maximum(sched.cp * (avg - sched.K), 0.0)
+            if antithetic:
+                # antithetic pairs are one independent sample
+                payoff = 0.5 * (payoff[: m // 2] + payoff[m // 2 :])
+            rep_total += float(payoff.sum())
+            total_sq += float(payoff @ payoff)
+            rep_samples += len(payoff)
+            done += m
+        total += rep_total
+        samples += rep_samples
+        produced += done
+        replicate_means.append(rep_total / rep_samples)
+    return total, total_sq, samples, produced, replicate_means
+
+
+def apo_monte_carlo(
+    option: AveragePriceOption,
+    forward_curve: ForwardCurve,
+    vol_or_surface,
+    df: float = 1.0,
+    realized: Optional[Mapping[date, float]] = None,
+    dynamics: str = "lognormal",
+    n_paths: int = 100_000,
+    chunk_size: int = 16_384,
+    antithetic: bool = True,
+    sampler: str = "pseudo",
+    qmc_replicates: int = 16,
+    seed: Optional[int] = None,
+    max_workers: int = 1,
+    max_dt: float = 1.0 / 252.0,
+) -> APOResult:
+    if dynamics not in DYNAMICS:
+        raise ValueError(f"dynamics must be one of {DYNAMICS}")
+    if sampler not in SAMPLERS:
+        raise ValueError(f"sampler must be one of {SAMPLERS}")
+    if sampler == "sobol" and not _HAS_SCIPY:
+        raise ValueError("sampler='sobol' requires scipy")
+
+    start = time.perf_counter()
+    sched, T_c = _schedule(option, forward_curve, df, realized)
+    if len(sched.times) == 0:
+        pv = option.qty * sched.df * max(sched.cp * (sched.fixed_sum / sched.n_fixings - sched.K), 0.0)
+        return APOResult(pv=pv, stderr=0.0, n_paths=0, seconds=time.perf_counter() - start)
+
+    sig, sabr = None, None
+    if dynamics == "sabr":
+        sabr = _contract_sabr(vol_or_surface, T_c)
+    else:
+        sig = _contract_vols(vol_or_surface, T_c, sched.F0)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    n_shards = max(1, int(max_workers))
+    seeds = np.random.SeedSequence(seed).spawn(n_shards)
+    # exactly n_paths overall (rounded up to a whole pair when antithetic)
+    shares = _split(n_paths, n_shards, 2 if antithetic else 1)
+    # each shard runs its share of the Sobol replicates
+    reps = _split(qmc_replicates, n_shards, 1)
+
+    if n_shards == 1:
+        results = [_simulate(sched, sig, sabr, shares[0], chunk_size, antithetic, sampler, max_dt, reps[0], seeds[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=n_shards) as pool:
+            futures = [
+                pool.submit(_simulate, sched, sig, sabr, n, chunk_size, antithetic, sampler, max_dt, r, sd)
+                for n, r, sd in zip(shares, reps, seeds)
+            ]
+            results = [f.result() for f in futures]
+
+    total = sum(r[0] for r in results)
+    total_sq = sum(r[1] for r in results)
+    samples = sum(r[2] for r in results)
+    produced = sum(r[3] for r in results)
+
+    mean = total / samples
+    if sampler == "sobol":
+        # QMC points are not independent, so the iid formula does not apply; use the replicate means
+        means = np.array([m for r in results for m in r[4]])
+        stderr = float(means.std(ddof=1) / math.sqrt(means.size)) if means.size > 1 else float("nan")
+    else:
+        var = max(total_sq / samples - mean * mean, 0.0)
+        stderr = math.sqrt(var / max(samples - 1, 1))
+    seconds = time.perf_counter() - start
+
+    if instrumentation.enabled():
+        instrumentation.count("apo.mc.paths", produced)
+        instrumentation.record_time("apo.mc", seconds)
+    return APOResult(pv=option.qty * mean, stderr=abs(option.qty) * stderr, n_paths=produced, seconds=seconds)
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import math
-from dataclasses import dataclass
+
+import numpy as np
+
+try:
+    from scipy.special import ndtr as _ndtr
+    _HAS_SCIPY = True
+except Exception:
+    _HAS_SCIPY = False
 
 
 SQRT_2PI = math.sqrt(2.0 * math.pi)
 
+_erf_array = np.frompyfunc(math.erf, 1, 1)
+
 
 def _norm_cdf(x: float) -> float:
     return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
@@ -15,7 +24,37 @@ def _norm_pdf(x: float) -> float:
     return math.exp(-0.5 * x * x) / SQRT_2PI
 
 
-def d1_d2(F: float, K: float, T: float, vol: float) -> tuple[float, float]:
+def norm_cdf_array(x) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    if _HAS_SCIPY:
+        return _ndtr(x)
+    return 0.5 * (1.0 + _erf_array(x / math.sqrt(2.0)).astype(float))
+
+
+def norm_pdf_array(x) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    return np.exp(-0.5 * x * x) / SQRT_2PI
+
+
+def validate_inputs(F, K, T, vol, df=None, cp=None) -> None:
+    if cp is not None and not np.all((cp == 1) | (cp == -1)):
+        raise ValueError("cp must be +1 (call) or -1 (put).")
+    if df is not None and np.any(df < 0.0):
+        raise ValueError("df must be >= 0.")
+    if np.any(F <= 0.0) or np.any(K <= 0.0):
+        raise ValueError("F and K must be > 0.")
+    if np.any(T < 0.0):
+        raise ValueError("T must be >= 0.")
+    if np.any(vol < 0.0):
+        raise ValueError("vol must be >= 0.")
+
+
+def _validate_scalar(F: float, K: float, T: float, vol: float, df: float | None = None, cp: int | None = None) -> None:
+    # same rules and messages as validate_inputs, without numpy overhead on the scalar path
+    if cp is not None and cp not in (1, -1):
+        raise ValueError("cp must be +1 (call) or -1 (put).")
+    if df is not None and df < 0.0:
+        raise ValueError("df must be >= 0.")
     if F <= 0.0 or K <= 0.0:
         raise ValueError("F and K must be > 0.")
     if T < 0.0:
@@ -23,37 +62,67 @@ def d1_d2(F: float, K: float, T: float, vol: float) -> tuple[float, float]:
     if vol < 0.0:
         raise ValueError("vol must be >= 0.")
 
+
+def _d1_d2_unchecked(F: np.ndarray, K: np.ndarray, T: np.ndarray, vol: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    degenerate = (T == 0.0) | (vol == 0.0)
+    vsqrtT = vol * np.sqrt(T)
+    safe_vsqrtT = np.where(degenerate, 1.0, vsqrtT)
+    lnFK = np.log(F / K)
+
+    d1 = (lnFK + 0.5 * vol * vol * T) / safe_vsqrtT
+    d2 = d1 - vsqrtT
+
+    limit = np.where(F > K, np.inf, np.where(F < K, -np.inf, 0.0))
+    d1 = np.where(degenerate, limit, d1)
+    d2 = np.where(degenerate, limit, d2)
+    return d1, d2, degenerate
+
+
+def d1_d2_array(F, K, T, vol) -> tuple[np.ndarray, np.ndarray]:
+    F, K, T, vol = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (F, K, T, vol)))
+    validate_inputs(F, K, T, vol)
+    d1, d2, _ = _d1_d2_unchecked(F, K, T, vol)
+    return d1, d2
+
+
+def price_array(F, K, T, vol, df=1.0, cp=1) -> np.ndarray:
+    F, K, T, vol, df = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (F, K, T, vol, df)))
+    cp = np.broadcast_to(np.asarray(cp), F.shape)
+    validate_inputs(F, K, T, vol, df=df, cp=cp)
+    return _price_unchecked(F, K, T, vol, df, cp)
+
+
+def _price_unchecked(F: np.ndarray, K: np.ndarray, T: np.ndarray, vol: np.ndarray, df: np.ndarray, cp: np.ndarray) -> np.ndarray:
+    d1, d2, degenerate = _d1_d2_unchecked(F, K, T, vol)
+    value = df * cp * (F * norm_cdf_array(cp * d1) - K * norm_cdf_array(cp * d2))
+    intrinsic = df * np.maximum(cp * (F - K), 0.0)
+    return np.where(degenerate, intrinsic, value)
+
+
+def _d1_d2_scalar(F: float, K: float, T: float, vol: float) -> tuple[float, float]:
     if T == 0.0 or vol == 0.0:
         if F > K:
-            return float("inf"), float("inf")
+            return math.inf, math.inf
         if F < K:
-            return float("-inf"), float("-inf")
+            return -math.inf, -math.inf
         return 0.0, 0.0
 
-    sqrtT = math.sqrt(T)
-    vsqrtT = vol * sqrtT
-    lnFK = math.log(F / K)
-    d1 = (lnFK + 0.5 * vol * vol * T) / vsqrtT
-    d2 = d1 - vsqrtT
-    return d1, d2
+    vsqrtT = vol * math.sqrt(T)
+    d1 = (math.log(F / K) + 0.5 * vol * vol * T) / vsqrtT
+    return d1, d1 - vsqrtT
 
 
-def price(F: float, K: float, T: float, vol: float, df: float = 1.0, cp: int = 1) -> float:
-    if cp not in (1, -1):
-        raise ValueError("cp must be +1 (call) or -1 (put).")
-    if df < 0.0:
-        raise ValueError("df must be >= 0.")
-    if F <= 0.0 or K <= 0.0:
-        raise ValueError("F and K must be > 0.")
-    if T < 0.0:
-        raise ValueError("T must be >= 0.")
-    if vol < 0.0:
-        raise ValueError("vol must be >= 0.")
+def d1_d2(F: float, K: float, T: float, vol: float) -> tuple[float, float]:
+    _validate_scalar(F, K, T, vol)
+    return _d1_d2_scalar(F, K, T, vol)
 
+
+def price(F: float, K: float, T: float, vol: float, df: float = 1.0, cp: int = 1) -> float:
+    _validate_scalar(F, K, T, vol, df=df, cp=cp)
     if T == 0.0 or vol == 0.0:
         return df * max(cp * (F - K), 0.0)
 
-    d1, d2 = d1_d2(F, K, T, vol)
+    d1, d2 = _d1_d2_scalar(F, K, T, vol)
     return df * cp * (F * _norm_cdf(cp * d1) - K * _norm_cdf(cp * d2))
 
 
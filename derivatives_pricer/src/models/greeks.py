@@ -2,61 +2,114 @@ from __future__ import annotations
 
 import math
 
-from src.models.black76 import d1_d2, _norm_cdf, _norm_pdf, price as black_price
+import numpy as np
 
+from src.models.black76 import (
+    _d1_d2_scalar,
+    _d1_d2_unchecked,
+    _norm_cdf,
+    _norm_pdf,
+    _validate_scalar,
+    norm_cdf_array,
+    norm_pdf_array,
+    price as black_price,
+    validate_inputs,
+)
 
-def delta(F: float, K: float, T: float, vol: float, df: float = 1.0, cp: int = 1) -> float:
-    if cp not in (1, -1):
-        raise ValueError("cp must be +1 (call) or -1 (put).")
-    if df < 0.0:
-        raise ValueError("df must be >= 0.")
-    if F <= 0.0 or K <= 0.0:
-        raise ValueError("F and K must be > 0.")
-    if T < 0.0:
-        raise ValueError("T must be >= 0.")
-    if vol < 0.0:
-        raise ValueError("vol must be >= 0.")
 
+def delta_array(F, K, T, vol, df=1.0, cp=1) -> np.ndarray:
+    F, K, T, vol, df = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (F, K, T, vol, df)))
+    cp = np.broadcast_to(np.asarray(cp), F.shape)
+    validate_inputs(F, K, T, vol, df=df, cp=cp)
+
+    d1, _, degenerate = _d1_d2_unchecked(F, K, T, vol)
+    value = df * cp * norm_cdf_array(cp * d1)
+    intrinsic = np.where(cp * (F - K) > 0.0, df * cp, 0.0)
+    return np.where(degenerate, intrinsic, value)
+
+
+def gamma_array(F, K, T, vol, df=1.0) -> np.ndarray:
+    F, K, T, vol, df = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (F, K, T, vol, df)))
+    validate_inputs(F, K, T, vol, df=df)
+
+    d1, _, degenerate = _d1_d2_unchecked(F, K, T, vol)
+    vsqrtT = np.where(degenerate, 1.0, vol * np.sqrt(T))
+    return np.where(degenerate, 0.0, df * norm_pdf_array(d1) / (F * vsqrtT))
+
+
+def vega_array(F, K, T, vol, df=1.0) -> np.ndarray:
+    F, K, T, vol, df = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (F, K, T, vol, df)))
+    validate_inputs(F, K, T, vol, df=df)
+
+    d1, _, degenerate = _d1_d2_unchecked(F, K, T, vol)
+    return np.where(degenerate, 0.0, df * F * norm_pdf_array(d1) * np.sqrt(T))
+
+
+GREEK_NAMES = ("price", "delta", "gamma", "vega", "theta", "vanna", "volga", "charm")
+
+
+def black76_greeks(F, K, T, vol, df=1.0, cp=1) -> dict:
+    F, K, T, vol, df = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (F, K, T, vol, df)))
+    cp = np.broadcast_to(np.asarray(cp), F.shape)
+    validate_inputs(F, K, T, vol, df=df, cp=cp)
+
+    d1, d2, degenerate = _d1_d2_unchecked(F, K, T, vol)
+    live = ~degenerate
+    sqrtT = np.sqrt(T)
+    safe_vol = np.where(live, vol, 1.0)
+    safe_T = np.where(live, T, 1.0)
+    safe_vsqrtT = np.where(live, vol * sqrtT, 1.0)
+    d1d2 = np.where(live, d1 * d2, 0.0)
+    safe_d2 = np.where(live, d2, 0.0)
+
+    pdf = norm_pdf_array(d1)
+    cdf1 = norm_cdf_array(cp * d1)
+    cdf2 = norm_cdf_array(cp * d2)
+    vega_ = df * F * pdf * sqrtT
+
+    # theta and charm are per unit of calendar time (d/dt = -d/dT) with df held fixed
+    out = {
+        "price": np.where(live, df * cp * (F * cdf1 - K * cdf2), df * np.maximum(cp * (F - K), 0.0)),
+        "delta": np.where(live, df * cp * cdf1, np.where(cp * (F - K) > 0.0, df * cp, 0.0)),
+        "gamma": np.where(live, df * pdf / (F * safe_vsqrtT), 0.0),
+        "vega": np.where(live, vega_, 0.0),
+        "theta": np.where(live, -df * F * pdf * vol / (2.0 * np.where(live, sqrtT, 1.0)), 0.0),
+        "vanna": np.where(live, -df * pdf * safe_d2 / safe_vol, 0.0),
+        "volga": np.where(live, vega_ * d1d2 / safe_vol, 0.0),
+        "charm": np.where(live, df * pdf * safe_d2 / (2.0 * safe_T), 0.0),
+    }
+
+    if F.ndim == 0:
+        return {k: float(v) for k, v in out.items()}
+    return out
+
+
+def delta(F: float, K: float, T: float, vol: float, df: float = 1.0, cp: int = 1) -> float:
+    _validate_scalar(F, K, T, vol, df=df, cp=cp)
     if T == 0.0 or vol == 0.0:
         if cp * (F - K) > 0.0:
             return df * cp
         return 0.0
 
-    d1, _ = d1_d2(F, K, T, vol)
+    d1, _ = _d1_d2_scalar(F, K, T, vol)
     return df * cp * _norm_cdf(cp * d1)
 
 
 def gamma(F: float, K: float, T: float, vol: float, df: float = 1.0) -> float:
-    if df < 0.0:
-        raise ValueError("df must be >= 0.")
-    if F <= 0.0 or K <= 0.0:
-        raise ValueError("F and K must be > 0.")
-    if T < 0.0:
-        raise ValueError("T must be >= 0.")
-    if vol < 0.0:
-        raise ValueError("vol must be >= 0.")
-
+    _validate_scalar(F, K, T, vol, df=df)
     if T == 0.0 or vol == 0.0:
         return 0.0
 
-    d1, _ = d1_d2(F, K, T, vol)
+    d1, _ = _d1_d2_scalar(F, K, T, vol)
     return df * _norm_pdf(d1) / (F * vol * math.sqrt(T))
 
 
 def vega(F: float, K: float, T: float, vol: float, df: float = 1.0) -> float:
-    if df < 0.0:
-        raise ValueError("df must be >= 0.")
-    if F <= 0.0 or K <= 0.0:
-        raise ValueError("F and K must be > 0.")
-    if T < 0.0:
-        raise ValueError("T must be >= 0.")
-    if vol < 0.0:
-        raise ValueError("vol must be >= 0.")
-
+    _validate_scalar(F, K, T, vol, df=df)
     if T == 0.0 or vol == 0.0:
         return 0.0
 
-    d1, _ = d1_d2(F, K, T, vol)
+    d1, _ = _d1_d2_scalar(F, K, T, vol)
     return df * F * _norm_pdf(d1) * math.sqrt(T)
 
 
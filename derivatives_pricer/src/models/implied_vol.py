@@ -3,7 +3,15 @@ from __future__ import annotations
 from dataclasses import dataclass
 import numpy as np
 
-from src.models.black76 import price as black76_price
+from src import instrumentation
+from src.models.black76 import (
+    _d1_d2_unchecked,
+    _price_unchecked,
+    norm_cdf_array,
+    norm_pdf_array,
+    price as black76_price,
+    validate_inputs,
+)
 
 
 @dataclass(frozen=True)
@@ -86,3 +94,136 @@ def implied_vol_black76(
         it += 1
 
     return ImpliedVolResult(vol=float(0.5 * (lo + hi)), iterations=it, converged=False)
+
+
+@dataclass(frozen=True)
+class ImpliedVolArrayResult:
+    vol: np.ndarray
+    iterations: np.ndarray
+    converged: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.vol.size)
+
+    def __getitem__(self, i: int) -> ImpliedVolResult:
+        return ImpliedVolResult(
+            vol=float(self.vol.flat[i]),
+            iterations=int(self.iterations.flat[i]),
+            converged=bool(self.converged.flat[i]),
+        )
+
+
+def _initial_guess(premium: np.ndarray, F: np.ndarray, K: np.ndarray, T: np.ndarray, cp: np.ndarray, df: np.ndarray) -> np.ndarray:
+    # Corrado-Miller rational approximation on the undiscounted call price
+    safe_df = np.where(df > 0.0, df, 1.0)
+    call = premium / safe_df + np.where(cp == -1, F - K, 0.0)
+    half_gap = 0.5 * (F - K)
+    a = call - half_gap
+    disc = np.maximum(a * a - (F - K) ** 2 / np.pi, 0.0)
+    total = np.sqrt(2.0 * np.pi) / (F + K) * (a + np.sqrt(disc))
+    guess = total / np.sqrt(np.where(T > 0.0, T, 1.0))
+    return np.where(np.isfinite(guess) & (guess > 0.0), guess, 0.3)
+
+
+def implied_vol_black76_array(
+    premium,
+    F,
+    K,
+    T,
+    cp,
+    df=1.0,
+    vol_low: float = 1e-8,
+    vol_high: float = 5.0,
+    tol: float = 1e-8,
+    max_iter: int = 100,
+) -> ImpliedVolArrayResult:
+    premium, F, K, T, df = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (premium, F, K, T, df)))
+    cp = np.broadcast_to(np.asarray(cp, dtype=int), F.shape)
+    validate_inputs(F, K, T, np.zeros_like(F), df=df, cp=cp)
+
+    shape = F.shape
+    premium, F, K, T, df, cp = (x.ravel() for x in (premium, F, K, T, df, cp))
+
+    vol = np.full(F.size, np.nan)
+    iterations = np.zeros(F.size, dtype=int)
+    converged = np.zeros(F.size, dtype=bool)
+
+    intrinsic = df * np.maximum(cp * (F - K), 0.0)
+    expired = T <= 0
+    at_intrinsic = ~expired & (premium >= 0) & (np.abs(premium - intrinsic) <= 1e-10)
+    vol[expired | at_intrinsic] = 0.0
+    converged[expired | at_intrinsic] = True
+
+    active = ~expired & ~at_intrinsic & (premium >= 0) & (premium + 1e-10 >= intrinsic)
+    idx = np.nonzero(active)[0]
+
+    p, f, k, t, d, c = premium[idx], F[idx], K[idx], T[idx], df[idx], cp[idx]
+
+    def objective(sig: np.ndarray, sel=slice(None)) -> np.ndarray:
+        return _price_unchecked(f[sel], k[sel], t[sel], sig, d[sel], c[sel]) - p[sel]
+
+    lo = np.full(idx.size, vol_low)
+    hi = np.full(idx.size, vol_high)
+    f_hi = objective(hi)
+    valid = objective(lo) <= 0
+
+    expand = np.zeros(idx.size, dtype=int)
+    for _ in range(30):
+        need = valid & (f_hi < 0)
+        if not np.any(need):
+            break
+        hi[need] *= 1.5
+        f_hi[need] = objective(hi[need], need)
+        expand[need] += 1
+
+    bracketed = valid & (f_hi >= 0)
+    iterations[idx] = expand
+
+    sig = np.clip(_initial_guess(p, f, k, t, c, d), lo, hi)
+    live = np.nonzero(bracketed)[0]
+    it = 0
+    while live.size and it < max_iter:
+        s = sig[live]
+        ff, kk, tt, dd, cc = f[live], k[live], t[live], d[live], c[live]
+        d1, d2, _ = _d1_d2_unchecked(ff, kk, tt, s)
+        diff = dd * cc * (ff * norm_cdf_array(cc * d1) - kk * norm_cdf_array(cc * d2)) - p[live]
+        vega = dd * ff * norm_pdf_array(d1) * np.sqrt(tt)
+
+        done = np.abs(diff) < tol
+        converged[idx[live[done]]] = True
+        vol[idx[live[done]]] = s[done]
+        iterations[idx[live[done]]] += it + 1
+
+        keep = ~done
+        live, s, diff, vega, d1, d2 = live[keep], s[keep], diff[keep], vega[keep], d1[keep], d2[keep]
+        lo[live] = np.where(diff < 0, s, lo[live])
+        hi[live] = np.where(diff > 0, s, hi[live])
+
+        # Halley step on price(sigma); volga / vega = d1 * d2 / sigma
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = diff / vega
+            step = newton / (1.0 - 0.5 * newton * d1 * d2 / s)
+            candidate = s - np.where(np.isfinite(step), step, newton)
+        bad = ~np.isfinite(candidate) | (candidate <= lo[live]) | (candidate >= hi[live])
+        sig[live] = np.where(bad, 0.5 * (lo[live] + hi[live]), candidate)
+
+        narrow = (hi[live] - lo[live]) < 1e-10
+        converged[idx[live[narrow]]] = True
+        vol[idx[live[narrow]]] = sig[live[narrow]]
+        iterations[idx[live[narrow]]] += it + 1
+        live = live[~narrow]
+        it += 1
+
+    vol[idx[live]] = 0.5 * (lo[live] + hi[live])
+    iterations[idx[live]] += it
+
+    if instrumentation.enabled():
+        instrumentation.count("iv.solves", F.size)
+        instrumentation.count("iv.iterations", int(iterations.sum()))
+        instrumentation.count("iv.non_converged", int(F.size - converged.sum()))
+
+    return ImpliedVolArrayResult(
+        vol=vol.reshape(shape),
+        iterations=iterations.reshape(shape),
+        converged=converged.reshape(shape),
+    )
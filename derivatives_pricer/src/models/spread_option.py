@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.market.contract_panel import ContractPanel, default_panel
+from src.market.forward_curve import ForwardCurve
+from src.models.black76 import _price_unchecked, norm_cdf_array, validate_inputs
+from src.surfaces.vol_interface import surface_vols
+
+
+SPREAD_METHODS = ("kirk", "bjerksund_stensland")
+
+
+def _prepare(F1, F2, K, T, vol1, vol2, rho, df, cp):
+    F1, F2, K, T, vol1, vol2, rho, df = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (F1, F2, K, T, vol1, vol2, rho, df))
+    )
+    cp = np.broadcast_to(np.asarray(cp, dtype=int), F1.shape)
+    validate_inputs(F1, F2, T, vol1, df=df, cp=cp)
+    validate_inputs(F2, np.ones_like(F2), T, vol2)
+    if np.any(np.abs(rho) > 1.0):
+        raise ValueError("rho must be in [-1, 1].")
+    if np.any(F2 + K <= 0.0):
+        raise ValueError("F2 + K must be > 0 for the spread approximations.")
+    return F1, F2, K, T, vol1, vol2, rho, df, cp
+
+
+def _effective_vol(F2, K, vol1, vol2, rho) -> Tuple[np.ndarray, np.ndarray]:
+    b = F2 / (F2 + K)
+    var = vol1 * vol1 - 2.0 * b * rho * vol1 * vol2 + b * b * vol2 * vol2
+    return b, np.sqrt(np.maximum(var, 0.0))
+
+
+def kirk_price(F1, F2, K, T, vol1, vol2, rho, df=1.0, cp=1) -> np.ndarray:
+    # option on F1 - F2 - K, treating F2 + K as a lognormal strike
+    F1, F2, K, T, vol1, vol2, rho, df, cp = _prepare(F1, F2, K, T, vol1, vol2, rho, df, cp)
+    _, vol = _effective_vol(F2, K, vol1, vol2, rho)
+    return _price_unchecked(F1, F2 + K, T, vol, df, cp)
+
+
+def bjerksund_stensland_price(F1, F2, K, T, vol1, vol2, rho, df=1.0, cp=1) -> np.ndarray:
+    F1, F2, K, T, vol1, vol2, rho, df, cp = _prepare(F1, F2, K, T, vol1, vol2, rho, df, cp)
+    a = F2 + K
+    b, vol = _effective_vol(F2, K, vol1, vol2, rho)
+
+    degenerate = (T == 0.0) | (vol == 0.0)
+    vsqrtT = np.where(degenerate, 1.0, vol * np.sqrt(T))
+    ln = np.log(F1 / a)
+    d1 = (ln + (0.5 * vol1 * vol1 - b * rho * vol1 * vol2 + 0.5 * b * b * vol2 * vol2) * T) / vsqrtT
+    d2 = (ln + (-0.5 * vol1 * vol1 + rho * vol1 * vol2 + 0.5 * b * b * vol2 * vol2 - b * vol2 * vol2) * T) / vsqrtT
+    d3 = (ln + (-0.5 * vol1 * vol1 + 0.5 * b * b * vol2 * vol2) * T) / vsqrtT
+
+    call = df * (F1 * norm_cdf_array(d1) - F2 * norm_cdf_array(d2) - K * norm_cdf_array(d3))
+    # put from parity on the spread forward
+    value = np.where(cp == 1, call, call - df * (F1 - F2 - K))
+    value = np.maximum(value, 0.0)
+    intrinsic = df * np.maximum(cp * (F1 - F2 - K), 0.0)
+    return np.where(degenerate, intrinsic, value)
+
+
+def spread_option_price(F1, F2, K, T, vol1, vol2, rho, df=1.0, cp=1, method: str = "bjerksund_stensland") -> np.ndarray:
+    if method == "kirk":
+        return kirk_price(F1, F2, K, T, vol1, vol2, rho, df=df, cp=cp)
+    if method == "bjerksund_stensland":
+        return bjerksund_stensland_price(F1, F2, K, T, vol1, vol2, rho, df=df, cp=cp)
+    raise ValueError(f"method must be one of {SPREAD_METHODS}")
+
+
+@dataclass(frozen=True)
+class SpreadMCResult:
+    price: np.ndarray
+    stderr: np.ndarray
+    n_paths: int
+
+
+def spread_option_mc(
+    F1,
+    F2,
+    K,
+    T,
+    vol1,
+    vol2,
+    rho,
+    df=1.0,
+    cp=1,
+    n_paths: int = 200_000,
+    chunk_size: int = 50_000,
+    seed: Optional[int] = None,
+) -> SpreadMCResult:
+    # exact joint lognormal terminal draws, antithetic, with the same normals reused across all options
+    arrays = _prepare(F1, F2, K, T, vol1, vol2, rho, df, cp)
+    shape = arrays[0].shape
+    F1, F2, K, T, vol1, vol2, rho, df, cp = (x.ravel() for x in arrays)
+    rng = np.random.default_rng(seed)
+
+    sqrtT = np.sqrt(T)
+    rho_bar = np.sqrt(1.0 - rho * rho)
+    total = np.zeros(F1.size)
+    total_sq = np.zeros(F1.size)
+    samples = 0
+    # keep one chunk's payoff matrix (options x paths) around a few million cells
+    step = max(2, min(int(chunk_size), 4_000_000 // max(F1.size, 1)))
+    step += step % 2
+
+    produced = 0
+    while produced < n_paths:
+        half = max(1, min(step, n_paths - produced) // 2)
+        z = rng.standard_normal((2, half))
+        z1 = np.concatenate([z[0], -z[0]])[None, :]
+        zo = np.concatenate([z[1], -z[1]])[None, :]
+        w1 = z1 * sqrtT[:, None]
+        w2 = (rho[:, None] * z1 + rho_bar[:, None] * zo) * sqrtT[:, None]
+        S1 = F1[:, None] * np.exp(vol1[:, None] * w1 - 0.5 * (vol1 * vol1 * T)[:, None])
+        S2 = F2[:, None] * np.exp(vol2[:, None] * w2 - 0.5 * (vol2 * vol2 * T)[:, None])
+        payoff = df[:, None] * np.maximum(cp[:, None] * (S1 - S2 - K[:, None]), 0.0)
+        pairs = 0.5 * (payoff[:, :half] + payoff[:, half:])
+        total += pairs.sum(axis=1)
+        total_sq += (pairs * pairs).sum(axis=1)
+        samples += half
+        produced += 2 * half
+
+    mean = total / samples
+    stderr = np.sqrt(np.maximum(total_sq / samples - mean * mean, 0.0) / max(samples - 1, 1))
+    return SpreadMCResult(price=mean.reshape(shape), stderr=stderr.reshape(shape), n_paths=produced)
+
+
+def calendar_spread_inputs(forward_curve: ForwardCurve, vol_or_surface, near, far) -> Tuple[np.ndarray, ...]:
+    # forwards and ATM leg vols for (near, far) contract expiries; each vol is read at its own leg's expiry,
+    # so vol2 is the far contract's T2 vol even though the spread option expires at T1
+    near = np.asarray(near, dtype="datetime64[D]")
+    far = np.asarray(far, dtype="datetime64[D]")
+    as_of = np.datetime64(forward_curve.as_of, "D")
+    T1 = np.maximum((near - as_of).astype(np.int64) / 365.0, 0.0)
+    T2 = np.maximum((far - as_of).astype(np.int64) / 365.0, 0.0)
+    F1 = forward_curve.forward_on_many(near)
+    F2 = forward_curve.forward_on_many(far)
+    vol1 = surface_vols(vol_or_surface, T1, F1)
+    vol2 = surface_vols(vol_or_surface, T2, F2)
+    return F1, F2, T1, vol1, vol2
+
+
+def calendar_spread_correlation(
+    forward_curve: ForwardCurve,
+    near,
+    far,
+    panel: Optional[ContractPanel] = None,
+    window: Optional[int] = None,
+) -> np.ndarray:
+    # pooled historical log-return correlation for legs that are `lag` listed contracts apart on the curve
+    near = np.asarray(near, dtype="datetime64[D]")
+    far = np.asarray(far, dtype="datetime64[D]")
+    lag = np.searchsorted(forward_curve.expiries, far) - np.searchsorted(forward_curve.expiries, near)
+    if np.any(lag <= 0):
+        raise ValueError("far leg must expire after the near leg")
+    if panel is None:
+        panel = default_panel()
+    lags, inverse = np.unique(lag, return_inverse=True)
+    rho = np.array([panel.consecutive_correlation(lag=int(n), window=window) for n in lags])
+    return rho[inverse].reshape(lag.shape)
+
+
+def price_calendar_spread(
+    forward_curve: ForwardCurve,
+    vol_or_surface,
+    near,
+    far,
+    K,
+    rho=None,
+    df=1.0,
+    cp=1,
+    T=None,
+    method: str = "bjerksund_stensland",
+    panel: Optional[ContractPanel] = None,
+    window: Optional[int] = None,
+) -> np.ndarray:
+    # near - far - K; the option expires with the near leg unless T is given. Both leg vols come from
+    # calendar_spread_inputs, so the far leg keeps its T2 vol over the shorter T1 life.
+    # Without rho, the correlation is estimated from the contract panel (the bundled histories by default).
+    F1, F2, T1, vol1, vol2 = calendar_spread_inputs(forward_curve, vol_or_surface, near, far)
+    if T is None:
+        T = T1
+    if rho is None:
+        rho = calendar_spread_correlation(forward_curve, near, far, panel=panel, window=window)
+    return spread_option_price(F1, F2, K, T, vol1, vol2, rho, df=df, cp=cp, method=method)
+
+
+def consecutive_pairs(forward_curve: ForwardCurve, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    # (M_i, M_i+1) expiry pairs along the curve, skipping contracts already expired
+    expiries = forward_curve.expiries[forward_curve.expiries > np.datetime64(forward_curve.as_of, "D")]
+    if n is not None:
+        expiries = expiries[: int(n) + 1]
+    return expiries[:-1], expiries[1:]
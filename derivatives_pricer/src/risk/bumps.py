@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.instrument.vanilla import book_american, book_arrays
+from src.models.american import price_by_exercise
+from src.models.black76 import validate_inputs
+from src.surfaces.vol_interface import surface_vols
+
+
+SMILE_DYNAMICS = ("sticky_strike", "sticky_moneyness", "sabr_backbone")
+
+
+@dataclass(frozen=True)
+class BumpGreeks:
+    F: np.ndarray
+    vol: np.ndarray
+    pv: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray
+
+    @property
+    def totals(self) -> dict[str, float]:
+        return {
+            "pv": float(self.pv.sum()),
+            "delta": float(self.delta.sum()),
+            "gamma": float(self.gamma.sum()),
+            "vega": float(self.vega.sum()),
+        }
+
+
+def _bumped_vols(surface, T: np.ndarray, K: np.ndarray, F: np.ndarray, F_rows: np.ndarray, dynamics: str) -> np.ndarray:
+    if dynamics == "sticky_strike":
+        return np.broadcast_to(surface_vols(surface, T, K), F_rows.shape)
+    if dynamics == "sticky_moneyness":
+        # K/F is held fixed: the bumped smile at K is the base smile at K * F / F_bumped
+        return surface_vols(surface, np.broadcast_to(T, F_rows.shape), K * F / F_rows)
+    if dynamics == "sabr_backbone":
+        if not hasattr(surface, "forward_curve"):
+            raise ValueError("sabr_backbone dynamics require a SABRVolSurface")
+        return surface.vol_many(np.broadcast_to(T, F_rows.shape), K, F=F_rows)
+    raise ValueError(f"dynamics must be one of {SMILE_DYNAMICS}")
+
+
+def bump_greeks(
+    trades,
+    surface,
+    df: float = 1.0,
+    dynamics: str = "sticky_strike",
+    F_bump: float = 1e-3,
+    vol_bump: float = 1e-4,
+) -> BumpGreeks:
+    K, T, cp, qty = book_arrays(trades)
+    american = book_american(trades)
+    F = surface.forward_curve.forward_T_many(T)
+    h = F * F_bump
+
+    df_arr = np.broadcast_to(np.asarray(df, dtype=float), T.shape)
+    validate_inputs(F - h, K, T, np.zeros_like(T), df=df_arr, cp=cp)
+
+    # rows: F up, base, F down share one smile lookup; the vol bumps reuse the base vols
+    F_rows = np.stack([F + h, F, F - h])
+    vol_rows = np.array(_bumped_vols(surface, T, K, F, F_rows, dynamics), dtype=float)
+    base_vol = vol_rows[1]
+
+    F_all = np.vstack([F_rows, F, F])
+    vol_all = np.vstack([vol_rows, base_vol + vol_bump, np.maximum(base_vol - vol_bump, 0.0)])
+    validate_inputs(F_all, K, T, vol_all)
+
+    values = qty * price_by_exercise(F_all, K, T, vol_all, df_arr, cp, american)
+    up, base, down, v_up, v_down = values
+
+    return BumpGreeks(
+        F=F,
+        vol=base_vol,
+        pv=base,
+        delta=(up - down) / (2.0 * h),
+        gamma=(up - 2.0 * base + down) / (h * h),
+        vega=(v_up - v_down) / (vol_all[3] - vol_all[4]),
+    )
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.instrument.vanilla import book_american, book_arrays
+from src.market.forward_curve import forwards_for
+from src.models.american import price_by_exercise
+from src.models.black76 import validate_inputs
+from src.surfaces.vol_interface import surface_vols
+
+
+SMILE_DYNAMICS = ("sticky_strike", "sticky_moneyness")
+
+
+@dataclass(frozen=True)
+class ScenarioSpec:
+    F_shocks: Tuple[float, ...] = (0.0,)
+    vol_shocks: Tuple[float, ...] = (0.0,)
+    time_shifts: Tuple[float, ...] = (0.0,)
+
+    @staticmethod
+    def ladder(
+        F_range: float = 0.20,
+        F_step: float = 0.01,
+        vol_shocks=(0.0,),
+        time_shifts=(0.0,),
+    ) -> "ScenarioSpec":
+        n = int(round(F_range / F_step))
+        F_shocks = tuple(float(x) for x in np.arange(-n, n + 1) * F_step)
+        return ScenarioSpec(F_shocks=F_shocks, vol_shocks=tuple(vol_shocks), time_shifts=tuple(time_shifts))
+
+    def grid(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # time outermost, then F, then vol: scenarios sharing a surface evaluation are contiguous
+        dt, dF, dv = np.meshgrid(
+            np.asarray(self.time_shifts, dtype=float),
+            np.asarray(self.F_shocks, dtype=float),
+            np.asarray(self.vol_shocks, dtype=float),
+            indexing="ij",
+        )
+        return dF.ravel(), dv.ravel(), dt.ravel()
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    F_shocks: np.ndarray
+    vol_shocks: np.ndarray
+    time_shifts: np.ndarray
+    base_pv: np.ndarray
+    total: np.ndarray
+    pv: Optional[np.ndarray]
+
+    @property
+    def pnl(self) -> np.ndarray:
+        return self.total - float(self.base_pv.sum())
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "F_shock": self.F_shocks,
+                "vol_shock": self.vol_shocks,
+                "time_shift": self.time_shifts,
+                "pv": self.total,
+                "pnl": self.pnl,
+            }
+        )
+
+
+def run_scenarios(
+    trades,
+    F_or_curve,
+    vol_or_surface,
+    spec: ScenarioSpec,
+    df: float = 1.0,
+    smile: str = "sticky_strike",
+    max_elements: int = 2_000_000,
+    keep_trades: bool = True,
+) -> ScenarioResult:
+    if smile not in SMILE_DYNAMICS:
+        raise ValueError(f"smile must be one of {SMILE_DYNAMICS}")
+
+    K, T, cp, qty = book_arrays(trades)
+    american = book_american(trades)
+    F0 = forwards_for(F_or_curve, T)
+    dF, dv, dt = spec.grid()
+
+    if np.any(dF <= -1.0):
+        raise ValueError("F shocks must be > -100%.")
+    if np.any(dt < 0.0):
+        raise ValueError("time shifts must be >= 0.")
+
+    df_arr = np.broadcast_to(np.asarray(df, dtype=float), T.shape)
+    validate_inputs(F0, K, T, np.zeros_like(T), df=df_arr, cp=cp)
+
+    base_vol = surface_vols(vol_or_surface, T, K)
+    base_pv = qty * price_by_exercise(F0, K, T, base_vol, df_arr, cp, american)
+
+    n_scen, n_trades = dF.size, K.size
+    pv = np.empty((n_scen, n_trades)) if keep_trades else None
+    total = np.empty(n_scen)
+    rows_per_chunk = max(1, int(max_elements) // max(n_trades, 1))
+
+    for shift in np.unique(dt):
+        T_s = np.maximum(T - shift, 0.0)
+        sticky_vol = surface_vols(vol_or_surface, T_s, K) if smile == "sticky_strike" else None
+
+        for F_shock in np.unique(dF[dt == shift]):
+            rows = np.nonzero((dt == shift) & (dF == F_shock))[0]
+            F_s = F0 * (1.0 + F_shock)
+            if sticky_vol is None:
+                # sticky moneyness: the smile moves with F, so look up at K * F0 / F_s
+                vol_s = surface_vols(vol_or_surface, T_s, K / (1.0 + F_shock))
+            else:
+                vol_s = sticky_vol
+
+            for start in range(0, rows.size, rows_per_chunk):
+                chunk = rows[start:start + rows_per_chunk]
+                vols = np.maximum(vol_s[None, :] + dv[chunk, None], 0.0)
+                values = qty * price_by_exercise(F_s, K, T_s, vols, df_arr, cp, american)
+                total[chunk] = values.sum(axis=1)
+                if pv is not None:
+                    pv[chunk] = values
+
+    return ScenarioResult(
+        F_shocks=dF,
+        vol_shocks=dv,
+        time_shifts=dt,
+        base_pv=base_pv,
+        total=total,
+        pv=pv,
+    )
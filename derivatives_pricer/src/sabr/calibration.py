@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, replace
 from typing import Optional, Tuple
 
 import numpy as np
 
+from src import instrumentation
 from src.sabr.params import SABRParams
-from src.sabr.sabr import hagan_lognormal_iv
+from src.sabr.sabr import hagan_lognormal_iv_array, hagan_lognormal_iv_jacobian
 
 try:
     from scipy.optimize import least_squares
@@ -20,6 +22,9 @@ class SABRCalibrationResult:
     params: SABRParams
     rmse: float
     converged: bool
+    nfev: int = 0
+    njev: int = 0
+    seconds: float = 0.0
 
 
 def calibrate_sabr_smile(
@@ -30,6 +35,30 @@ def calibrate_sabr_smile(
     beta: float = 1.0,
     shift: float = 0.0,
     weights: Optional[np.ndarray] = None,
+    initial: Optional[SABRParams] = None,
+) -> SABRCalibrationResult:
+    start = time.perf_counter()
+    res = _calibrate_sabr_smile(F, T, strikes, vols_mkt, beta, shift, weights, initial)
+    res = replace(res, seconds=time.perf_counter() - start)
+
+    if instrumentation.enabled():
+        instrumentation.count("sabr.calibrations")
+        instrumentation.count("sabr.nfev", res.nfev)
+        instrumentation.count("sabr.njev", res.njev)
+        instrumentation.count("sabr.non_converged", int(not res.converged))
+        instrumentation.record_time("sabr.calibrate", res.seconds)
+    return res
+
+
+def _calibrate_sabr_smile(
+    F: float,
+    T: float,
+    strikes: np.ndarray,
+    vols_mkt: np.ndarray,
+    beta: float,
+    shift: float,
+    weights: Optional[np.ndarray],
+    initial: Optional[SABRParams],
 ) -> SABRCalibrationResult:
     strikes = np.asarray(strikes, dtype=float)
     vols_mkt = np.asarray(vols_mkt, dtype=float)
@@ -55,25 +84,40 @@ def calibrate_sabr_smile(
     alpha0 = max(atm_vol * (F ** (1.0 - beta)), 1e-6)
     x0 = np.array([alpha0, 0.0, 0.5], dtype=float)
 
+    sqrt_w = np.sqrt(w)
+    cache: dict = {}
+
     def model_vols(alpha: float, rho: float, nu: float) -> np.ndarray:
-        p = SABRParams(alpha=float(alpha), beta=float(beta), rho=float(rho), nu=float(nu), shift=float(shift))
-        out = np.array([hagan_lognormal_iv(F, k, T, p) for k in strikes], dtype=float)
-        return out
+        return hagan_lognormal_iv_array(F, strikes, T, alpha, beta, rho, nu, shift)
+
+    def evaluate(x: np.ndarray):
+        key = tuple(x)
+        if cache.get("key") != key:
+            alpha, rho, nu = x
+            cache["key"] = key
+            cache["value"] = hagan_lognormal_iv_jacobian(F, strikes, T, alpha, beta, rho, nu, shift)
+        return cache["value"]
 
     def residuals(x: np.ndarray) -> np.ndarray:
-        alpha, rho, nu = x
-        vols = model_vols(alpha, rho, nu)
-        return np.sqrt(w) * (vols - vols_mkt)
+        vols = evaluate(x)[0]
+        return sqrt_w * (vols - vols_mkt)
+
+    def jacobian(x: np.ndarray) -> np.ndarray:
+        _, d_alpha, d_rho, d_nu = evaluate(x)
+        return sqrt_w[:, None] * np.column_stack([d_alpha, d_rho, d_nu])
 
     lb = np.array([1e-8, -0.999, 1e-8], dtype=float)
     ub = np.array([10.0, 0.999, 5.0], dtype=float)
 
+    if initial is not None:
+        x0 = np.clip(np.array([initial.alpha, initial.rho, initial.nu], dtype=float), lb, ub)
+
     if _HAS_SCIPY:
-        res = least_squares(residuals, x0=x0, bounds=(lb, ub), xtol=1e-12, ftol=1e-12, gtol=1e-12, max_nfev=5000)
+        res = least_squares(residuals, x0=x0, jac=jacobian, bounds=(lb, ub), xtol=1e-12, ftol=1e-12, gtol=1e-12, max_nfev=5000)
         alpha, rho, nu = res.x
         p = SABRParams(alpha=float(alpha), beta=float(beta), rho=float(rho), nu=float(nu), shift=float(shift))
         rmse = float(np.sqrt(np.mean((model_vols(alpha, rho, nu) - vols_mkt) ** 2)))
-        return SABRCalibrationResult(params=p, rmse=rmse, converged=bool(res.success))
+        return SABRCalibrationResult(params=p, rmse=rmse, converged=bool(res.success), nfev=int(res.nfev), njev=int(getattr(res, "njev", 0) or 0))
     else:
         best = None
         best_rmse = float("inf")
@@ -89,4 +133,4 @@ def calibrate_sabr_smile(
                 best = (a, r, n)
         a, r, n = best
         p = SABRParams(alpha=float(a), beta=float(beta), rho=float(r), nu=float(n), shift=float(shift))
-        return SABRCalibrationResult(params=p, rmse=float(best_rmse), converged=False)
+        return SABRCalibrationResult(params=p, rmse=float(best_rmse), converged=False, nfev=2000)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict
+
+import numpy as np
+
+from src.market.forward_curve import year_fraction_act365
+from src.sabr.calibration import calibrate_sabr_smile
+from src.sabr.sabr import hagan_lognormal_iv_array
+from src.surfaces.sabr_surface import SABRVolSurface
+
+
+@dataclass(frozen=True)
+class RefreshResult:
+    expiry: date
+    refit: bool
+    rmse_before: float
+    rmse_after: float
+    nfev: int
+    version: int
+
+
+class IncrementalSABRCalibrator:
+    def __init__(self, surface: SABRVolSurface, beta: float = 1.0, shift: float = 0.0, rmse_tolerance: float = 1e-4):
+        self._surface = surface
+        self.beta = beta
+        self.shift = shift
+        self.rmse_tolerance = rmse_tolerance
+        self._fit_rmse: Dict[date, float] = {}
+        self._seen_version: Dict[date, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def surface(self) -> SABRVolSurface:
+        return self._surface
+
+    def _rmse(self, F: float, T: float, K: np.ndarray, iv: np.ndarray, params) -> float:
+        mask = np.isfinite(iv) & (iv > 0) & (iv < 5.0)
+        if not np.any(mask):
+            return float("nan")
+        model = hagan_lognormal_iv_array(F, K[mask], T, params.alpha, params.beta, params.rho, params.nu, params.shift)
+        return float(np.sqrt(np.mean((model - iv[mask]) ** 2)))
+
+    def refresh(self, chain, force: bool = False) -> RefreshResult:
+        expiry = chain.expiry
+        version = getattr(chain, "version", 0)
+        current = self._surface.params_by_expiry.get(expiry)
+        # the skip check and the refit both measure time from the surface's as_of
+        T = year_fraction_act365(self._surface.as_of, expiry)
+        K, iv = chain.smile()
+
+        rmse_before = self._rmse(chain.F, T, K, iv, current) if current is not None else float("nan")
+        baseline = self._fit_rmse.get(expiry)
+        if (
+            not force
+            and current is not None
+            and baseline is not None
+            and np.isfinite(rmse_before)
+            and rmse_before - baseline <= self.rmse_tolerance
+        ):
+            self._seen_version[expiry] = version
+            return RefreshResult(expiry, False, rmse_before, rmse_before, 0, version)
+
+        res = calibrate_sabr_smile(chain.F, T, K, iv, beta=self.beta, shift=self.shift, initial=current)
+        if not res.converged:
+            return RefreshResult(expiry, False, rmse_before, rmse_before, res.nfev, version)
+
+        with self._lock:
+            self._surface = self._surface.with_params(expiry, res.params)
+            self._fit_rmse[expiry] = res.rmse
+            self._seen_version[expiry] = version
+        return RefreshResult(expiry, True, rmse_before, res.rmse, res.nfev, version)
+
+    def is_stale(self, chain) -> bool:
+        return self._seen_version.get(chain.expiry) != getattr(chain, "version", 0)
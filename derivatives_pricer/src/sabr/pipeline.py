@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src import instrumentation
+from src.market.forward_curve import ForwardCurve, year_fraction_act365
+from src.market.option_chain import OptionChain
+from src.sabr.calibration import SABRCalibrationResult, calibrate_sabr_smile
+from src.sabr.params import SABRParams
+
+
+@dataclass(frozen=True)
+class ExpiryCalibration:
+    expiry: date
+    T: float
+    F: float
+    result: SABRCalibrationResult
+    n_points_fit: int
+    seconds: float
+    warm_start: str
+
+
+def load_sabr_params_csv(path: str | Path) -> Dict[date, SABRParams]:
+    df = pd.read_csv(path)
+    out: Dict[date, SABRParams] = {}
+    for r in df.itertuples(index=False):
+        out[pd.to_datetime(r.expiry).date()] = SABRParams(
+            alpha=float(r.alpha), beta=float(r.beta), rho=float(r.rho), nu=float(r.nu), shift=float(r.shift)
+        )
+    return out
+
+
+def _calibrate_block(
+    paths: List[Path],
+    forward_curve: ForwardCurve,
+    as_of: date,
+    beta: float,
+    shift: float,
+    previous: Dict[date, SABRParams],
+    warm_start: bool,
+) -> List[ExpiryCalibration]:
+    out: List[ExpiryCalibration] = []
+    neighbour: Optional[SABRParams] = None
+
+    for path in paths:
+        chain = OptionChain.from_csv(path, forward_curve, as_of=as_of)
+        K, iv = chain.smile()
+        T = year_fraction_act365(as_of, chain.expiry)
+
+        initial, source = None, "cold"
+        if warm_start and chain.expiry in previous:
+            initial, source = previous[chain.expiry], "previous"
+        elif warm_start and neighbour is not None:
+            initial, source = neighbour, "neighbour"
+
+        start = time.perf_counter()
+        res = calibrate_sabr_smile(chain.F, T, K, iv, beta=beta, shift=shift, initial=initial)
+        seconds = time.perf_counter() - start
+
+        if res.converged:
+            neighbour = res.params
+
+        out.append(
+            ExpiryCalibration(
+                expiry=chain.expiry,
+                T=T,
+                F=chain.F,
+                result=res,
+                n_points_fit=int(np.sum(np.isfinite(iv) & (iv > 0) & (iv < 5.0))),
+                seconds=seconds,
+                warm_start=source,
+            )
+        )
+    return out
+
+
+def calibrate_surface(
+    options_dir: str | Path,
+    forward_curve: ForwardCurve,
+    as_of: Optional[date] = None,
+    beta: float = 1.0,
+    shift: float = 0.0,
+    previous: Optional[Dict[date, SABRParams]] = None,
+    warm_start: bool = True,
+    max_workers: Optional[int] = None,
+) -> List[ExpiryCalibration]:
+    paths = sorted(Path(options_dir).glob("*.csv"))
+    if as_of is None:
+        as_of = forward_curve.as_of
+    previous = previous or {}
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    n_blocks = max(1, min(int(max_workers), len(paths)))
+
+    # Contiguous blocks keep neighbouring expiries in the same worker so each
+    # fit can warm-start from the one before it.
+    blocks = [list(b) for b in np.array_split(np.array(paths, dtype=object), n_blocks) if len(b)]
+    args = (forward_curve, as_of, beta, shift, previous, warm_start)
+
+    if n_blocks == 1:
+        results = [_calibrate_block(b, *args) for b in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_blocks) as pool:
+            futures = [pool.submit(_calibrate_block, b, *args) for b in blocks]
+            results = [f.result() for f in futures]
+
+    calibrations = [c for block in results for c in block]
+    for c in calibrations:
+        instrumentation.event(
+            "sabr.expiry",
+            expiry=c.expiry.isoformat(),
+            nfev=c.result.nfev,
+            njev=c.result.njev,
+            seconds=c.seconds,
+            converged=c.result.converged,
+            warm_start=c.warm_start,
+        )
+    return calibrations
+
+
+def calibrations_to_frame(calibrations: List[ExpiryCalibration], as_of: date) -> pd.DataFrame:
+    rows = []
+    for c in calibrations:
+        p = c.result.params
+        rows.append(
+            {
+                "as_of": as_of,
+                "expiry": c.expiry,
+                "T": c.T,
+                "F": c.F,
+                "rmse": c.result.rmse,
+                "converged": c.result.converged,
+                "alpha": p.alpha,
+                "beta": p.beta,
+                "rho": p.rho,
+                "nu": p.nu,
+                "shift": p.shift,
+                "n_points_fit": c.n_points_fit,
+                "nfev": c.result.nfev,
+                "njev": c.result.njev,
+                "seconds": c.seconds,
+                "warm_start": c.warm_start,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def write_sabr_params_csv(calibrations: List[ExpiryCalibration], path: str | Path, as_of: date) -> pd.DataFrame:
+    df = calibrations_to_frame(calibrations, as_of)
+    df.to_csv(path, index=False)
+    return df
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import math
+from typing import Tuple
 
 import numpy as np
 
@@ -64,3 +65,91 @@ def hagan_lognormal_iv(F: float, K: float, T: float, p: SABRParams) -> float:
     ) * T
 
     return A * B * (1.0 + term2)
+
+
+def _hagan_terms(F, K, T, alpha, beta, rho, nu, shift):
+    F, K, T, alpha, beta, rho, nu, shift = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (F, K, T, alpha, beta, rho, nu, shift))
+    )
+    F = F + shift
+    K = K + shift
+
+    expired = T <= 0
+    invalid = ~expired & ((F <= 0) | (K <= 0))
+    atm = ~expired & ~invalid & (np.abs(F - K) < 1e-12)
+    wing = ~expired & ~invalid & ~atm
+
+    F = np.where(invalid | expired, 1.0, F)
+    K = np.where(invalid | expired, 1.0, K)
+
+    one_minus_beta = 1.0 - beta
+    lnFK = np.where(wing, np.log(np.maximum(F / K, 1e-300)), 0.0)
+    FK = np.where(atm, F, np.sqrt(F * K))
+    fk_pow = FK ** one_minus_beta
+
+    z = (nu / alpha) * fk_pow * lnFK
+    sqrt_term = np.sqrt(np.maximum(1.0 - 2.0 * rho * z + z * z, 1e-16))
+    xz = np.log(np.maximum((sqrt_term + z - rho) / (1.0 - rho), 1e-300))
+    safe_xz = np.where(wing, xz, 1.0)
+
+    denom = fk_pow * (
+        1.0
+        + (one_minus_beta ** 2 / 24.0) * (lnFK ** 2)
+        + (one_minus_beta ** 4 / 1920.0) * (lnFK ** 4)
+    )
+
+    A = alpha / denom
+    B = np.where(wing, z / safe_xz, 1.0)
+    C = 1.0 + (
+        (one_minus_beta ** 2 / 24.0) * (alpha ** 2) / (FK ** (2 * one_minus_beta))
+        + (rho * beta * nu * alpha) / (4.0 * fk_pow)
+        + ((2.0 - 3.0 * rho ** 2) / 24.0) * (nu ** 2)
+    ) * T
+
+    return {
+        "expired": expired, "invalid": invalid, "wing": wing,
+        "T": T, "alpha": alpha, "beta": beta, "rho": rho, "nu": nu,
+        "one_minus_beta": one_minus_beta, "FK": FK, "fk_pow": fk_pow,
+        "z": z, "sqrt_term": sqrt_term, "xz": safe_xz, "denom": denom,
+        "A": A, "B": B, "C": C,
+    }
+
+
+def _mask_vol(t, value):
+    value = np.where(t["invalid"], np.nan, value)
+    return np.where(t["expired"], 0.0, value)
+
+
+def hagan_lognormal_iv_array(F, K, T, alpha, beta, rho, nu, shift=0.0) -> np.ndarray:
+    t = _hagan_terms(F, K, T, alpha, beta, rho, nu, shift)
+    return _mask_vol(t, t["A"] * t["B"] * t["C"])
+
+
+def hagan_lognormal_iv_jacobian(F, K, T, alpha, beta, rho, nu, shift=0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    t = _hagan_terms(F, K, T, alpha, beta, rho, nu, shift)
+    A, B, C, z, S, xz = t["A"], t["B"], t["C"], t["z"], t["sqrt_term"], t["xz"]
+    alpha, beta, rho, nu, T = t["alpha"], t["beta"], t["rho"], t["nu"], t["T"]
+    one_minus_beta, FK, fk_pow = t["one_minus_beta"], t["FK"], t["fk_pow"]
+    wing = t["wing"]
+
+    # B = z / x(z, rho) with dx/dz = 1 / S and dz/dalpha = -z / alpha, dz/dnu = z / nu
+    dB_dz = np.where(wing, (xz - z / S) / (xz * xz), 0.0)
+    dx_drho = (-z / S - 1.0) / (S + z - rho) + 1.0 / (1.0 - rho)
+    dB_drho = np.where(wing, -z / (xz * xz) * dx_drho, 0.0)
+    dB_dalpha = dB_dz * (-z / alpha)
+    dB_dnu = dB_dz * (z / nu)
+
+    dA_dalpha = 1.0 / t["denom"]
+
+    dC_dalpha = T * (
+        (one_minus_beta ** 2 / 12.0) * alpha / (FK ** (2 * one_minus_beta))
+        + (rho * beta * nu) / (4.0 * fk_pow)
+    )
+    dC_drho = T * ((beta * nu * alpha) / (4.0 * fk_pow) - 0.25 * rho * nu ** 2)
+    dC_dnu = T * ((rho * beta * alpha) / (4.0 * fk_pow) + ((2.0 - 3.0 * rho ** 2) / 12.0) * nu)
+
+    vol = _mask_vol(t, A * B * C)
+    d_alpha = _mask_vol(t, dA_dalpha * B * C + A * dB_dalpha * C + A * B * dC_dalpha)
+    d_rho = _mask_vol(t, A * dB_drho * C + A * B * dC_drho)
+    d_nu = _mask_vol(t, A * dB_dnu * C + A * B * dC_dnu)
+    return vol, d_alpha, d_rho, d_nu
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from src.service.server import PricingService
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+
+def _load_market(snapshot: Path | None):
+    if snapshot is not None:
+        from src.market.snapshot import MarketSnapshot
+
+        snap = MarketSnapshot(snapshot)
+        return snap.forward_curve, snap.surface()
+
+    from src.market.forward_curve import ForwardCurve
+    from src.sabr.pipeline import load_sabr_params_csv
+    from src.surfaces.sabr_surface import SABRVolSurface
+
+    forward_curve = ForwardCurve.from_csv(DATA_DIR / "wti_forward_prices.csv")
+    params = load_sabr_params_csv(DATA_DIR / "sabr_params.csv")
+    return forward_curve, SABRVolSurface(as_of=forward_curve.as_of, forward_curve=forward_curve, params_by_expiry=params)
+
+
+async def main(args: argparse.Namespace) -> None:
+    forward_curve, surface = _load_market(args.snapshot)
+    service = PricingService(
+        forward_curve,
+        surface,
+        df=args.df,
+        window=args.window_ms / 1e3,
+        max_batch=args.max_batch,
+        max_in_flight=args.max_in_flight,
+    )
+    await service.start(path=args.socket, host=args.host, port=args.port)
+    print(f"pricing service listening on {service.address}", flush=True)
+    try:
+        await service.serve_forever()
+    finally:
+        await service.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="resident WTI option pricing service")
+    parser.add_argument("--snapshot", type=Path, default=None, help="market snapshot file; defaults to the bundled CSVs")
+    parser.add_argument("--socket", type=Path, default=None, help="unix socket path; TCP on --host/--port otherwise")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--df", type=float, default=1.0)
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=65_536)
+    parser.add_argument("--max-in-flight", type=int, default=256, help="pipelined requests per connection before reads stall")
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
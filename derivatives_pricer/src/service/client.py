@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class ServiceError(RuntimeError):
+    pass
+
+
+class PricingClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._waiting: Dict[int, asyncio.Future] = {}
+        self._listener = asyncio.create_task(self._listen())
+
+    @staticmethod
+    async def connect(path: Optional[str | Path] = None, host: str = "127.0.0.1", port: Optional[int] = None) -> "PricingClient":
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(str(path), limit=2**26)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=2**26)
+        return PricingClient(reader, writer)
+
+    async def _listen(self) -> None:
+        # replies can come back out of order: requests from one connection are batched independently
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                reply = json.loads(line)
+                future = self._waiting.pop(reply.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if reply.get("ok"):
+                    future.set_result(reply["result"])
+                else:
+                    future.set_exception(ServiceError(reply.get("error")))
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("pricing service closed the connection"))
+            self._waiting.clear()
+
+    async def request(self, op: str, **fields):
+        if self._listener.done():
+            # nothing would ever resolve the reply future
+            raise ConnectionError("pricing service connection is closed")
+        req_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[req_id] = future
+        self._writer.write(json.dumps({"id": req_id, "op": op, **fields}).encode() + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def pv(self, trades):
+        return await self.request("pv", trades=trades)
+
+    async def greeks(self, trades):
+        return await self.request("greeks", trades=trades)
+
+    async def stats(self) -> dict:
+        return await self.request("stats")
+
+    async def swap(self, snapshot: str | Path) -> dict:
+        return await self.request("swap", snapshot=str(snapshot))
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+
+    async def __aenter__(self) -> "PricingClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, List, Optional, Tuple
+
+import numpy as np
+
+from pricer import price_book
+from src import instrumentation
+from src.models.american import check_exercise
+from src.models.black76 import validate_inputs
+from src.models.greeks import GREEK_NAMES
+
+OPS = ("pv", "greeks", "stats", "swap", "ping")
+
+
+@dataclass(frozen=True)
+class Market:
+    forward_curve: object
+    surface: object
+    df: float = 1.0
+    version: int = 0
+
+
+@dataclass
+class _Pending:
+    op: str
+    K: np.ndarray
+    T: np.ndarray
+    cp: np.ndarray
+    qty: np.ndarray
+    american: np.ndarray
+    scalar: bool
+    future: asyncio.Future = field(repr=False)
+
+    @property
+    def size(self) -> int:
+        return len(self.K)
+
+
+def _parse_trades(trades) -> Tuple[Tuple[np.ndarray, ...], bool]:
+    # a list of trade objects, a column mapping {"K": [...], ...}, or a single trade {"K": 60, ...}
+    scalar = isinstance(trades, dict) and np.ndim(trades.get("K")) == 0
+    if isinstance(trades, dict):
+        cols = {k: np.atleast_1d(np.asarray(v)) for k, v in trades.items()}
+    elif isinstance(trades, list) and all(isinstance(t, dict) for t in trades):
+        defaults = {"qty": 1.0, "exercise": "european"}
+        cols = {k: np.asarray([t.get(k, defaults.get(k)) for t in trades]) for k in ("K", "T", "cp", "qty", "exercise")}
+    else:
+        raise ValueError("trades must be a trade object, a list of trades or a column mapping")
+
+    n = len(cols.get("K", ()))
+    if n == 0:
+        raise ValueError("no trades in request")
+    try:
+        K = cols["K"].astype(float)
+        T = cols["T"].astype(float)
+        cp = cols["cp"].astype(int)
+        qty = np.broadcast_to(cols.get("qty", 1.0), (n,)).astype(float)
+        exercise = np.broadcast_to(cols.get("exercise", "european"), (n,)).astype(str)
+    except KeyError as exc:
+        raise ValueError(f"trades are missing field {exc.args[0]}") from None
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"malformed trades: {exc}") from None
+    if not all(len(c) == n for c in (T, cp)):
+        raise ValueError("trade columns have different lengths")
+
+    for style in np.unique(exercise):
+        check_exercise(str(style))
+    validate_inputs(np.ones(n), K, T, np.zeros(n), cp=cp)
+    return (K, T, cp, qty, exercise == "american"), scalar
+
+
+class LatencyStats:
+    def __init__(self, window: int = 10_000):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.trades = 0
+        self.batches = 0
+        self.errors = 0
+        self.max_batch = 0
+        self.max_in_flight = 0
+        self._latency: Deque[float] = collections.deque(maxlen=window)
+        self._batch_seconds = 0.0
+
+    def record_batch(self, n_requests: int, n_trades: int, seconds: float) -> None:
+        self.batches += 1
+        self.trades += n_trades
+        self.max_batch = max(self.max_batch, n_trades)
+        self._batch_seconds += seconds
+
+    def record_request(self, seconds: float, ok: bool = True) -> None:
+        self.requests += 1
+        self.errors += not ok
+        self._latency.append(seconds)
+
+    def snapshot(self) -> dict:
+        uptime = time.perf_counter() - self.started
+        lat = np.asarray(self._latency) * 1e3
+        pct = np.percentile(lat, [50, 95, 99]).tolist() if lat.size else [float("nan")] * 3
+        return {
+            "uptime_s": uptime,
+            "requests": self.requests,
+            "errors": self.errors,
+            "trades": self.trades,
+            "batches": self.batches,
+            "mean_batch_trades": self.trades / self.batches if self.batches else 0.0,
+            "max_batch_trades": self.max_batch,
+            "max_in_flight": self.max_in_flight,
+            "latency_ms": {"p50": pct[0], "p95": pct[1], "p99": pct[2], "max": float(lat.max()) if lat.size else float("nan")},
+            "requests_per_s": self.requests / uptime if uptime > 0 else 0.0,
+            "trades_per_s": self.trades / uptime if uptime > 0 else 0.0,
+            "pricing_trades_per_s": self.trades / self._batch_seconds if self._batch_seconds > 0 else 0.0,
+        }
+
+
+class PricingService:
+    def __init__(
+        self,
+        forward_curve,
+        surface,
+        df: float = 1.0,
+        window: float = 0.002,
+        max_batch: int = 65_536,
+        max_pending: int = 10_000,
+        max_in_flight: int = 256,
+    ):
+        self._market = Market(forward_curve, surface, float(df), 0)
+        self.window = float(window)
+        self.max_batch = int(max_batch)
+        self.stats = LatencyStats()
+        self._queue: Optional[asyncio.Queue] = None
+        self._max_pending = int(max_pending)
+        self.max_in_flight = int(max_in_flight)
+        self._in_flight = 0
+        # one pricing thread: the event loop keeps reading requests while a batch runs, and those form the next batch
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pricing")
+        self._batcher: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._socket_path: Optional[Path] = None
+
+    @property
+    def market(self) -> Market:
+        return self._market
+
+    def swap(self, surface=None, forward_curve=None, df: Optional[float] = None) -> Market:
+        # batches already running keep the market they started with; the next batch picks up the new one
+        old = self._market
+        self._market = Market(
+            forward_curve=old.forward_curve if forward_curve is None else forward_curve,
+            surface=old.surface if surface is None else surface,
+            df=old.df if df is None else float(df),
+            version=old.version + 1,
+        )
+        instrumentation.event("service.swap", version=self._market.version)
+        return self._market
+
+    def swap_snapshot(self, path: str | Path) -> Market:
+        from src.market.snapshot import MarketSnapshot
+
+        snap = MarketSnapshot(path)
+        return self.swap(surface=snap.surface(), forward_curve=snap.forward_curve)
+
+    async def start(self, path: Optional[str | Path] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._queue = asyncio.Queue(maxsize=self._max_pending)
+        self._batcher = asyncio.create_task(self._batch_loop())
+        if path is not None:
+            self._socket_path = Path(path)
+            self._socket_path.unlink(missing_ok=True)
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=str(self._socket_path))
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host=host, port=port)
+
+    @property
+    def address(self):
+        if self._socket_path is not None:
+            return str(self._socket_path)
+        return self._server.sockets[0].getsockname() if self._server is not None else None
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            if self._socket_path is not None:
+                self._socket_path.unlink(missing_ok=True)
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+
+    def _started_queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            raise RuntimeError("PricingService is not started; await start() first")
+        return self._queue
+
+    async def submit(self, op: str, trades) -> dict:
+        # in-process entry point; the socket handler goes through the same queue
+        queue = self._started_queue()
+        received = time.perf_counter()
+        ok = False
+        try:
+            cols, scalar = _parse_trades(trades)
+            future = asyncio.get_running_loop().create_future()
+            await queue.put(_Pending(op, *cols, scalar=scalar, future=future))
+            result = await future
+            ok = True
+            return result
+        finally:
+            elapsed = time.perf_counter() - received
+            self.stats.record_request(elapsed, ok=ok)
+            instrumentation.record_time("service.request", elapsed)
+
+    async def _batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[_Pending] = [await self._queue.get()]
+            n = batch[0].size
+            deadline = loop.time() + self.window
+            while n < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                batch.append(item)
+                n += item.size
+
+            batch = [p for p in batch if not p.future.cancelled()]
+            if not batch:
+                continue
+            market = self._market
+            start = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(self._executor, self._price_batch, batch, market)
+            except Exception as exc:
+                results = [exc] * len(batch)
+            self.stats.record_batch(len(batch), n, time.perf_counter() - start)
+            for pending, res in zip(batch, results):
+                if pending.future.done():
+                    continue
+                if isinstance(res, Exception):
+                    pending.future.set_exception(res)
+                else:
+                    pending.future.set_result(res)
+
+    def _price_batch(self, batch: List[_Pending], market: Market) -> list:
+        cols = {
+            "K": np.concatenate([p.K for p in batch]),
+            "T": np.concatenate([p.T for p in batch]),
+            "cp": np.concatenate([p.cp for p in batch]),
+            "qty": np.concatenate([p.qty for p in batch]),
+            "exercise": np.where(np.concatenate([p.american for p in batch]), "american", "european"),
+        }
+        try:
+            res = price_book(cols, market.forward_curve, market.surface, df=market.df)
+        except Exception:
+            if len(batch) == 1:
+                raise
+            # isolate the failing request instead of failing everyone coalesced with it
+            out = []
+            for p in batch:
+                try:
+                    out.extend(self._price_batch([p], market))
+                except Exception as exc:
+                    out.append(exc)
+            return out
+
+        out = []
+        offset = 0
+        for p in batch:
+            sl = slice(offset, offset + p.size)
+            offset += p.size
+            names = ("pv",) if p.op == "pv" else ("pv",) + GREEK_NAMES[1:]
+            if p.scalar:
+                body = {name: float(getattr(res, name)[sl][0]) for name in names}
+            else:
+                body = {name: getattr(res, name)[sl].tolist() for name in names}
+                body["totals"] = {name: float(getattr(res, name)[sl].sum()) for name in names}
+            body["market_version"] = market.version
+            out.append(body)
+        return out
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            self._started_queue()
+        except RuntimeError:
+            writer.close()
+            raise
+        tasks = set()
+        # at most max_in_flight requests per connection: past that the reader stops, the socket
+        # buffers fill and the client feels the back-pressure
+        slots = asyncio.Semaphore(self.max_in_flight)
+
+        def finished(task: asyncio.Task) -> None:
+            tasks.discard(task)
+            self._in_flight -= 1
+            slots.release()
+
+        try:
+            while True:
+                await slots.acquire()
+                line = await reader.readline()
+                if not line or not line.strip():
+                    slots.release()
+                    if not line:
+                        break
+                    continue
+                # one task per request so pipelined requests on a connection coalesce into the same batch
+                self._in_flight += 1
+                self.stats.max_in_flight = max(self.stats.max_in_flight, self._in_flight)
+                task = asyncio.create_task(self._handle_line(line, writer))
+                tasks.add(task)
+                task.add_done_callback(finished)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_line(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        req_id = None
+        try:
+            req = json.loads(line)
+            req_id = req.get("id")
+            result = await self._dispatch(req)
+            reply = {"id": req_id, "ok": True, "result": result}
+        except Exception as exc:
+            reply = {"id": req_id, "ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+        if writer.is_closing():
+            return
+        writer.write(json.dumps(reply).encode() + b"\n")
+        await writer.drain()
+
+    async def _dispatch(self, req: dict):
+        op = req.get("op")
+        if op not in OPS:
+            raise ValueError(f"op must be one of {OPS}")
+        if op in ("pv", "greeks"):
+            return await self.submit(op, req.get("trades"))
+        if op == "stats":
+            out = self.stats.snapshot()
+            out["market_version"] = self._market.version
+            out["pending"] = self._started_queue().qsize()
+            return out
+        if op == "swap":
+            path = req.get("snapshot")
+            if path is None:
+                raise ValueError("swap needs a snapshot path")
+            # load off the event loop so requests keep flowing while the new market is read
+            market = await asyncio.get_running_loop().run_in_executor(None, self.swap_snapshot, os.fspath(path))
+            return {"market_version": market.version}
+        return {"market_version": self._market.version}
@@ -4,6 +4,8 @@ from __future__ import annotations
 from src.surfaces.vol_interface import VolSurface
 from src.surfaces.grid_surface import FlatVol, TermVol, SmileSurface
 from src.surfaces.sabr_surface import SABRVolSurface
+from src.surfaces.cached_surface import CachedVolSurface
+from src.surfaces.baked_surface import BakedVolSurface
 
 __all__ = [
     "VolSurface",
@@ -11,4 +13,6 @@ __all__ = [
     "TermVol",
     "SmileSurface",
     "SABRVolSurface",
+    "CachedVolSurface",
+    "BakedVolSurface",
 ]
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.market.forward_curve import forwards_for
+from src.surfaces.vol_interface import surface_vols
+
+
+BAKE_METHODS = ("bilinear", "bicubic")
+
+
+@dataclass(frozen=True)
+class BakeReport:
+    max_error: float
+    rms_error: float
+    at_T: float
+    at_x: float
+    n_T: int
+    n_x: int
+    refinements: int
+    seconds: float
+
+
+def _pad(grid: np.ndarray) -> np.ndarray:
+    # one ghost node per side, linearly extrapolated, so the 4x4 cubic stencil never clamps
+    g = np.vstack([2.0 * grid[:1] - grid[1:2], grid, 2.0 * grid[-1:] - grid[-2:-1]])
+    return np.hstack([2.0 * g[:, :1] - g[:, 1:2], g, 2.0 * g[:, -1:] - g[:, -2:-1]])
+
+
+# Catmull-Rom (Keys, a = -0.5): weights for nodes -1, 0, 1, 2 are [1, t, t^2, t^3] @ _CATMULL_ROM
+_CATMULL_ROM = np.array(
+    [
+        [0.0, 1.0, 0.0, 0.0],
+        [-0.5, 0.0, 0.5, 0.0],
+        [1.0, -2.5, 2.0, -0.5],
+        [-0.5, 1.5, -1.5, 0.5],
+    ]
+)
+_BILINEAR = np.array([[1.0, 0.0], [-1.0, 1.0]])
+
+
+def _cell_coefficients(vols: np.ndarray, method: str) -> np.ndarray:
+    # per-cell polynomial coefficients laid out (k * k, n_cells): a lookup gathers one
+    # contiguous row per coefficient, then evaluates a k x k polynomial in local coordinates
+    if method == "bilinear":
+        M = _BILINEAR
+        windows = np.lib.stride_tricks.sliding_window_view(vols, (2, 2))
+    else:
+        M = _CATMULL_ROM
+        windows = np.lib.stride_tricks.sliding_window_view(_pad(vols), (4, 4))
+    coef = np.einsum("pa,ijab,qb->ijpq", M, windows, M, optimize=True)
+    k = M.shape[0]
+    return np.ascontiguousarray(coef.reshape(-1, k * k).T)
+
+
+@dataclass(frozen=True)
+class BakedVolSurface:
+    forward_curve: object
+    T_grid: np.ndarray
+    x_grid: np.ndarray
+    vols: np.ndarray
+    method: str = "bicubic"
+    report: Optional[BakeReport] = field(default=None, compare=False)
+
+    _coef: np.ndarray = field(init=False, repr=False, compare=False)
+    _T0: float = field(init=False, repr=False, compare=False)
+    _dT: float = field(init=False, repr=False, compare=False)
+    _x0: float = field(init=False, repr=False, compare=False)
+    _dx: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.method not in BAKE_METHODS:
+            raise ValueError(f"method must be one of {BAKE_METHODS}")
+        T_grid = np.ascontiguousarray(self.T_grid, dtype=float)
+        x_grid = np.ascontiguousarray(self.x_grid, dtype=float)
+        vols = np.ascontiguousarray(self.vols, dtype=float)
+        if len(T_grid) < 2 or len(x_grid) < 2 or vols.shape != (len(T_grid), len(x_grid)):
+            raise ValueError("vols must be (len(T_grid), len(x_grid)) with at least 2 nodes per axis")
+
+        object.__setattr__(self, "T_grid", T_grid)
+        object.__setattr__(self, "x_grid", x_grid)
+        object.__setattr__(self, "vols", vols)
+        object.__setattr__(self, "_coef", _cell_coefficients(vols, self.method))
+        object.__setattr__(self, "_T0", float(T_grid[0]))
+        object.__setattr__(self, "_dT", float(T_grid[1] - T_grid[0]))
+        object.__setattr__(self, "_x0", float(x_grid[0]))
+        object.__setattr__(self, "_dx", float(x_grid[1] - x_grid[0]))
+
+    @staticmethod
+    def bake(
+        surface,
+        T_max: float,
+        forward_curve=None,
+        T_min: float = 1.0 / 365.0,
+        x_range: Tuple[float, float] = (-1.0, 1.0),
+        n_T: int = 64,
+        n_x: int = 65,
+        method: str = "bicubic",
+        target_error: Optional[float] = None,
+        max_refinements: int = 4,
+    ) -> "BakedVolSurface":
+        start = time.perf_counter()
+        if forward_curve is None:
+            if not hasattr(surface, "forward_curve"):
+                raise ValueError("surface has no forward_curve; pass one to bake")
+            forward_curve = surface.forward_curve
+
+        T_grid = np.linspace(float(T_min), float(T_max), int(n_T))
+        x_grid = np.linspace(float(x_range[0]), float(x_range[1]), int(n_x))
+
+        def sample(T, x):
+            TT, XX = np.meshgrid(T, x, indexing="ij")
+            return surface_vols(surface, TT, forwards_for(forward_curve, TT) * np.exp(XX))
+
+        vols = sample(T_grid, x_grid)
+        refinements = 0
+        while True:
+            baked = BakedVolSurface(forward_curve, T_grid, x_grid, vols, method=method)
+            # probe halfway between nodes along each axis and at cell centres
+            T_mid = 0.5 * (T_grid[:-1] + T_grid[1:])
+            x_mid = 0.5 * (x_grid[:-1] + x_grid[1:])
+            err_T = baked._error(sample, T_mid, x_grid)
+            err_x = baked._error(sample, T_grid, x_mid)
+            err_c = baked._error(sample, T_mid, x_mid)
+            worst = max(err_T[0], err_x[0], err_c[0])
+            if target_error is None or worst <= target_error or refinements >= max_refinements:
+                break
+
+            # halve the spacing on the axis that contributes more error, reusing existing samples
+            if err_T[0] >= err_x[0]:
+                new = sample(T_mid, x_grid)
+                T_grid, vols = _interleave(T_grid, T_mid, vols, new, axis=0)
+            else:
+                new = sample(T_grid, x_mid)
+                x_grid, vols = _interleave(x_grid, x_mid, vols, new, axis=1)
+            refinements += 1
+
+        max_err, at_T, at_x = max((err_T, err_x, err_c), key=lambda e: e[0])[:3]
+        n = err_T[4] + err_x[4] + err_c[4]
+        rms = math.sqrt((err_T[3] + err_x[3] + err_c[3]) / n) if n else 0.0
+        report = BakeReport(
+            max_error=max_err,
+            rms_error=rms,
+            at_T=at_T,
+            at_x=at_x,
+            n_T=len(T_grid),
+            n_x=len(x_grid),
+            refinements=refinements,
+            seconds=time.perf_counter() - start,
+        )
+        return BakedVolSurface(forward_curve, T_grid, x_grid, vols, method=method, report=report)
+
+    def _error(self, sample, T, x) -> Tuple[float, float, float, float, int]:
+        exact = sample(T, x)
+        TT, XX = np.meshgrid(T, x, indexing="ij")
+        err = np.abs(self._interp(TT, XX) - exact)
+        err = np.where(np.isfinite(err), err, 0.0)
+        i, j = np.unravel_index(int(np.argmax(err)), err.shape)
+        return float(err[i, j]), float(T[i]), float(x[j]), float((err * err).sum()), int(err.size)
+
+    def _coords(self, T, x) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # fractional grid coordinates, clamped so lookups outside the grid extrapolate flat
+        u = np.clip((T - self._T0) / self._dT, 0.0, len(self.T_grid) - 1.0)
+        v = np.clip((x - self._x0) / self._dx, 0.0, len(self.x_grid) - 1.0)
+        i = np.minimum(u.astype(np.int64), len(self.T_grid) - 2)
+        j = np.minimum(v.astype(np.int64), len(self.x_grid) - 2)
+        return i, j, u - i, v - j
+
+    def _interp(self, T, x) -> np.ndarray:
+        i, j, s, t = self._coords(np.asarray(T, dtype=float), np.asarray(x, dtype=float))
+        cells = (i * (len(self.x_grid) - 1) + j).ravel()
+        c = np.take(self._coef, cells, axis=1).reshape((-1,) + s.shape)
+        if self.method == "bilinear":
+            return c[0] + t * c[1] + s * (c[2] + t * c[3])
+
+        # Horner in t for each power of s, then in s
+        rows = [c[4 * p] + t * (c[4 * p + 1] + t * (c[4 * p + 2] + t * c[4 * p + 3])) for p in range(4)]
+        return rows[0] + s * (rows[1] + s * (rows[2] + s * rows[3]))
+
+    def vol_many(self, T, K, F: Optional[np.ndarray] = None) -> np.ndarray:
+        T, K = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(K, dtype=float))
+        if F is None:
+            F = forwards_for(self.forward_curve, T)
+        return self._interp(T, np.log(K / F))
+
+    def vol(self, T: float, K: float) -> float:
+        return float(self.vol_many(T, K))
+
+
+def _interleave(nodes: np.ndarray, mids: np.ndarray, vols: np.ndarray, new: np.ndarray, axis: int):
+    n = len(nodes)
+    grid = np.empty(2 * n - 1)
+    grid[0::2] = nodes
+    grid[1::2] = mids
+    shape = list(vols.shape)
+    shape[axis] = 2 * n - 1
+    out = np.empty(shape)
+    if axis == 0:
+        out[0::2] = vols
+        out[1::2] = new
+    else:
+        out[:, 0::2] = vols
+        out[:, 1::2] = new
+    return grid, out
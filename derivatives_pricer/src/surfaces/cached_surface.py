@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from src.surfaces.vol_interface import surface_vols
+
+
+class CachedVolSurface:
+    def __init__(self, surface, maxsize: int = 100_000):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be > 0.")
+        self._surface = surface
+        self.maxsize = int(maxsize)
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def surface(self):
+        return self._surface
+
+    def __getattr__(self, name):
+        # private names never forward: copy/pickle probe them before __init__ has set _surface
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._surface, name)
+
+    def _store(self, key, value: float) -> None:
+        self._cache[key] = value
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def vol(self, T: float, K: float) -> float:
+        key = (float(T), float(K))
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return value
+            surface = self._surface
+
+        value = float(surface.vol(key[0], key[1]))
+        with self._lock:
+            self.misses += 1
+            if surface is self._surface:
+                self._store(key, value)
+        return value
+
+    def vol_many(self, T, K, F: Optional[np.ndarray] = None) -> np.ndarray:
+        if F is not None:
+            return self._surface.vol_many(T, K, F=F)
+
+        T, K = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(K, dtype=float))
+        points, inverse = np.unique(np.stack([T.ravel(), K.ravel()], axis=1), axis=0, return_inverse=True)
+        keys = [(float(t), float(k)) for t, k in points]
+        values = np.empty(len(keys))
+        missing = []
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                value = self._cache.get(key)
+                if value is None:
+                    missing.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    values[i] = value
+            self.hits += len(keys) - len(missing)
+            surface = self._surface
+
+        if missing:
+            missing = np.array(missing)
+            values[missing] = surface_vols(surface, points[missing, 0], points[missing, 1])
+            with self._lock:
+                self.misses += len(missing)
+                if surface is self._surface:
+                    for i in missing:
+                        self._store(keys[i], float(values[i]))
+
+        return values[inverse.ravel()].reshape(T.shape)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def rebuild(self, surface) -> None:
+        with self._lock:
+            self._surface = surface
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._cache),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
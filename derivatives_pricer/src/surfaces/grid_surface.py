@@ -1,10 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Iterable
 
 import numpy as np
 
+from src import instrumentation
+from src.market.forward_curve import year_fraction_act365
+from src.surfaces.interp import (
+    STRIKE_METHODS,
+    TIME_METHODS,
+    bracket,
+    interp_nodes,
+    nearest_index,
+    pchip_slopes,
+    sorted_nodes,
+)
 from src.surfaces.vol_interface import VolSurface
 
 
@@ -15,37 +26,137 @@ class FlatVol(VolSurface):
     def vol(self, T: float, K: float) -> float:
         return float(self.sigma)
 
+    def vol_many(self, T, K) -> np.ndarray:
+        T, K = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(K, dtype=float))
+        return np.full(T.shape, float(self.sigma))
+
+
+def _check_method(method: str, allowed) -> None:
+    if method not in allowed:
+        raise ValueError(f"interpolation must be one of {allowed}")
+
 
 @dataclass(frozen=True)
 class TermVol(VolSurface):
     vols: Dict[float, float]
+    time_interp: str = "nearest"
+
+    _times: np.ndarray = field(init=False, repr=False, compare=False)
+    _vols: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        _check_method(self.time_interp, TIME_METHODS)
+        times, vols = sorted_nodes(self.vols)
+        object.__setattr__(self, "_times", times)
+        object.__setattr__(self, "_vols", vols)
 
     def vol(self, T: float, K: float) -> float:
-        T = float(T)
-        keys = np.array(sorted(self.vols.keys()), dtype=float)
-        idx = int(np.argmin(np.abs(keys - T)))
-        return float(self.vols[float(keys[idx])])
+        return float(self.vol_many(T, K))
+
+    def vol_many(self, T, K) -> np.ndarray:
+        T, _ = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(K, dtype=float))
+        if self.time_interp == "nearest":
+            return self._vols[nearest_index(self._times, T)]
+
+        i0, i1, w = bracket(self._times, T)
+        return _total_variance_vol(T, self._times[i0], self._times[i1], self._vols[i0], self._vols[i1], w)
+
+
+def _total_variance_vol(T, t0, t1, v0, v1, w) -> np.ndarray:
+    inside = (t1 > t0) & (T > 0)
+    var = (1.0 - w) * v0 * v0 * t0 + w * v1 * v1 * t1
+    safe_T = np.where(inside, T, 1.0)
+    interpolated = np.sqrt(np.maximum(var, 0.0) / safe_T)
+    return np.where(inside, interpolated, np.where(w > 0, v1, v0))
 
 
 @dataclass(frozen=True)
 class SmileSlice:
     T: float
     vols: Dict[float, float]
+    interp: str = "nearest"
+
+    _strikes: np.ndarray = field(init=False, repr=False, compare=False)
+    _vols: np.ndarray = field(init=False, repr=False, compare=False)
+    _slopes: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        _check_method(self.interp, STRIKE_METHODS)
+        strikes, vols = sorted_nodes(self.vols)
+        slopes = pchip_slopes(strikes, vols) if self.interp == "pchip" else np.zeros_like(strikes)
+        object.__setattr__(self, "_strikes", strikes)
+        object.__setattr__(self, "_vols", vols)
+        object.__setattr__(self, "_slopes", slopes)
 
     def vol_at_strike(self, K: float) -> float:
-        K = float(K)
-        keys = np.array(sorted(self.vols.keys()), dtype=float)
-        idx = int(np.argmin(np.abs(keys - K)))
-        return float(self.vols[float(keys[idx])])
+        return float(self.vol_at_strikes(K))
+
+    def vol_at_strikes(self, K) -> np.ndarray:
+        return interp_nodes(self._strikes, self._vols, K, self.interp, self._slopes)
 
 
 @dataclass(frozen=True)
 class SmileSurface(VolSurface):
     slices: Dict[float, SmileSlice]
+    time_interp: str = "nearest"
+
+    _times: np.ndarray = field(init=False, repr=False, compare=False)
+    _slices: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        _check_method(self.time_interp, TIME_METHODS)
+        times = np.array(sorted(self.slices.keys()), dtype=float)
+        object.__setattr__(self, "_times", times)
+        object.__setattr__(self, "_slices", tuple(self.slices[float(t)] for t in times))
+
+    @staticmethod
+    def from_chains(chains: Iterable, interp: str = "linear", time_interp: str = "total_variance") -> "SmileSurface":
+        slices: Dict[float, SmileSlice] = {}
+        for chain in chains:
+            T = year_fraction_act365(chain.as_of, chain.expiry)
+            K, iv = chain.smile()
+            ok = np.isfinite(iv) & (iv > 0)
+            # calls and puts quote the same strikes; average them into one node
+            strikes, inverse = np.unique(K[ok], return_inverse=True)
+            vols = np.bincount(inverse, weights=iv[ok]) / np.bincount(inverse)
+            if len(strikes) == 0:
+                continue
+            slices[T] = SmileSlice(T=T, vols=dict(zip(strikes.tolist(), vols.tolist())), interp=interp)
+        return SmileSurface(slices=slices, time_interp=time_interp)
 
     def vol(self, T: float, K: float) -> float:
+        instrumentation.count("surface.vol")
         T = float(T)
-        mats = np.array(sorted(self.slices.keys()), dtype=float)
-        idx = int(np.argmin(np.abs(mats - T)))
-        sl = self.slices[float(mats[idx])]
-        return sl.vol_at_strike(K)
+        if self.time_interp == "nearest":
+            return self._slices[int(nearest_index(self._times, T))].vol_at_strike(K)
+
+        i0, i1, w = (x.item() for x in bracket(self._times, T))
+        v0 = self._slices[i0].vol_at_strike(K)
+        v1 = self._slices[i1].vol_at_strike(K) if i1 != i0 else v0
+        return float(_total_variance_vol(T, self._times[i0], self._times[i1], v0, v1, w))
+
+    def vol_many(self, T, K) -> np.ndarray:
+        T, K = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(K, dtype=float))
+        if instrumentation.enabled():
+            instrumentation.count("surface.vol_many")
+            instrumentation.count("surface.vol_many.points", T.size)
+
+        if self.time_interp == "nearest":
+            i0 = nearest_index(self._times, T)
+            i1, w = i0, np.zeros(T.shape)
+        else:
+            i0, i1, w = bracket(self._times, T)
+
+        v0 = np.empty(T.shape)
+        v1 = np.empty(T.shape)
+        for s, sl in enumerate(self._slices):
+            m0 = i0 == s
+            m1 = i1 == s
+            if np.any(m0):
+                v0[m0] = sl.vol_at_strikes(K[m0])
+            if np.any(m1):
+                v1[m1] = sl.vol_at_strikes(K[m1])
+
+        if self.time_interp == "nearest":
+            return v0
+        return _total_variance_vol(T, self._times[i0], self._times[i1], v0, v1, w)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+
+STRIKE_METHODS = ("nearest", "linear", "pchip")
+TIME_METHODS = ("nearest", "total_variance")
+
+
+def sorted_nodes(nodes: dict) -> Tuple[np.ndarray, np.ndarray]:
+    x = np.array(sorted(nodes.keys()), dtype=float)
+    y = np.array([nodes[k] for k in sorted(nodes.keys())], dtype=float)
+    return x, y
+
+
+def nearest_index(x: np.ndarray, q) -> np.ndarray:
+    q = np.asarray(q, dtype=float)
+    if len(x) == 1:
+        return np.zeros(q.shape, dtype=int)
+    j = np.clip(np.searchsorted(x, q), 1, len(x) - 1)
+    # ties go to the lower node, as argmin(|x - q|) does
+    return np.where(q - x[j - 1] <= x[j] - q, j - 1, j)
+
+
+def _bracket_scalar(x: np.ndarray, q: float) -> Tuple[np.intp, np.intp, np.float64]:
+    last = len(x) - 1
+    if last == 0 or q <= x[0]:
+        return np.intp(0), np.intp(0), np.float64(0.0)
+    if q >= x[-1]:
+        return np.intp(last), np.intp(last), np.float64(0.0)
+    j = np.intp(np.searchsorted(x, q))
+    return j - 1, j, np.float64((q - x[j - 1]) / (x[j] - x[j - 1]))
+
+
+def bracket(x: np.ndarray, q) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    q = np.asarray(q, dtype=float)
+    if q.ndim == 0:
+        # same brackets as below without the array passes; scalar vol lookups go through here
+        return _bracket_scalar(x, float(q))
+    last = len(x) - 1
+    if last == 0:
+        zero = np.zeros(q.shape, dtype=int)
+        return zero, zero, np.zeros(q.shape)
+    j = np.clip(np.searchsorted(x, q), 1, last)
+    i0 = np.where(q <= x[0], 0, np.where(q >= x[-1], last, j - 1))
+    i1 = np.where(q <= x[0], 0, np.where(q >= x[-1], last, j))
+    span = x[i1] - x[i0]
+    w = np.where(span > 0, (q - x[i0]) / np.where(span > 0, span, 1.0), 0.0)
+    return i0, i1, w
+
+
+def pchip_slopes(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    n = len(x)
+    if n < 2:
+        return np.zeros(n)
+    h = np.diff(x)
+    delta = np.diff(y) / h
+    if n == 2:
+        return np.array([delta[0], delta[0]])
+
+    m = np.zeros(n)
+    w1 = 2.0 * h[1:] + h[:-1]
+    w2 = h[1:] + 2.0 * h[:-1]
+    same_sign = delta[:-1] * delta[1:] > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        harmonic = (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:])
+    m[1:-1] = np.where(same_sign, harmonic, 0.0)
+
+    m[0] = _pchip_edge(h[0], h[1], delta[0], delta[1])
+    m[-1] = _pchip_edge(h[-1], h[-2], delta[-1], delta[-2])
+    return m
+
+
+def _pchip_edge(h0: float, h1: float, d0: float, d1: float) -> float:
+    m = ((2.0 * h0 + h1) * d0 - h0 * d1) / (h0 + h1)
+    if np.sign(m) != np.sign(d0):
+        return 0.0
+    if np.sign(d0) != np.sign(d1) and abs(m) > abs(3.0 * d0):
+        return 3.0 * d0
+    return m
+
+
+def interp_nodes(x: np.ndarray, y: np.ndarray, q, method: str, slopes: np.ndarray | None = None) -> np.ndarray:
+    q = np.asarray(q, dtype=float)
+    if method == "nearest":
+        return y[nearest_index(x, q)]
+
+    i0, i1, w = bracket(x, q)
+    if method == "linear":
+        return (1.0 - w) * y[i0] + w * y[i1]
+    if method == "pchip":
+        if slopes is None:
+            slopes = pchip_slopes(x, y)
+        h = x[i1] - x[i0]
+        w2 = w * w
+        w3 = w2 * w
+        return (
+            (2 * w3 - 3 * w2 + 1) * y[i0]
+            + (w3 - 2 * w2 + w) * h * slopes[i0]
+            + (-2 * w3 + 3 * w2) * y[i1]
+            + (w3 - w2) * h * slopes[i1]
+        )
+    raise ValueError(f"method must be one of {STRIKE_METHODS}")
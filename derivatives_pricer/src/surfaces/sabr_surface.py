@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
+from src import instrumentation
 from src.market.forward_curve import ForwardCurve, year_fraction_act365
 from src.sabr.params import SABRParams
-from src.sabr.sabr import hagan_lognormal_iv
+from src.sabr.sabr import hagan_lognormal_iv, hagan_lognormal_iv_array
+from src.surfaces.interp import bracket
 
 
 @dataclass(frozen=True)
@@ -17,35 +19,64 @@ class SABRVolSurface:
     forward_curve: ForwardCurve
     params_by_expiry: Dict[date, SABRParams]
 
-    def _times_and_params(self) -> Tuple[np.ndarray, List[SABRParams]]:
+    _expiries: List[date] = field(init=False, repr=False, compare=False)
+    _times: np.ndarray = field(init=False, repr=False, compare=False)
+    _matrix: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
         expiries = sorted(self.params_by_expiry.keys())
         times = np.array([year_fraction_act365(self.as_of, d) for d in expiries], dtype=float)
         params = [self.params_by_expiry[d] for d in expiries]
-        return times, params
+        # columns: alpha, beta, rho, nu, shift
+        matrix = np.array([[p.alpha, p.beta, p.rho, p.nu, p.shift] for p in params], dtype=float).reshape(-1, 5)
 
-    def _interp_params(self, T: float) -> SABRParams:
-        T = float(T)
-        times, params = self._times_and_params()
+        object.__setattr__(self, "_expiries", expiries)
+        object.__setattr__(self, "_times", times)
+        object.__setattr__(self, "_matrix", matrix)
 
-        if len(times) == 0:
-            raise ValueError("No SABR params in surface")
+    @property
+    def expiries(self) -> List[date]:
+        return list(self._expiries)
 
-        if T <= times.min():
-            return params[int(np.argmin(times))]
-        if T >= times.max():
-            return params[int(np.argmax(times))]
+    def interp_weights(self, T) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # expiry-node indices (i0, i1) and weight w on i1 used to interpolate params at each T
+        if len(self._times) == 0:
+            raise ValueError("No SABR params in surface")
+        return bracket(self._times, T)
 
-        j = int(np.searchsorted(times, T))
-        t0, t1 = times[j - 1], times[j]
-        p0, p1 = params[j - 1], params[j]
-        w = (T - t0) / (t1 - t0)
+    def param_matrix(self, T) -> np.ndarray:
+        # interpolated (alpha, beta, rho, nu, shift) per T, one row per point
+        i0, i1, w = self.interp_weights(T)
+        m0 = self._matrix[i0]
+        m1 = self._matrix[i1]
+        if w.ndim:
+            w = w[..., None]
+        out = (1 - w) * m0 + w * m1
+        # beta and shift are taken from the left node, not interpolated
+        out[..., 1] = m0[..., 1]
+        out[..., 4] = m0[..., 4]
+        return out
 
-        alpha = (1 - w) * p0.alpha + w * p1.alpha
-        rho = (1 - w) * p0.rho + w * p1.rho
-        nu = (1 - w) * p0.nu + w * p1.nu
-        return SABRParams(alpha=float(alpha), beta=float(p0.beta), rho=float(rho), nu=float(nu), shift=float(p0.shift))
+    def params_at(self, T: float) -> SABRParams:
+        alpha, beta, rho, nu, shift = self.param_matrix(float(T)).tolist()
+        return SABRParams(alpha=alpha, beta=beta, rho=rho, nu=nu, shift=shift)
 
     def vol(self, T: float, K: float) -> float:
+        instrumentation.count("surface.vol")
         F = self.forward_curve.forward_T(T)
-        p = self._interp_params(T)
-        return float(hagan_lognormal_iv(F=F, K=float(K), T=float(T), p=p))
+        return float(hagan_lognormal_iv(F=F, K=float(K), T=float(T), p=self.params_at(T)))
+
+    def with_params(self, expiry: date, params: SABRParams) -> "SABRVolSurface":
+        updated = dict(self.params_by_expiry)
+        updated[expiry] = params
+        return SABRVolSurface(as_of=self.as_of, forward_curve=self.forward_curve, params_by_expiry=updated)
+
+    def vol_many(self, T, K, F: Optional[np.ndarray] = None) -> np.ndarray:
+        T, K = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(K, dtype=float))
+        if instrumentation.enabled():
+            instrumentation.count("surface.vol_many")
+            instrumentation.count("surface.vol_many.points", T.size)
+        if F is None:
+            F = self.forward_curve.forward_T_many(T)
+        m = self.param_matrix(T)
+        return hagan_lognormal_iv_array(F, K, T, m[..., 0], m[..., 1], m[..., 2], m[..., 3], m[..., 4])
@@ -2,8 +2,23 @@ from __future__ import annotations
 
 from typing import Protocol, runtime_checkable
 
+import numpy as np
+
 
 @runtime_checkable
 class VolSurface(Protocol):
     def vol(self, T: float, K: float) -> float:
         ...
+
+
+def surface_vols(vol_or_surface, T, K) -> np.ndarray:
+    T, K = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(K, dtype=float))
+
+    if not hasattr(vol_or_surface, "vol"):
+        return np.full(T.shape, float(vol_or_surface))
+    if hasattr(vol_or_surface, "vol_many"):
+        return np.asarray(vol_or_surface.vol_many(T, K), dtype=float)
+
+    points, inverse = np.unique(np.stack([T.ravel(), K.ravel()], axis=1), axis=0, return_inverse=True)
+    vols = np.array([vol_or_surface.vol(float(t), float(k)) for t, k in points], dtype=float)
+    return vols[inverse.ravel()].reshape(T.shape)
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+# modules import as `src.` and `pricer` from the derivatives_pricer directory
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+DATA_DIR = ROOT / "data"
+
+
+@pytest.fixture(scope="session")
+def data_dir() -> Path:
+    return DATA_DIR
+
+
+@pytest.fixture(scope="session")
+def forward_curve():
+    from src.market.forward_curve import ForwardCurve
+
+    return ForwardCurve.from_csv(DATA_DIR / "wti_forward_prices.csv")
+
+
+@pytest.fixture(scope="session")
+def sabr_surface(forward_curve):
+    from src.sabr.pipeline import load_sabr_params_csv
+    from src.surfaces.sabr_surface import SABRVolSurface
+
+    params = load_sabr_params_csv(DATA_DIR / "sabr_params.csv")
+    return SABRVolSurface(as_of=forward_curve.as_of, forward_curve=forward_curve, params_by_expiry=params)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.models.american import (
+    american_greeks,
+    american_price_baw,
+    american_price_lattice,
+    implied_vol_american_array,
+)
+from src.models.black76 import price_array
+
+
+@pytest.fixture(scope="module")
+def grid():
+    rng = np.random.default_rng(1)
+    n = 200
+    return {
+        "F": rng.uniform(50, 80, n),
+        "K": rng.uniform(40, 90, n),
+        "T": rng.uniform(0.02, 2.0, n),
+        "vol": rng.uniform(0.1, 0.8, n),
+        "cp": rng.choice([-1, 1], n),
+        "df": rng.uniform(0.85, 1.0, n),
+    }
+
+
+def test_baw_close_to_lattice_with_discounting():
+    rng = np.random.default_rng(2)
+    n = 60
+    F, K = rng.uniform(50, 80, n), rng.uniform(40, 90, n)
+    T, vol = rng.uniform(0.02, 1.5, n), rng.uniform(0.15, 0.6, n)
+    cp = rng.choice([-1, 1], n)
+    df = np.exp(-rng.uniform(0.0, 0.06, n) * T)
+    baw = american_price_baw(F, K, T, vol, df=df, cp=cp)
+    lattice = american_price_lattice(F, K, T, vol, df=df, cp=cp, steps=1000)
+    euro = price_array(F, K, T, vol, df=df, cp=cp)
+    assert np.all(baw >= euro - 1e-12)
+    assert np.all(lattice >= euro - 1e-3)
+    # BAW is an approximation that drifts high for long-dated, high-rate options
+    assert np.all(np.abs(baw - lattice) < 0.02 * (lattice + 1.0))
+
+
+def test_american_equals_european_without_rates():
+    F, K, T, vol = 65.0, np.array([55.0, 65.0, 75.0]), 0.8, 0.35
+    for cp in (1, -1):
+        assert np.allclose(american_price_baw(F, K, T, vol, df=1.0, cp=cp), price_array(F, K, T, vol, df=1.0, cp=cp))
+
+
+def test_american_implied_vol_round_trip(grid):
+    g = grid
+    premium = american_price_baw(g["F"], g["K"], g["T"], g["vol"], df=g["df"], cp=g["cp"])
+    res = implied_vol_american_array(premium, g["F"], g["K"], g["T"], g["cp"], df=g["df"])
+    vega = american_greeks(g["F"], g["K"], g["T"], g["vol"], df=g["df"], cp=g["cp"])["vega"]
+    informative = res.converged & (vega > 1e-2)
+    assert informative.mean() > 0.8
+    assert np.allclose(res.vol[informative], g["vol"][informative], atol=1e-5)
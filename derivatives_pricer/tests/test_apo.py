@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.instrument.apo import AveragePriceOption
+from src.models.apo import apo_moment_matching, apo_monte_carlo
+from src.models.black76 import price
+
+
+def test_apo_monte_carlo_matches_moment_matching(forward_curve):
+    option = AveragePriceOption(K=65.0, start=date(2026, 5, 1), end=date(2026, 5, 29), cp=1)
+    mm = apo_moment_matching(option, forward_curve, 0.35, df=0.99)
+    mc = apo_monte_carlo(option, forward_curve, 0.35, df=0.99, n_paths=60_000, seed=3)
+    assert abs(mc.pv - mm) < 4.0 * mc.stderr + 0.02
+    # averaging reduces the vol, so the APO is cheaper than the vanilla on the same contract
+    T = (date(2026, 5, 29) - forward_curve.as_of).days / 365.0
+    assert mm < price(forward_curve.forward_on(date(2026, 5, 29)), 65.0, T, 0.35, df=0.99, cp=1)
+
+
+@pytest.mark.parametrize("antithetic", [True, False])
+def test_sobol_runs_the_requested_paths(forward_curve, antithetic):
+    option = AveragePriceOption(K=65.0, start=date(2026, 5, 1), end=date(2026, 5, 29), cp=1)
+    for n in (100_000, 5_000):
+        res = apo_monte_carlo(option, forward_curve, 0.35, n_paths=n, sampler="sobol", antithetic=antithetic, seed=1)
+        assert res.n_paths == n
+
+
+def test_sobol_stderr_tracks_the_spread_across_scrambles(forward_curve):
+    option = AveragePriceOption(K=65.0, start=date(2026, 5, 1), end=date(2026, 5, 29), cp=1)
+    runs = [apo_monte_carlo(option, forward_curve, 0.35, n_paths=20_000, sampler="sobol", seed=s) for s in range(12)]
+    spread = np.std([r.pv for r in runs], ddof=1)
+    reported = np.mean([r.stderr for r in runs])
+    assert 0.3 < reported / spread < 3.0
+
+    reference = apo_monte_carlo(option, forward_curve, 0.35, n_paths=400_000, seed=99)
+    assert abs(runs[0].pv - reference.pv) < 4.0 * np.hypot(runs[0].stderr, reference.stderr)
+    # a single scramble has no error estimate
+    single = apo_monte_carlo(option, forward_curve, 0.35, n_paths=4_096, sampler="sobol", qmc_replicates=1, seed=0)
+    assert np.isnan(single.stderr)
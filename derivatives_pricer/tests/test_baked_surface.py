@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.market.forward_curve import forwards_for
+from src.surfaces.baked_surface import BakedVolSurface
+from src.surfaces.vol_interface import surface_vols
+
+
+def _probe_error(baked, surface, forward_curve, T_max):
+    # off-grid probes, independent of the bake's own mid-cell report
+    rng = np.random.default_rng(7)
+    T = rng.uniform(0.05, T_max, 400)
+    F = forwards_for(forward_curve, T)
+    K = F * np.exp(rng.uniform(-0.5, 0.5, T.size))
+    return np.abs(baked.vol_many(T, K) - surface_vols(surface, T, K)).max()
+
+
+def test_bake_report_bounds_error_against_source(sabr_surface, forward_curve):
+    baked = BakedVolSurface.bake(sabr_surface, T_max=2.0, x_range=(-0.6, 0.6), n_T=48, n_x=49)
+    report = baked.report
+    assert (report.n_T, report.n_x, report.refinements) == (48, 49, 0)
+    # the worst cell sits in the short-dated wings; the bulk of the grid is far tighter
+    assert 0.0 < report.rms_error < 5e-3 and report.rms_error <= report.max_error < 0.1
+    assert 1.0 / 365.0 <= report.at_T <= 2.0 and -0.6 <= report.at_x <= 0.6
+
+    err = _probe_error(baked, sabr_surface, forward_curve, 2.0)
+    assert err <= 2.0 * report.max_error
+
+    # lookups on the grid nodes reproduce the sampled source
+    T = baked.T_grid[::7]
+    K = forwards_for(forward_curve, T) * np.exp(baked.x_grid[10])
+    assert np.allclose(baked.vol_many(T, K), surface_vols(sabr_surface, T, K), atol=1e-12)
+
+
+def test_bake_refines_until_target_error(sabr_surface, forward_curve):
+    coarse = BakedVolSurface.bake(sabr_surface, T_max=2.0, x_range=(-0.6, 0.6), n_T=6, n_x=7)
+    target = coarse.report.max_error / 8.0
+    fine = BakedVolSurface.bake(
+        sabr_surface, T_max=2.0, x_range=(-0.6, 0.6), n_T=6, n_x=7, target_error=target, max_refinements=8
+    )
+    assert fine.report.refinements > 0
+    assert fine.report.max_error <= target
+    assert fine.report.n_T * fine.report.n_x > 6 * 7
+    assert _probe_error(fine, sabr_surface, forward_curve, 2.0) < _probe_error(coarse, sabr_surface, forward_curve, 2.0)
+
+    capped = BakedVolSurface.bake(
+        sabr_surface, T_max=2.0, x_range=(-0.6, 0.6), n_T=6, n_x=7, target_error=1e-12, max_refinements=2
+    )
+    assert capped.report.refinements == 2
+
+
+def test_bicubic_beats_bilinear_and_scalar_matches_batch(sabr_surface, forward_curve):
+    kwargs = dict(T_max=2.0, x_range=(-0.6, 0.6), n_T=24, n_x=25)
+    linear = BakedVolSurface.bake(sabr_surface, method="bilinear", **kwargs)
+    cubic = BakedVolSurface.bake(sabr_surface, method="bicubic", **kwargs)
+    assert cubic.report.max_error < linear.report.max_error
+
+    T = np.array([0.1, 0.5, 1.3, 1.9])
+    K = np.array([45.0, 60.0, 70.0, 85.0])
+    batch = cubic.vol_many(T, K)
+    assert [cubic.vol(t, k) for t, k in zip(T, K)] == batch.tolist()
+
+
+def test_baked_surface_rejects_bad_inputs(sabr_surface, forward_curve):
+    with pytest.raises(ValueError, match="method"):
+        BakedVolSurface.bake(sabr_surface, T_max=1.0, method="spline")
+    with pytest.raises(ValueError, match="vols must be"):
+        BakedVolSurface(forward_curve, np.linspace(0.1, 1.0, 3), np.linspace(-1.0, 1.0, 4), np.zeros((4, 3)))
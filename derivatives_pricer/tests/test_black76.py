@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.models.black76 import d1_d2, d1_d2_array, price, price_array
+from src.models.greeks import delta, delta_array, gamma, gamma_array, vega, vega_array
+
+CASES = [
+    (65.0, 60.0, 0.5, 0.35, 0.98, 1),
+    (65.0, 60.0, 0.5, 0.35, 0.98, -1),
+    (60.0, 65.0, 0.02, 0.8, 1.0, 1),
+    (65.0, 65.0, 1.5, 0.2, 0.9, -1),
+    # degenerate: expired or zero vol
+    (65.0, 60.0, 0.0, 0.35, 0.98, 1),
+    (60.0, 65.0, 0.5, 0.0, 0.98, -1),
+    (65.0, 65.0, 0.0, 0.3, 1.0, 1),
+]
+
+
+@pytest.mark.parametrize("F,K,T,vol,df,cp", CASES)
+def test_scalar_matches_array(F, K, T, vol, df, cp):
+    assert price(F, K, T, vol, df=df, cp=cp) == pytest.approx(float(price_array(F, K, T, vol, df=df, cp=cp)), abs=1e-12)
+    assert delta(F, K, T, vol, df=df, cp=cp) == pytest.approx(float(delta_array(F, K, T, vol, df=df, cp=cp)), abs=1e-12)
+    assert gamma(F, K, T, vol, df=df) == pytest.approx(float(gamma_array(F, K, T, vol, df=df)), abs=1e-12)
+    assert vega(F, K, T, vol, df=df) == pytest.approx(float(vega_array(F, K, T, vol, df=df)), abs=1e-12)
+    assert np.allclose(d1_d2(F, K, T, vol), d1_d2_array(F, K, T, vol))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"cp": 0},
+        {"df": -0.1},
+        {"F": 0.0},
+        {"K": -1.0},
+        {"T": -0.1},
+        {"vol": -0.2},
+    ],
+)
+def test_scalar_and_array_share_validation(kwargs):
+    args = {"F": 65.0, "K": 60.0, "T": 0.5, "vol": 0.35, "df": 1.0, "cp": 1, **kwargs}
+    with pytest.raises(ValueError) as scalar_err:
+        price(**args)
+    with pytest.raises(ValueError) as array_err:
+        price_array(**args)
+    assert str(scalar_err.value) == str(array_err.value)
+
+
+def test_put_call_parity_holds():
+    F, K, T, vol, df = 65.0, 60.0, 0.5, 0.35, 0.97
+    assert price(F, K, T, vol, df=df, cp=1) - price(F, K, T, vol, df=df, cp=-1) == pytest.approx(df * (F - K), abs=1e-12)
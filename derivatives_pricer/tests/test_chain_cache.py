@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import shutil
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from src.market.chain_cache import OptionChainCache
+from src.market.option_chain import OptionChain
+
+
+@pytest.fixture
+def chain_csv(tmp_path, data_dir):
+    src = sorted((data_dir / "options").glob("*.csv"))[3]
+    dst = tmp_path / "quotes" / src.name
+    dst.parent.mkdir()
+    shutil.copy(src, dst)
+    return dst
+
+
+def test_cache_hit_returns_the_parsed_chain(tmp_path, chain_csv, forward_curve):
+    cache = OptionChainCache(tmp_path / "cache")
+    first = cache.load(chain_csv, forward_curve)
+    second = cache.load(chain_csv, forward_curve)
+    assert (cache.misses, cache.hits) == (1, 1)
+
+    expected = OptionChain.from_csv(chain_csv, forward_curve)
+    for chain in (first, second):
+        assert (chain.expiry, chain.F, chain.df) == (expected.expiry, expected.F, expected.df)
+        assert chain.data[list(expected.data.columns)].equals(expected.data)
+
+    # drop_bad is applied after the cache, so one entry serves both views
+    everything = cache.load(chain_csv, forward_curve, drop_bad=False)
+    assert cache.hits == 2 and len(everything.data) >= len(first.data)
+
+
+def test_cache_key_changes_with_inputs(tmp_path, chain_csv, forward_curve):
+    cache = OptionChainCache(tmp_path / "cache")
+    cache.load(chain_csv, forward_curve)
+    cache.load(chain_csv, forward_curve, df=0.97)
+    cache.load(chain_csv, forward_curve, as_of=forward_curve.as_of - timedelta(days=1))
+    cache.load(chain_csv, forward_curve, exercise="american")
+    cache.load(chain_csv, forward_curve, forward_mapping_rule="closest")
+
+    expiry = cache.load(chain_csv, forward_curve).expiry
+    moved = forward_curve.with_forwards({d: f + 1.0 for d, f in zip(forward_curve.expiries.astype(object), forward_curve.forwards)})
+    assert moved.forward_on(expiry) != forward_curve.forward_on(expiry)
+    cache.load(chain_csv, moved)
+    assert (cache.misses, cache.hits) == (6, 1)
+
+
+def test_cache_invalidates_on_file_change_and_clear(tmp_path, chain_csv, forward_curve):
+    cache = OptionChainCache(tmp_path / "cache")
+    before = cache.load(chain_csv, forward_curve, drop_bad=False)
+
+    lines = chain_csv.read_text().splitlines()
+    chain_csv.write_text("\n".join(lines[:-1]) + "\n")
+    after = cache.load(chain_csv, forward_curve, drop_bad=False)
+    assert cache.misses == 2
+    assert len(after.data) == len(before.data) - 1
+
+    assert len(list((tmp_path / "cache").glob("*.npz"))) == 2
+    cache.clear()
+    assert not list((tmp_path / "cache").glob("*.npz"))
+    cache.load(chain_csv, forward_curve)
+    assert cache.misses == 3
+    assert np.isfinite(after.data.loc[after.data["ok"], "iv"]).all()
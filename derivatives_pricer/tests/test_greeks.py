@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.models.black76 import price_array
+from src.models.greeks import GREEK_NAMES, black76_greeks, delta_array, gamma_array, vega_array
+
+
+@pytest.fixture(scope="module")
+def inputs():
+    rng = np.random.default_rng(11)
+    n = 100
+    return {
+        "F": rng.uniform(50, 80, n),
+        "K": rng.uniform(45, 85, n),
+        "T": rng.uniform(0.05, 2.0, n),
+        "vol": rng.uniform(0.15, 0.7, n),
+        "df": rng.uniform(0.9, 1.0, n),
+        "cp": rng.choice([-1, 1], n),
+    }
+
+
+def _bumped(inputs, name, h):
+    up, dn = dict(inputs), dict(inputs)
+    up[name] = inputs[name] + h
+    dn[name] = inputs[name] - h
+    return up, dn
+
+
+def test_fused_greeks_match_separate_kernels(inputs):
+    g = black76_greeks(**inputs)
+    assert set(g) == set(GREEK_NAMES)
+    x = {k: inputs[k] for k in ("F", "K", "T", "vol", "df")}
+    assert np.allclose(g["price"], price_array(**inputs), rtol=1e-14, atol=1e-14)
+    assert np.allclose(g["delta"], delta_array(**inputs), rtol=1e-14, atol=1e-14)
+    assert np.allclose(g["gamma"], gamma_array(**x), rtol=1e-14, atol=1e-14)
+    assert np.allclose(g["vega"], vega_array(**x), rtol=1e-14, atol=1e-14)
+
+
+def test_second_order_greeks_match_finite_differences(inputs):
+    g = black76_greeks(**inputs)
+    hF, hv, hT = 1e-3, 1e-5, 1e-6
+
+    up, dn = _bumped(inputs, "T", hT)
+    # theta and charm are per unit of calendar time: d/dt = -d/dT
+    theta = -(price_array(**up) - price_array(**dn)) / (2 * hT)
+    charm = -(delta_array(**up) - delta_array(**dn)) / (2 * hT)
+    assert np.allclose(g["theta"], theta, rtol=1e-5, atol=1e-6)
+    assert np.allclose(g["charm"], charm, rtol=1e-5, atol=1e-6)
+
+    up, dn = _bumped(inputs, "vol", hv)
+    vanna = (delta_array(**up) - delta_array(**dn)) / (2 * hv)
+    volga = (
+        vega_array(up["F"], up["K"], up["T"], up["vol"], df=up["df"])
+        - vega_array(dn["F"], dn["K"], dn["T"], dn["vol"], df=dn["df"])
+    ) / (2 * hv)
+    assert np.allclose(g["vanna"], vanna, rtol=1e-5, atol=1e-6)
+    assert np.allclose(g["volga"], volga, rtol=1e-5, atol=1e-5)
+
+    up, dn = _bumped(inputs, "F", hF)
+    gamma = (delta_array(**up) - delta_array(**dn)) / (2 * hF)
+    assert np.allclose(g["gamma"], gamma, rtol=1e-5, atol=1e-7)
+
+
+def test_degenerate_inputs_give_intrinsic_and_zero_greeks():
+    g = black76_greeks(F=np.array([70.0, 60.0]), K=65.0, T=np.array([0.0, 0.5]), vol=np.array([0.3, 0.0]), df=0.95, cp=1)
+    assert g["price"] == pytest.approx([0.95 * 5.0, 0.0])
+    assert g["delta"] == pytest.approx([0.95, 0.0])
+    for name in ("gamma", "vega", "theta", "vanna", "volga", "charm"):
+        assert np.all(g[name] == 0.0)
+    scalar = black76_greeks(65.0, 60.0, 0.5, 0.35, df=0.98, cp=-1)
+    assert isinstance(scalar["theta"], float)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.models.black76 import price, price_array
+from src.models.implied_vol import implied_vol_black76, implied_vol_black76_array
+
+
+@pytest.fixture(scope="module")
+def grid():
+    rng = np.random.default_rng(1)
+    n = 200
+    return {
+        "F": rng.uniform(50, 80, n),
+        "K": rng.uniform(40, 90, n),
+        "T": rng.uniform(0.02, 2.0, n),
+        "vol": rng.uniform(0.1, 0.8, n),
+        "cp": rng.choice([-1, 1], n),
+        "df": rng.uniform(0.85, 1.0, n),
+    }
+
+
+def test_array_implied_vol_matches_scalar(grid):
+    g = grid
+    premium = price_array(g["F"], g["K"], g["T"], g["vol"], df=g["df"], cp=g["cp"])
+    res = implied_vol_black76_array(premium, g["F"], g["K"], g["T"], g["cp"], df=g["df"])
+    for i in range(0, len(premium), 7):
+        scalar = implied_vol_black76(premium[i], g["F"][i], g["K"][i], g["T"][i], int(g["cp"][i]), df=g["df"][i])
+        assert res.converged[i] == scalar.converged
+        if scalar.converged:
+            # both solvers stop on a price tolerance, so compare in price space
+            a = price(g["F"][i], g["K"][i], g["T"][i], res.vol[i], df=g["df"][i], cp=int(g["cp"][i]))
+            b = price(g["F"][i], g["K"][i], g["T"][i], scalar.vol, df=g["df"][i], cp=int(g["cp"][i]))
+            assert a == pytest.approx(b, abs=1e-7)
+            assert res.vol[i] == pytest.approx(scalar.vol, abs=1e-4)
+
+    # reprices the input wherever the premium carries vol information
+    ok = res.converged
+    repriced = price_array(g["F"][ok], g["K"][ok], g["T"][ok], res.vol[ok], df=g["df"][ok], cp=g["cp"][ok])
+    assert np.allclose(repriced, premium[ok], atol=1e-8)
+
+
+def test_implied_vol_flags_arbitrage_premium():
+    below_intrinsic = implied_vol_black76_array(np.array([1.0]), 70.0, 60.0, 0.5, 1)
+    assert not below_intrinsic.converged[0]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+import pricer
+from src import instrumentation
+from src.instrument.vanilla import VanillaOption
+from src.market.option_chain import OptionChain
+from src.models.implied_vol import implied_vol_black76_array
+
+
+@pytest.fixture
+def instrumented():
+    instrumentation.reset()
+    instrumentation.enable()
+    yield instrumentation
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def _workload(forward_curve, sabr_surface, data_dir):
+    trades = [VanillaOption(K=60.0 + i, T=0.25 + 0.1 * i, cp=1 if i % 2 else -1) for i in range(5)]
+    pricer.price_book(trades, forward_curve, sabr_surface)
+    pricer.pv(trades[0], 65.0, sabr_surface)
+    implied_vol_black76_array(np.array([2.0, 3.0]), 65.0, np.array([60.0, 65.0]), 0.5, np.array([-1, 1]))
+    OptionChain.from_csv(sorted((data_dir / "options").glob("*.csv"))[0], forward_curve)
+
+
+def test_disabled_by_default_records_nothing(forward_curve, sabr_surface, data_dir):
+    assert not instrumentation.enabled()
+    instrumentation.reset()
+    _workload(forward_curve, sabr_surface, data_dir)
+    with instrumentation.timer("anything"):
+        pass
+    instrumentation.event("anything", x=1)
+    assert instrumentation.report() == {"counters": {}, "timers": {}, "events": []}
+
+
+def test_enabled_counts_calls_and_times(instrumented, forward_curve, sabr_surface, data_dir, tmp_path):
+    _workload(forward_curve, sabr_surface, data_dir)
+    with instrumented.timer("block"):
+        pass
+    instrumented.event("custom", version=3)
+
+    report = instrumented.report()
+    counters, timers = report["counters"], report["timers"]
+    assert counters["pricer.price_book"] == 1
+    assert counters["pricer.price_book.trades"] == 5
+    assert counters["pricer.pv"] == 1
+    assert counters["surface.vol"] >= 1
+    assert counters["iv.solves"] >= 2 and counters["iv.iterations"] >= 1
+    assert timers["block"]["count"] == 1
+    assert timers["option_chain.from_csv"]["count"] == 1
+    assert timers["pricer.price_book"]["max"] >= timers["pricer.price_book"]["mean"] > 0.0
+    assert report["events"] == [{"event": "custom", "version": 3}]
+
+    path = tmp_path / "report.json"
+    instrumented.write_report(path)
+    assert json.loads(path.read_text())["counters"] == counters
+
+    instrumented.disable()
+    pricer.pv(VanillaOption(K=60.0, T=0.5, cp=1), 65.0, sabr_surface)
+    assert instrumented.report()["counters"]["pricer.pv"] == 1
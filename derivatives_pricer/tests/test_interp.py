@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.surfaces.grid_surface import SmileSlice, SmileSurface, TermVol
+from src.surfaces.interp import bracket, interp_nodes, nearest_index, pchip_slopes
+
+X = np.array([0.1, 0.25, 0.5, 1.0, 2.0])
+
+
+def test_bracket_edges_nodes_and_interior():
+    q = np.array([-1.0, 0.1, 0.175, 0.5, 1.5, 2.0, 3.0])
+    i0, i1, w = bracket(X, q)
+    assert i0.tolist() == [0, 0, 0, 1, 3, 4, 4]
+    assert i1.tolist() == [0, 0, 1, 2, 4, 4, 4]
+    assert w == pytest.approx([0.0, 0.0, 0.5, 1.0, 0.5, 0.0, 0.0])
+    for k, v in enumerate(q):
+        # the scalar branch returns the same brackets as the array pass
+        assert tuple(x.item() for x in bracket(X, v)) == (i0[k], i1[k], w[k])
+    assert tuple(x.item() for x in bracket(np.array([0.5]), 0.7)) == (0, 0, 0.0)
+
+
+def test_nearest_index_breaks_ties_low():
+    assert nearest_index(X, np.array([0.0, 0.175, 0.2, 0.75, 5.0])).tolist() == [0, 0, 1, 2, 4]
+
+
+def test_pchip_matches_scipy_and_stays_monotone():
+    interpolate = pytest.importorskip("scipy.interpolate")
+    x = np.array([40.0, 50.0, 55.0, 60.0, 70.0, 90.0])
+    y = np.array([0.55, 0.42, 0.38, 0.36, 0.37, 0.45])
+    q = np.linspace(40.0, 90.0, 201)
+    ours = interp_nodes(x, y, q, "pchip", pchip_slopes(x, y))
+    assert np.allclose(ours, interpolate.PchipInterpolator(x, y)(q), atol=1e-12)
+
+    # no overshoot on a monotone run of nodes
+    y_mono = np.array([0.6, 0.5, 0.45, 0.44, 0.30, 0.29])
+    v = interp_nodes(x, y_mono, q, "pchip")
+    assert np.all(np.diff(v) <= 1e-15)
+    assert np.all((v >= y_mono.min()) & (v <= y_mono.max()))
+
+
+def test_linear_and_flat_extrapolation():
+    x, y = np.array([50.0, 60.0]), np.array([0.4, 0.3])
+    assert interp_nodes(x, y, np.array([40.0, 55.0, 70.0]), "linear") == pytest.approx([0.4, 0.35, 0.3])
+    with pytest.raises(ValueError):
+        interp_nodes(x, y, 55.0, "cubic")
+
+
+def test_term_vol_interpolates_total_variance():
+    nodes = {0.25: 0.40, 1.0: 0.30}
+    surface = TermVol(nodes, time_interp="total_variance")
+    T = np.array([0.25, 0.5, 0.75, 1.0])
+    v = surface.vol_many(T, 60.0)
+    w = (T - 0.25) / 0.75
+    assert v**2 * T == pytest.approx((1 - w) * 0.40**2 * 0.25 + w * 0.30**2 * 1.0)
+    # flat vol outside the nodes, scalar path agrees with the batch one
+    assert surface.vol_many(np.array([0.1, 5.0]), 60.0) == pytest.approx([0.40, 0.30])
+    assert [surface.vol(t, 60.0) for t in T] == pytest.approx(v.tolist())
+    assert TermVol(nodes).vol(0.5, 60.0) == 0.40
+
+
+def test_smile_surface_scalar_matches_batch():
+    slices = {
+        0.25: SmileSlice(0.25, {50.0: 0.45, 60.0: 0.38, 70.0: 0.41}, interp="pchip"),
+        1.0: SmileSlice(1.0, {50.0: 0.36, 60.0: 0.32, 70.0: 0.34}, interp="pchip"),
+    }
+    surface = SmileSurface(slices, time_interp="total_variance")
+    T = np.array([0.1, 0.25, 0.6, 1.0, 2.0])
+    K = np.array([45.0, 55.0, 60.0, 65.0, 75.0])
+    assert surface.vol_many(T, K) == pytest.approx([surface.vol(t, k) for t, k in zip(T, K)], rel=1e-12)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from src.market.live_chain import LiveOptionChain
+from src.sabr.incremental import IncrementalSABRCalibrator
+
+
+@pytest.fixture
+def chain_path(data_dir):
+    return sorted((data_dir / "options").glob("*.csv"))[2]
+
+
+def test_new_contract_quoted_twice_is_added_once(chain_path, forward_curve):
+    chain = LiveOptionChain.from_csv(chain_path, forward_curve)
+    n = len(chain.to_chain(drop_bad=False).data)
+    K = float(chain.to_chain().data["strike"].max()) + 7.25
+    changed = chain.update_quotes([(K, 1, 0.40), (K, 1, 0.35), (K, -1, 9.0)])
+    data = chain.to_chain(drop_bad=False).data
+    assert changed == 2
+    assert len(data) == n + 2
+    row = data[(data["strike"] == K) & (data["cp"] == 1)]
+    assert len(row) == 1 and row["premium"].iloc[0] == 0.35
+
+    # a later quote on the new contract updates the existing row
+    assert chain.update_quotes([(K, 1, 0.30)]) == 1
+    assert len(chain.to_chain(drop_bad=False).data) == n + 2
+
+
+def test_refresh_skip_check_uses_the_fit_maturity(chain_path, forward_curve, sabr_surface):
+    # a chain stamped with a different as_of than the surface: both the skip check and the fit use the surface's T
+    chain = LiveOptionChain.from_csv(chain_path, forward_curve, as_of=forward_curve.as_of - timedelta(days=20))
+    calibrator = IncrementalSABRCalibrator(sabr_surface, rmse_tolerance=1e-6)
+    first = calibrator.refresh(chain, force=True)
+    assert first.refit
+
+    again = calibrator.refresh(chain)
+    assert not again.refit
+    assert again.rmse_before == pytest.approx(first.rmse_after, abs=1e-12)
+    assert np.isfinite(again.rmse_before)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import date
+
+import pytest
+
+from src.live.pipeline import LivePipeline
+from src.live.sources import FuturesTick, OptionTick, ReplaySource
+
+
+class _ListSource:
+    def __init__(self, ticks, forever: bool = False):
+        self.ticks = ticks
+        self.forever = forever
+
+    async def __aiter__(self):
+        while True:
+            for tick in self.ticks:
+                yield tick
+                await asyncio.sleep(0)
+            if not self.forever:
+                return
+
+
+@pytest.fixture
+def pipeline(data_dir):
+    pipe = LivePipeline.from_data_dir(data_dir, debounce=0.01, max_delay=0.05, max_queue=5)
+    yield pipe
+    pipe.close()
+
+
+def test_unchanged_replay_publishes_nothing(pipeline, data_dir):
+    stats = asyncio.run(pipeline.run(ReplaySource.from_data_dir(data_dir)))
+    assert stats.ticks_in > 0
+    assert stats.refits == 0 and stats.published == 0
+
+
+def test_simulated_moves_publish_new_curve(pipeline, data_dir):
+    updates = []
+
+    async def main():
+        q = pipeline.subscribe(maxsize=1)
+        source = ReplaySource.from_data_dir(data_dir, n_steps=2, replay_initial=False, seed=0)
+        stats = await pipeline.run(source)
+        while not q.empty():
+            updates.append(q.get_nowait())
+        return stats
+
+    stats = asyncio.run(main())
+    assert stats.published >= 1
+    assert updates[-1] is pipeline.latest
+    assert updates[-1].surface.forward_curve is pipeline.forward_curve
+
+
+def test_malformed_ticks_are_rejected_individually(pipeline):
+    expiry = next(iter(pipeline.chains))
+    chain = pipeline.chains[expiry]
+    K, _ = chain.smile()
+    ticks = [
+        OptionTick(expiry, float(K[0]), 0, 1.0, 0.0),
+        OptionTick(expiry, -5.0, 1, 1.0, 0.0),
+        OptionTick(expiry, float(K[0]), 1, float("nan"), 0.0),
+        FuturesTick(date(2026, 3, 20), -1.0, 0.0),
+        OptionTick(expiry, float(K[-1]), 1, 0.05, 0.0),
+    ]
+    stats = asyncio.run(asyncio.wait_for(pipeline.run(_ListSource(ticks)), 30))
+    assert stats.ticks_rejected == 4
+    assert stats.ticks_applied == 1
+
+
+def test_apply_failure_does_not_hang(pipeline):
+    def boom(futures, options):
+        # slow enough for the source to fill the bounded queue before the failure
+        time.sleep(0.05)
+        raise RuntimeError("apply failed")
+
+    pipeline._apply = boom
+    expiry = next(iter(pipeline.chains))
+    # a source that never ends, against a queue of 5: run() must still return promptly with the error
+    source = _ListSource([OptionTick(expiry, 60.0, 1, 5.0, 0.0), FuturesTick(expiry, 65.0, 0.0)], forever=True)
+    with pytest.raises(RuntimeError, match="apply failed"):
+        asyncio.run(asyncio.wait_for(pipeline.run(source), 10))
+
+
+def test_source_failure_propagates(pipeline):
+    class Broken:
+        async def __aiter__(self):
+            yield FuturesTick(date(2026, 3, 20), 65.0, 0.0)
+            raise ConnectionError("feed dropped")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(asyncio.wait_for(pipeline.run(Broken()), 10))
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import pricer
+from src.instrument.vanilla import VanillaOption
+
+
+@pytest.fixture(scope="module")
+def trades():
+    rng = np.random.default_rng(5)
+    n = 60
+    return [
+        VanillaOption(K=float(k), T=float(t), cp=int(c), qty=float(q), exercise=e)
+        for k, t, c, q, e in zip(
+            rng.uniform(45, 85, n),
+            rng.uniform(0.05, 1.5, n),
+            rng.choice([-1, 1], n),
+            rng.choice([-3.0, 1.0, 2.0], n),
+            rng.choice(["european", "american"], n, p=[0.7, 0.3]),
+        )
+    ]
+
+
+def test_price_book_matches_scalar_pricer(trades, forward_curve, sabr_surface):
+    df = 0.97
+    res = pricer.price_book(trades, forward_curve, sabr_surface, df=df)
+    for i, trade in enumerate(trades):
+        F = forward_curve.forward_T(trade.T)
+        assert res.F[i] == pytest.approx(F)
+        assert res.pv[i] == pytest.approx(pricer.pv(trade, F, sabr_surface, df=df), rel=1e-9, abs=1e-10)
+        g = pricer.greeks(trade, F, sabr_surface, df=df)
+        assert set(g) == {"delta", "gamma", "vega", "theta", "vanna", "volga", "charm"}
+        for name, value in g.items():
+            assert getattr(res, name)[i] == pytest.approx(value, rel=1e-9, abs=1e-10), name
+    assert res.totals["pv"] == pytest.approx(float(res.pv.sum()))
+
+
+def test_price_book_accepts_columns_and_iterables(trades, forward_curve, sabr_surface):
+    expected = pricer.price_book(trades, forward_curve, sabr_surface).pv
+    columns = {
+        "K": [t.K for t in trades],
+        "T": [t.T for t in trades],
+        "cp": [t.cp for t in trades],
+        "qty": [t.qty for t in trades],
+        "exercise": [t.exercise for t in trades],
+    }
+    assert np.array_equal(pricer.price_book(columns, forward_curve, sabr_surface).pv, expected)
+    assert np.array_equal(pricer.price_book(iter(trades), forward_curve, sabr_surface).pv, expected)
+    assert np.array_equal(pricer.price_book(tuple(trades), forward_curve, sabr_surface).pv, expected)
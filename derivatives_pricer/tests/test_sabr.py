@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.sabr.calibration import calibrate_sabr_smile
+from src.sabr.params import SABRParams
+from src.sabr.sabr import hagan_lognormal_iv, hagan_lognormal_iv_array, hagan_lognormal_iv_jacobian
+
+
+@pytest.fixture(scope="module")
+def smile():
+    F, T = 65.0, 0.6
+    K = np.linspace(40.0, 95.0, 41)
+    return F, T, K
+
+
+def test_array_hagan_matches_scalar(smile):
+    F, T, K = smile
+    p = SABRParams(alpha=0.4, beta=1.0, rho=-0.3, nu=0.9, shift=0.0)
+    vols = hagan_lognormal_iv_array(F, K, T, p.alpha, p.beta, p.rho, p.nu, p.shift)
+    assert np.allclose(vols, [hagan_lognormal_iv(F=F, K=k, T=T, p=p) for k in K], rtol=1e-12)
+
+
+@pytest.mark.parametrize("beta", [1.0, 0.5])
+def test_jacobian_matches_finite_differences(smile, beta):
+    F, T, K = smile
+    alpha = 0.4 if beta == 1.0 else 0.4 * F ** (1.0 - beta)
+    x = {"alpha": alpha, "rho": -0.3, "nu": 0.9}
+    vol, d_alpha, d_rho, d_nu = hagan_lognormal_iv_jacobian(F, K, T, x["alpha"], beta, x["rho"], x["nu"])
+    assert np.allclose(vol, hagan_lognormal_iv_array(F, K, T, x["alpha"], beta, x["rho"], x["nu"]))
+
+    for name, analytic in (("alpha", d_alpha), ("rho", d_rho), ("nu", d_nu)):
+        h = 1e-6 * max(abs(x[name]), 1.0)
+        up, down = dict(x), dict(x)
+        up[name] += h
+        down[name] -= h
+        fd = (
+            hagan_lognormal_iv_array(F, K, T, up["alpha"], beta, up["rho"], up["nu"])
+            - hagan_lognormal_iv_array(F, K, T, down["alpha"], beta, down["rho"], down["nu"])
+        ) / (2.0 * h)
+        assert np.allclose(analytic, fd, rtol=1e-5, atol=1e-7), name
+
+
+def test_calibration_recovers_parameters(smile):
+    F, T, K = smile
+    true = SABRParams(alpha=0.42, beta=1.0, rho=-0.25, nu=1.1, shift=0.0)
+    iv = hagan_lognormal_iv_array(F, K, T, true.alpha, true.beta, true.rho, true.nu)
+    res = calibrate_sabr_smile(F, T, K, iv, beta=1.0)
+    assert res.converged
+    assert res.rmse < 1e-6
+    assert (res.params.alpha, res.params.rho, res.params.nu) == pytest.approx((true.alpha, true.rho, true.nu), abs=1e-4)
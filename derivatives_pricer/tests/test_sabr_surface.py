@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.sabr.sabr import hagan_lognormal_iv
+
+
+def test_sabr_param_matrix_hits_nodes_and_interpolates(sabr_surface):
+    expiries = sabr_surface.expiries
+    assert expiries == sorted(sabr_surface.params_by_expiry)
+    T = np.array([(d - sabr_surface.as_of).days / 365.0 for d in expiries])
+    m = sabr_surface.param_matrix(T)
+    for row, d in zip(m, expiries):
+        p = sabr_surface.params_by_expiry[d]
+        assert np.allclose(row, [p.alpha, p.beta, p.rho, p.nu, p.shift])
+
+    mid = 0.5 * (T[3] + T[4])
+    i0, i1, w = sabr_surface.interp_weights(np.array([mid, T[0] / 2, T[-1] + 1.0]))
+    assert (i0[0], i1[0], w[0]) == (3, 4, pytest.approx(0.5))
+    assert (i0[1], i1[1], w[1]) == (0, 0, 0.0)
+    assert (i0[2], i1[2], w[2]) == (len(T) - 1, len(T) - 1, 0.0)
+    p = sabr_surface.params_at(mid)
+    assert np.allclose(sabr_surface.param_matrix(mid), [p.alpha, p.beta, p.rho, p.nu, p.shift])
+
+
+def test_sabr_scalar_and_batch_lookups_agree(sabr_surface, forward_curve):
+    nodes = [(d - sabr_surface.as_of).days / 365.0 for d in sabr_surface.expiries]
+    T = np.concatenate([np.linspace(0.0, 3.0, 61), nodes])
+    K = np.linspace(40.0, 90.0, T.size)
+    batch = sabr_surface.vol_many(T, K)
+    for t, k, v in zip(T, K, batch):
+        p = sabr_surface.params_at(t)
+        assert sabr_surface.vol(t, k) == pytest.approx(v, rel=1e-12)
+        assert sabr_surface.vol(t, k) == hagan_lognormal_iv(F=forward_curve.forward_T(t), K=k, T=t, p=p)
+
+
+def test_sabr_params_at_holds_edges_and_keeps_left_beta(sabr_surface):
+    expiries = sabr_surface.expiries
+    first, last = sabr_surface.params_by_expiry[expiries[0]], sabr_surface.params_by_expiry[expiries[-1]]
+    assert sabr_surface.params_at(0.0) == first
+    assert sabr_surface.params_at(50.0) == last
+    with pytest.raises(ValueError):
+        type(sabr_surface)(as_of=sabr_surface.as_of, forward_curve=sabr_surface.forward_curve, params_by_expiry={}).vol(0.5, 60.0)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import time
+
+import numpy as np
+import pytest
+
+from pricer import price_book
+from src.service.client import PricingClient, ServiceError
+from src.service.server import PricingService
+
+
+def _serve(service, sock, body):
+    async def main():
+        await service.start(path=sock)
+        try:
+            async with await PricingClient.connect(sock) as client:
+                return await body(client)
+        finally:
+            await service.stop()
+
+    return asyncio.run(asyncio.wait_for(main(), 60))
+
+
+def test_coalesced_requests_match_price_book(forward_curve, sabr_surface, tmp_path):
+    rng = np.random.default_rng(0)
+    K, T = rng.uniform(45, 85, 300), rng.uniform(0.05, 1.2, 300)
+    cp = rng.choice([-1, 1], 300)
+    service = PricingService(forward_curve, sabr_surface, df=0.97, window=0.01)
+
+    async def body(client):
+        singles = await asyncio.gather(
+            *(client.pv({"K": float(k), "T": float(t), "cp": int(c)}) for k, t, c in zip(K, T, cp))
+        )
+        greeks = await client.greeks({"K": K.tolist(), "T": T.tolist(), "cp": cp.tolist(), "exercise": ["american"] * 300})
+        return singles, greeks, await client.stats()
+
+    singles, greeks, stats = _serve(service, tmp_path / "pricing.sock", body)
+    expected = price_book({"K": K, "T": T, "cp": cp}, forward_curve, sabr_surface, df=0.97)
+    assert np.allclose([s["pv"] for s in singles], expected.pv, rtol=0, atol=1e-12)
+    # the concurrent single-trade requests were priced in far fewer batches than requests
+    assert stats["batches"] < 300
+
+    american = price_book({"K": K, "T": T, "cp": cp, "exercise": np.full(300, "american")}, forward_curve, sabr_surface, df=0.97)
+    assert np.allclose(greeks["pv"], american.pv, rtol=0, atol=1e-12)
+    assert np.allclose(greeks["delta"], american.delta, rtol=0, atol=1e-12)
+
+
+def test_bad_request_does_not_fail_its_batch(forward_curve, sabr_surface, tmp_path):
+    service = PricingService(forward_curve, sabr_surface, window=0.01)
+
+    async def body(client):
+        return await asyncio.gather(
+            client.pv({"K": -1.0, "T": 0.3, "cp": 1}),
+            client.pv({"K": 60.0, "T": 0.3, "cp": 1}),
+            client.request("unknown"),
+            return_exceptions=True,
+        )
+
+    bad, good, unknown = _serve(service, tmp_path / "pricing.sock", body)
+    assert isinstance(bad, ServiceError) and isinstance(unknown, ServiceError)
+    assert good["pv"] > 0
+
+
+def test_in_flight_requests_are_capped_per_connection(forward_curve, sabr_surface, tmp_path):
+    service = PricingService(forward_curve, sabr_surface, window=0.0, max_in_flight=4)
+    price = service._price_batch
+
+    def slow(batch, market):
+        time.sleep(0.01)
+        return price(batch, market)
+
+    service._price_batch = slow
+
+    async def body(client):
+        replies = await asyncio.gather(*(client.pv({"K": 60.0 + i, "T": 0.3, "cp": 1}) for i in range(40)))
+        return replies, await client.stats()
+
+    replies, stats = _serve(service, tmp_path / "pricing.sock", body)
+    assert len(replies) == 40
+    assert stats["max_in_flight"] <= 4
+
+
+def test_swap_keeps_serving(forward_curve, sabr_surface, tmp_path):
+    service = PricingService(forward_curve, sabr_surface)
+    bumped = dataclasses.replace(
+        sabr_surface,
+        params_by_expiry={d: dataclasses.replace(p, alpha=p.alpha * 1.1) for d, p in sabr_surface.params_by_expiry.items()},
+    )
+
+    async def body(client):
+        trade = {"K": 65.0, "T": 0.3, "cp": 1}
+        before = await client.pv(trade)
+        pending = [asyncio.ensure_future(client.pv(trade)) for _ in range(50)]
+        service.swap(surface=bumped)
+        during = await asyncio.gather(*pending)
+        after = await client.pv(trade)
+        return before, during, after
+
+    before, during, after = _serve(service, tmp_path / "pricing.sock", body)
+    assert len(during) == 50
+    assert before["market_version"] == 0 and after["market_version"] == 1
+    assert after["pv"] > before["pv"]
+
+
+def test_submit_before_start_raises(forward_curve, sabr_surface):
+    service = PricingService(forward_curve, sabr_surface)
+    with pytest.raises(RuntimeError, match="not started"):
+        asyncio.run(service.submit("pv", {"K": 60.0, "T": 0.3, "cp": 1}))
+
+
+def test_request_after_connection_closed_raises(tmp_path):
+    sock = tmp_path / "closing.sock"
+
+    async def main():
+        # a peer that hangs up straight away
+        server = await asyncio.start_unix_server(lambda reader, writer: writer.close(), path=str(sock))
+        client = await PricingClient.connect(sock)
+        try:
+            await asyncio.wait_for(asyncio.shield(client._listener), 5)
+            with pytest.raises(ConnectionError):
+                await client.pv({"K": 60.0, "T": 0.3, "cp": 1})
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(asyncio.wait_for(main(), 30))
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.market.option_chain import OptionChain
+from src.market.snapshot import MarketSnapshot, write_snapshot
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="module")
+def snapshot_path(tmp_path_factory, data_dir, forward_curve, sabr_surface):
+    chains = [OptionChain.from_csv(p, forward_curve, drop_bad=False) for p in sorted((data_dir / "options").glob("*.csv"))[:4]]
+    path = tmp_path_factory.mktemp("snap") / "market.snap"
+    write_snapshot(path, forward_curve, sabr_surface, chains)
+    return path, chains
+
+
+def test_snapshot_round_trip(snapshot_path, forward_curve, sabr_surface):
+    path, chains = snapshot_path
+    with MarketSnapshot(path) as snap:
+        curve = snap.forward_curve
+        assert curve.as_of == forward_curve.as_of
+        assert np.array_equal(curve.expiries, forward_curve.expiries)
+        assert np.array_equal(curve.forwards, forward_curve.forwards)
+
+        surface = snap.surface()
+        assert surface.params_by_expiry == sabr_surface.params_by_expiry
+        T, K = np.linspace(0.02, 1.5, 500), np.linspace(40, 90, 500)
+        assert np.array_equal(surface.vol_many(T, K), sabr_surface.vol_many(T, K))
+
+        assert snap.chain_expiries == [c.expiry for c in chains]
+        for chain in chains:
+            loaded = snap.chain(chain.expiry)
+            expected = chain.data[chain.data["ok"]].sort_values("strike").reset_index(drop=True)
+            assert loaded.F == chain.F and loaded.df == chain.df
+            assert loaded.data[list(expected.columns)].equals(expected)
+
+
+def test_snapshot_rejects_other_files(data_dir):
+    with pytest.raises(ValueError):
+        MarketSnapshot(data_dir / "sabr_params.csv")
+
+
+def test_snapshot_load_does_not_import_pandas(snapshot_path):
+    path, _ = snapshot_path
+    code = (
+        "import sys\n"
+        "from src.market.snapshot import MarketSnapshot\n"
+        f"snap = MarketSnapshot({str(path)!r})\n"
+        "snap.surface().vol_many([0.3], [65.0])\n"
+        "snap.chain_arrays(snap.chain_expiries[0])\n"
+        "print('pandas' in sys.modules)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
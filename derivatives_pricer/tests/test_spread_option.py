@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.market.contract_panel import DEFAULT_PANEL_DIR, ContractPanel
+from src.models.spread_option import (
+    bjerksund_stensland_price,
+    calendar_spread_correlation,
+    consecutive_pairs,
+    kirk_price,
+    price_calendar_spread,
+    spread_option_mc,
+)
+
+needs_panel = pytest.mark.skipif(not DEFAULT_PANEL_DIR.is_dir(), reason="contract histories not available")
+
+
+@pytest.fixture(scope="module")
+def panel():
+    return ContractPanel.from_dir(DEFAULT_PANEL_DIR)
+
+
+@needs_panel
+def test_calendar_spread_defaults_rho_from_panel(forward_curve, sabr_surface, panel):
+    near, far = consecutive_pairs(forward_curve, 4)
+    rho = calendar_spread_correlation(forward_curve, near, far, panel=panel)
+    assert np.allclose(rho, panel.consecutive_correlation(lag=1))
+    assert 0.9 < rho[0] < 1.0
+
+    implied = price_calendar_spread(forward_curve, sabr_surface, near, far, 0.0, panel=panel)
+    explicit = price_calendar_spread(forward_curve, sabr_surface, near, far, 0.0, rho=rho)
+    assert np.array_equal(implied, explicit)
+    # the default panel is the bundled one
+    assert np.array_equal(price_calendar_spread(forward_curve, sabr_surface, near, far, 0.0), implied)
+
+
+@needs_panel
+def test_calendar_spread_correlation_uses_contract_gap(forward_curve, panel):
+    near, far = consecutive_pairs(forward_curve, 4)
+    rho = calendar_spread_correlation(forward_curve, near[:2], far[1:3], panel=panel)
+    assert np.allclose(rho, panel.consecutive_correlation(lag=2))
+    with pytest.raises(ValueError):
+        calendar_spread_correlation(forward_curve, far, near, panel=panel)
+
+
+def test_spread_closed_forms_within_mc_error():
+    F1, F2 = 66.0, np.array([64.0, 64.0, 63.0])
+    K = np.array([0.0, 1.5, 3.0])
+    T, vol1, vol2, rho = 0.5, 0.38, 0.35, 0.95
+    for cp in (1, -1):
+        mc = spread_option_mc(F1, F2, K, T, vol1, vol2, rho, df=0.98, cp=cp, n_paths=400_000, seed=7)
+        for model in (kirk_price, bjerksund_stensland_price):
+            value = model(F1, F2, K, T, vol1, vol2, rho, df=0.98, cp=cp)
+            assert np.all(np.abs(value - mc.price) < 4.0 * mc.stderr + 2e-3)
+
+
+def test_spread_put_call_parity():
+    args = (66.0, 64.0, np.array([0.0, 2.0, 4.0]), 0.5, 0.38, 0.35, 0.9)
+    call = bjerksund_stensland_price(*args, df=0.97, cp=1)
+    put = bjerksund_stensland_price(*args, df=0.97, cp=-1)
+    assert np.allclose(call - put, 0.97 * (66.0 - 64.0 - args[2]), atol=1e-12)
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import copy
+
+import numpy as np
+import pytest
+
+from src.surfaces.cached_surface import CachedVolSurface
+from src.surfaces.grid_surface import FlatVol
+
+
+def test_cached_surface_copies_without_recursion():
+    cached = CachedVolSurface(FlatVol(0.3))
+    assert cached.vol(0.5, 60.0) == pytest.approx(0.3)
+    clone = copy.copy(cached)
+    assert clone.vol(0.5, 60.0) == pytest.approx(0.3)
+    assert copy.copy(CachedVolSurface(0.3)).maxsize == cached.maxsize
+    with pytest.raises(AttributeError):
+        CachedVolSurface.__new__(CachedVolSurface)._surface
+
+
+def test_cached_surface_forwards_public_attributes(sabr_surface):
+    cached = CachedVolSurface(sabr_surface)
+    assert cached.forward_curve is sabr_surface.forward_curve
+    T, K = np.array([0.2, 0.7]), np.array([60.0, 70.0])
+    assert np.allclose(cached.vol_many(T, K), sabr_surface.vol_many(T, K))